@@ -0,0 +1,219 @@
+"""
+热点路径基准测试
+
+覆盖匹配打分（/match-diag）、全岗位排序（/path-reco）、简历技能抽取（/resume-kg）、技能联想（/api/skill/suggest）
+、相近技能（/api/skill/similar，含向量离线计算）、岗位列表键集分页（/api/jobs）、图谱快照加载以及 CSV 批量导入。数据由 synthetic.py 生成，Neo4j 由 fake_neo4j.py 内存替身代替。
+每个用例同时测量优化前实现（legacy.*）与当前实现，输出吞吐量与 p50/p99 延迟，并与 baselines.json 对比。
+
+用法（在项目根目录执行）：
+    python benchmarks/bench.py                       # small 规模，与基线对比
+    python benchmarks/bench.py --scale medium large  # 指定规模
+    python benchmarks/bench.py --case path_reco      # 只跑名称包含 path_reco 的用例
+    python benchmarks/bench.py --save-baseline       # 把本次结果写入基线
+    python benchmarks/bench.py --skip-legacy         # 大规模时跳过慢速的 legacy 对照组
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "job_kg_app"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy  # noqa: E402
+import synthetic  # noqa: E402
+from fake_neo4j import FakeDriver, FakeGraph  # noqa: E402
+from batch_match import match_batch  # noqa: E402
+from graph_import import import_graph  # noqa: E402
+from graph_snapshot import GraphSnapshot  # noqa: E402
+from skill_embed import SkillEmbedding  # noqa: E402
+from skill_extractor import SkillExtractor  # noqa: E402
+from skill_index import SkillIndex  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# 规模：岗位数、技能数、每岗位平均技能数
+SCALES = {
+    "small": {"jobs": 1_000, "skills": 10_000, "avg_skills": 10},
+    "medium": {"jobs": 10_000, "skills": 20_000, "avg_skills": 12},
+    "large": {"jobs": 100_000, "skills": 50_000, "avg_skills": 12},
+    "xl": {"jobs": 1_000_000, "skills": 100_000, "avg_skills": 12},
+}
+
+RESUME_LENGTHS = {"short": 500, "medium": 3_000, "long": 20_000}
+
+
+class Context:
+    """某一规模下的共享数据"""
+
+    def __init__(self, scale, seed=0):
+        cfg = SCALES[scale]
+        t0 = time.perf_counter()
+        self.skills, self.jobs, self.records = synthetic.make_graph(
+            cfg["jobs"], cfg["skills"], cfg["avg_skills"], seed)
+        self.graph = FakeGraph(self.skills, self.jobs, self.records)
+        self.driver = FakeDriver(self.graph)
+        self.gen_seconds = time.perf_counter() - t0
+
+        self.snapshot = GraphSnapshot.load(self.driver)
+        self.skill_index = SkillIndex(self.skills)
+        self.extractor = SkillExtractor(self.skills)
+        # 与快照共用（首次访问时构建），批量匹配用例不计入这一次性开销
+        self.embedding = self.snapshot.embedding
+
+        rng = random.Random(seed)
+        self.users = [synthetic.make_user_skills(self.skills, rng.randint(5, 40), seed=i) for i in range(50)]
+        self.job_ids = [j["id"] for j in rng.sample(self.jobs, min(200, len(self.jobs)))]
+        self.prefixes = [s[:rng.randint(1, 3)].lower() for s in rng.sample(self.skills, 200)]
+        self.job_list_queries = [{}, {"q": "开发"}, {"q": "工程师 北京"}, {"city": "上海"}] + [
+            {"q": "工程师", "after": job_id} for job_id in self.job_ids[:20]]
+        self.similar_queries = [self.snapshot.matrix.skill_names[c] for c in self.embedding.cols[:200].tolist()]
+        self.resumes = {
+            name: [synthetic.make_resume(self.skills, n, seed=i) for i in range(5)]
+            for name, n in RESUME_LENGTHS.items()
+        }
+        # 批量导入用的 CSV
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.csv_paths = synthetic.write_csvs(self._tmpdir.name, self.skills, self.jobs, self.records)
+
+
+def measure(fn, inputs, min_time=1.0, max_iters=10_000, min_iters=3):
+    """反复执行 fn(x)（x 轮流取自 inputs），返回吞吐量与延迟分位数"""
+    samples = []
+    start = time.perf_counter()
+    i = 0
+    while i < max_iters and (i < min_iters or time.perf_counter() - start < min_time):
+        x = inputs[i % len(inputs)]
+        t0 = time.perf_counter()
+        fn(x)
+        samples.append(time.perf_counter() - t0)
+        i += 1
+    samples.sort()
+    total = sum(samples)
+
+    def pct(p):
+        return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+    return {
+        "iters": len(samples),
+        "ops_per_s": round(len(samples) / total, 2) if total else None,
+        "p50_ms": round(pct(0.50), 4),
+        "p99_ms": round(pct(0.99), 4),
+    }
+
+
+# ========== 用例 ==========
+def current_match(ctx, job_id, user_skills):
+    """当前 /match-diag 打分路径：快照中预先汇总的岗位需求 + 一遍用户技能"""
+    summary = ctx.snapshot.job_summary(job_id)
+    user_ids = ctx.snapshot.canon.ids(user_skills)
+    owned, missing = summary.split(user_ids)
+    total_w = summary.total_weight
+    score = round((summary.owned_weight(user_ids) / total_w) * 100) if total_w > 0 else 0
+    return score, owned, summary.top_missing(missing, 3)
+
+
+def _quiet(*args):
+    pass
+
+
+def build_cases(ctx, skip_legacy=False):
+    pairs = [(j, u) for j, u in zip(ctx.job_ids, ctx.users * (len(ctx.job_ids) // len(ctx.users) + 1))]
+    cases = [
+        ("snapshot_load", lambda _: GraphSnapshot.load(ctx.driver), [None], {"min_time": 0.0, "min_iters": 3}),
+        ("graph_import", lambda _: import_graph(FakeDriver(FakeGraph([], [], [])), *ctx.csv_paths, out=_quiet),
+         [None], {"min_time": 0.0, "min_iters": 1}),
+        ("match_diag.current", lambda p: current_match(ctx, *p), pairs, {}),
+        ("match_batch.50x200", lambda _: match_batch(ctx.snapshot, ctx.users, ctx.job_ids), [None], {}),
+        ("path_reco.current", lambda u: ctx.snapshot.matrix.top_k(u, 5), ctx.users, {}),
+        ("path_reco.cached", lambda u: ctx.snapshot.reco.recommend(tuple(u), u, 5), ctx.users, {}),
+        ("suggest.current", lambda p: ctx.skill_index.suggest(p, 10), ctx.prefixes, {}),
+        ("job_list.keyset", lambda kw: ctx.snapshot.job_page(limit=20, **kw), ctx.job_list_queries, {}),
+        ("skill_embed.build", lambda _: SkillEmbedding.from_matrix(ctx.snapshot.matrix), [None],
+         {"min_time": 0.0, "min_iters": 1}),
+        ("similar.ivf", lambda s: ctx.embedding.neighbors(s, 10), ctx.similar_queries, {}),
+        ("similar.closest", lambda p: ctx.embedding.closest(ctx.snapshot.job_requirements(p[0]),
+                                                            ctx.snapshot.matrix.columns(p[1])), pairs, {}),
+    ]
+    for name, texts in ctx.resumes.items():
+        cases.append((f"resume_{name}.current", ctx.extractor.extract, texts, {}))
+
+    if not skip_legacy:
+        cases += [
+            ("match_diag.legacy", lambda p: legacy.match_score(ctx.driver, *p), pairs, {}),
+            ("path_reco.legacy", lambda u: legacy.path_reco_rank(ctx.driver, u), ctx.users, {}),
+            ("suggest.legacy", lambda p: legacy.suggest(ctx.skills, p), ctx.prefixes, {}),
+        ]
+        for name, texts in ctx.resumes.items():
+            cases.append((f"resume_{name}.legacy", lambda t: legacy.extract_skills(ctx.skills, t), texts, {}))
+    return cases
+
+
+# ========== 基线对比 ==========
+def load_baselines():
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_baselines(baselines):
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(result, base, tolerance):
+    """返回 (p50 比值, 是否退化)"""
+    if not base or not base.get("p50_ms"):
+        return None, False
+    ratio = result["p50_ms"] / base["p50_ms"]
+    return ratio, ratio > tolerance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="匹配/推荐/抽取/联想热点路径基准测试")
+    parser.add_argument("--scale", nargs="+", default=["small"], choices=list(SCALES))
+    parser.add_argument("--case", default="", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--min-time", type=float, default=1.0, help="每个用例最少运行秒数")
+    parser.add_argument("--skip-legacy", action="store_true", help="跳过优化前实现")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果写入 baselines.json")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="p50 超过基线多少倍视为退化")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    regressions = 0
+    for scale in args.scale:
+        print(f"\n== scale={scale} {SCALES[scale]} ==")
+        ctx = Context(scale)
+        print(f"   数据生成 {ctx.gen_seconds:.1f}s，REQUIRES 边 {len(ctx.records)} 条")
+        print(f"{'case':<24}{'iters':>8}{'ops/s':>12}{'p50 ms':>12}{'p99 ms':>12}{'vs base':>10}")
+        scale_base = baselines.setdefault(scale, {})
+        for name, fn, inputs, opts in build_cases(ctx, args.skip_legacy):
+            if args.case not in name:
+                continue
+            kwargs = {"min_time": args.min_time}
+            kwargs.update(opts)
+            result = measure(fn, inputs, **kwargs)
+            ratio, regressed = compare(result, scale_base.get(name), args.tolerance)
+            regressions += regressed
+            flag = "" if ratio is None else f"{ratio:.2f}x" + (" !" if regressed else "")
+            print(f"{name:<24}{result['iters']:>8}{result['ops_per_s']:>12}"
+                  f"{result['p50_ms']:>12}{result['p99_ms']:>12}{flag:>10}")
+            if args.save_baseline:
+                scale_base[name] = result
+
+    if args.save_baseline:
+        save_baselines(baselines)
+        print(f"\n基线已写入 {BASELINE_PATH}")
+    if regressions:
+        print(f"\n[WARN] {regressions} 个用例 p50 超过基线 {args.tolerance} 倍")
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
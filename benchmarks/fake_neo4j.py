@@ -0,0 +1,155 @@
+"""
+内存版 Neo4j 驱动替身
+
+只实现基准测试涉及的几条查询（按语句对象本身分派），返回值结构与真实驱动的 Result 一致。
+批量导入语句（graph_import.py）按 MERGE 语义写入内存数据，可用来验证导入流程。
+"""
+import threading
+from bisect import insort
+
+from graph_snapshot import (BUMP_VERSION_QUERY, JOBS_QUERY, REQUIRES_QUERY, SKILLS_QUERY, STATS_QUERY,
+                            VERSION_QUERY)
+from queries import (BULK_REPLACE_USER_SKILLS_QUERY, IMPORT_JOBS_QUERY, IMPORT_REQUIRES_QUERY, IMPORT_SKILLS_QUERY,
+                     USER_SKILLS_QUERY)
+
+import legacy
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def data(self):
+        return list(self._rows)
+
+    def single(self):
+        return self._rows[0] if self._rows else None
+
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+    def execute_write(self, fn, *args, **kwargs):
+        return fn(self, *args, **kwargs)
+
+    def run(self, query, parameters=None, **kwargs):
+        params = dict(parameters or {}, **kwargs)
+        return FakeResult(self._graph.answer(query.strip(), params))
+
+
+class FakeGraph:
+    """持有合成数据，并按查询语句返回记录"""
+
+    def __init__(self, skills, jobs, records, users=None):
+        self.skills = skills
+        self.jobs = jobs
+        self.records = records
+        self.users = users or {}
+        self.by_job = {}
+        for rec in records:
+            self.by_job.setdefault(rec["job_id"], []).append(rec)
+        self.queries = 0
+        self.version = 1
+        self._skill_set = set(skills)
+        self._job_by_id = {job["id"]: job for job in jobs}
+        self._lock = threading.Lock()
+
+    def answer(self, query, params):
+        self.queries += 1
+        if query.startswith(("CREATE ", "CALL db.awaitIndexes")):
+            return []
+        if query in (IMPORT_SKILLS_QUERY.strip(), IMPORT_JOBS_QUERY.strip(), IMPORT_REQUIRES_QUERY.strip(),
+                     BULK_REPLACE_USER_SKILLS_QUERY.strip(), BUMP_VERSION_QUERY.strip()):
+            with self._lock:
+                return self._write(query, params)
+        if query == VERSION_QUERY.strip():
+            return [{"version": self.version}]
+        if query == JOBS_QUERY.strip():
+            return sorted(self.jobs, key=lambda job: job["id"])
+        if query == SKILLS_QUERY.strip():
+            return [{"name": s} for s in self.skills]
+        if query == STATS_QUERY.strip():
+            return [{"job_count": len(self.jobs), "skill_count": len(self.skills), "rel_count": len(self.records)}]
+        if query == REQUIRES_QUERY.strip():
+            return self.records
+        if query == USER_SKILLS_QUERY.strip():
+            return [{"name": s} for s in sorted(self.users.get(params["user_id"], []))]
+        if query == legacy.ALL_JOB_SKILLS_QUERY.strip():
+            return [{"job_id": jid, "job_name": recs[0]["job_name"], "city": recs[0]["city"],
+                     "skill_list": [{"name": r["skill"], "weight": r["weight"]} for r in recs]}
+                    for jid, recs in self.by_job.items()]
+        if query == legacy.JOB_REQUIRES_QUERY.strip():
+            return [{"name": r["skill"], "weight": r["weight"], "job_name": r["job_name"]}
+                    for r in self.by_job.get(params["job_id"], [])]
+        raise NotImplementedError(query)
+
+    def _merge_skill(self, name):
+        if name not in self._skill_set:
+            self._skill_set.add(name)
+            insort(self.skills, name)
+
+    def _write(self, query, params):
+        if query == BUMP_VERSION_QUERY.strip():
+            self.version += 1
+            return [{"version": self.version}]
+        if query == IMPORT_SKILLS_QUERY.strip():
+            for row in params["rows"]:
+                self._merge_skill(row["name"])
+            return []
+        if query == IMPORT_JOBS_QUERY.strip():
+            for row in params["rows"]:
+                job = self._job_by_id.get(row["job_id"])
+                if job is None:
+                    job = self._job_by_id[row["job_id"]] = {"id": row["job_id"]}
+                    self.jobs.append(job)
+                job.update(name=row["name"], city=row["city"], title=row["title"])
+                for rec in self.by_job.get(row["job_id"], ()):
+                    rec.update(job_name=row["name"], city=row["city"])
+            return []
+        if query == BULK_REPLACE_USER_SKILLS_QUERY.strip():
+            for row in params["rows"]:
+                for skill in row["skills"]:
+                    self._merge_skill(skill)
+                self.users[row["user_id"]] = list(row["skills"])
+            return []
+        # IMPORT_REQUIRES_QUERY：岗位不存在的行被 MATCH 过滤
+        for row in params["rows"]:
+            job = self._job_by_id.get(row["job_id"])
+            if job is None:
+                continue
+            self._merge_skill(row["skill"])
+            recs = self.by_job.setdefault(row["job_id"], [])
+            for rec in recs:
+                if rec["skill"] == row["skill"]:
+                    rec["weight"] = row["weight"]
+                    break
+            else:
+                rec = {"job_id": row["job_id"], "job_name": job["name"], "city": job["city"],
+                       "skill": row["skill"], "weight": row["weight"]}
+                recs.append(rec)
+                self.records.append(rec)
+        return []
+
+
+class FakeDriver:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def session(self, **kwargs):
+        return FakeSession(self.graph)
+
+    def close(self):
+        pass
@@ -0,0 +1,62 @@
+"""
+优化前的热点实现（照搬最初版本的 app.py），作为基准对照组
+"""
+
+ALL_JOB_SKILLS_QUERY = """
+    MATCH (j:Job)-[r:REQUIRES]->(s:Skill)
+    RETURN j.job_id AS job_id, j.name AS job_name, j.city AS city, collect({name: s.name, weight: r.weight}) AS skill_list
+"""
+
+JOB_REQUIRES_QUERY = """
+    MATCH (j:Job {job_id: $job_id})-[r:REQUIRES]->(s:Skill)
+    RETURN s.name AS name, coalesce(r.weight, 1) AS weight, j.name AS job_name
+"""
+
+
+def path_reco_rank(driver, user_skills):
+    """/path-reco：逐岗位循环计算匹配率，list 成员判断"""
+    job_reco = []
+    with driver.session() as session:
+        all_job_skills = session.run(ALL_JOB_SKILLS_QUERY).data()
+    for rec in all_job_skills:
+        skill_list = [s for s in rec["skill_list"] if s["name"] is not None and s["name"].strip() != ""]
+        skill_names = [s["name"] for s in skill_list]
+        total_weight = sum([s["weight"] for s in skill_list])
+        overlap_weight = sum([s["weight"] for s in skill_list if s["name"] in user_skills])
+        rate = round((overlap_weight / total_weight) * 100) if total_weight > 0 else 0
+        job_reco.append({
+            "job_id": rec["job_id"],
+            "job_name": rec["job_name"],
+            "city": rec.get("city", "未知"),
+            "match_rate": rate,
+            "overlap_skills": list(set(user_skills) & set(skill_names))
+        })
+    job_reco.sort(key=lambda x: x["match_rate"], reverse=True)
+    return job_reco[:5]
+
+
+def match_score(driver, job_id, user_skills):
+    """/match-diag：查询单个岗位需求并计算加权匹配度"""
+    with driver.session() as session:
+        job_records = session.run(JOB_REQUIRES_QUERY, job_id=job_id).data()
+    job_records = [r for r in job_records if r["name"] is not None and r["name"].strip() != ""]
+    req_dict = {r["name"]: r["weight"] for r in job_records}
+    owned = [s for s in req_dict if s in user_skills]
+    missing = [s for s in req_dict if s not in user_skills]
+    total_w = sum(req_dict.values())
+    owned_w = sum(req_dict[s] for s in owned)
+    score = round((owned_w / total_w) * 100) if total_w > 0 else 0
+    missing_sorted = sorted(missing, key=lambda x: req_dict[x], reverse=True)
+    return score, owned, missing_sorted[:3]
+
+
+def extract_skills(skill_list, resume_text):
+    """/resume-kg：逐个技能做子串判断"""
+    text_lower = resume_text.lower()
+    return [skill for skill in skill_list if skill.lower() in text_lower]
+
+
+def suggest(skill_list, prefix):
+    """/api/skill/suggest：全量 startswith 扫描"""
+    prefix = prefix.strip().lower()
+    return [skill for skill in skill_list if skill.lower().startswith(prefix)][:10]
@@ -0,0 +1,229 @@
+"""
+多 worker 压测：吞吐量随 worker 数的变化
+
+对每个 worker 数启动一次 gunicorn（job_kg_app/gunicorn.conf.py + 压测工厂 loadtest_app.py，合成图谱 + 内存版 Neo4j），
+客户端（多进程，每进程若干线程，keep-alive 长连接）在固定时长内以固定并发持续请求一组混合接口：
+技能联想、岗位技能图、岗位浏览页、职业路径推荐页、批量匹配。输出吞吐量、p50/p99 延迟及相对首个 worker 数的加速比。
+
+用法（在项目根目录执行，需安装 gunicorn）：
+    python benchmarks/loadtest.py                                   # worker 数 1 2 4，small 规模
+    python benchmarks/loadtest.py --workers 1 2 4 8 --threads 4 --duration 20 --concurrency 64
+    python benchmarks/loadtest.py --url http://10.0.0.5:5000        # 压测已用 loadtest_app 启动的实例
+客户端与服务端在同一台机器上时会争抢 CPU，worker 数接近核数后加速比会提前饱和。
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic  # noqa: E402
+from loadtest_app import SCALES  # noqa: E402
+
+# (名称, 权重)
+SCENARIOS = (
+    ("suggest", 5),
+    ("job_graph", 2),
+    ("explore", 1),
+    ("path_reco", 2),
+    ("batch_match", 1),
+)
+
+
+def make_requests(scale, n=2000, seed=0):
+    """按场景权重生成 n 个请求 (场景, 方法, 路径, 请求体)；数据与 loadtest_app 生成的合成图谱一致"""
+    n_jobs, n_skills, avg_skills = SCALES[scale]
+    skills, jobs, _ = synthetic.make_graph(n_jobs, n_skills, avg_skills, seed=0)
+    rng = random.Random(seed)
+    job_ids = [job["id"] for job in jobs]
+    names = [name for name, _ in SCENARIOS]
+    weights = [w for _, w in SCENARIOS]
+    requests = []
+    for i in range(n):
+        scenario = rng.choices(names, weights)[0]
+        job_id = rng.choice(job_ids)
+        body = None
+        if scenario == "suggest":
+            skill = rng.choice(skills)
+            method, path = "GET", f"/api/skill/suggest?prefix={quote(skill[:rng.randint(1, 3)])}&limit=10"
+        elif scenario == "job_graph":
+            method, path = "GET", f"/api/graph/job/{quote(job_id)}"
+        elif scenario == "explore":
+            method, path = "GET", f"/explore?job_id={quote(job_id)}"
+        elif scenario == "path_reco":
+            method, path = "GET", f"/path-reco?job_id={quote(job_id)}"
+        else:
+            users = [synthetic.make_user_skills(skills, rng.randint(5, 30), seed=i * 10 + k) for k in range(5)]
+            body = json.dumps({"users": users, "job_ids": rng.sample(job_ids, 20), "details": False})
+            method, path = "POST", "/api/match/batch"
+        requests.append((scenario, method, path, body))
+    return requests
+
+
+# ========== 客户端 ==========
+def _client_process(base_url, requests, duration, threads, seed):
+    """一个客户端进程：threads 个线程各持一条长连接循环发请求，返回 (延迟列表, 错误数)"""
+    parts = urlsplit(base_url)
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def run(offset):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local, failed = [], 0
+        i = offset
+        while time.perf_counter() < deadline:
+            _, method, path, body = requests[i % len(requests)]
+            i += 1
+            headers = {"Content-Type": "application/json"} if body else {}
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 400:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - t0)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    rng = random.Random(seed)
+    workers = [threading.Thread(target=run, args=(rng.randrange(len(requests)),)) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return latencies, errors[0]
+
+
+def run_load(base_url, requests, duration, concurrency, clients):
+    clients = max(1, min(clients, concurrency))
+    per_client = [concurrency // clients + (1 if i < concurrency % clients else 0) for i in range(clients)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.starmap(_client_process,
+                               [(base_url, requests, duration, n, i) for i, n in enumerate(per_client)])
+    elapsed = time.perf_counter() - start
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    errors = sum(err for _, err in results)
+    if not latencies:
+        return {"requests": 0, "errors": errors, "rps": 0.0, "p50_ms": None, "p99_ms": None}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+# ========== 服务端 ==========
+def wait_ready(base_url, proc=None, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"服务进程已退出（返回码 {proc.returncode}）")
+        try:
+            with urllib.request.urlopen(base_url + "/metrics", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    raise RuntimeError(f"服务在 {timeout}s 内未就绪: {base_url}")
+
+
+def start_server(port, workers, threads, scale):
+    env = dict(os.environ, KG_BIND=f"127.0.0.1:{port}", KG_WORKERS=str(workers), KG_THREADS=str(threads),
+               KG_LOADTEST_SCALE=scale, SECRET_KEY=os.environ.get("SECRET_KEY", "loadtest-secret"))
+    cmd = [sys.executable, "-m", "gunicorn", "-c", "job_kg_app/gunicorn.conf.py",
+           "--pythonpath", "benchmarks", "loadtest_app:create_app()"]
+    log = tempfile.TemporaryFile()  # 服务端日志写临时文件，避免管道写满阻塞
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    proc.log = log
+    return proc
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    proc.log.close()
+
+
+def print_row(label, result, base_rps):
+    speedup = f"{result['rps'] / base_rps:.2f}x" if base_rps else "-"
+    p50 = f"{result['p50_ms']:.2f}" if result["p50_ms"] is not None else "-"
+    p99 = f"{result['p99_ms']:.2f}" if result["p99_ms"] is not None else "-"
+    print(f"{label:<10} {result['requests']:>9} {result['errors']:>7} {result['rps']:>10.1f} "
+          f"{p50:>9} {p99:>9} {speedup:>8}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="gunicorn 多 worker 压测")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4, help="每个 worker 的线程数")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--duration", type=float, default=10.0, help="每轮压测秒数")
+    parser.add_argument("--warmup", type=float, default=2.0, help="每轮正式计时前的预热秒数")
+    parser.add_argument("--concurrency", type=int, default=32, help="并发连接数")
+    parser.add_argument("--clients", type=int, default=max(1, min(4, os.cpu_count() // 2)), help="客户端进程数")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--url", help="压测已运行的实例（不启动 gunicorn，忽略 --workers）")
+    args = parser.parse_args(argv)
+
+    requests = make_requests(args.scale)
+    print(f"== scale={args.scale} concurrency={args.concurrency} threads/worker={args.threads} "
+          f"duration={args.duration}s ==")
+    print(f"{'workers':<10} {'requests':>9} {'errors':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'speedup':>8}")
+
+    if args.url:
+        base = args.url.rstrip("/")
+        wait_ready(base)
+        run_load(base, requests, args.warmup, args.concurrency, args.clients)
+        print_row("-", run_load(base, requests, args.duration, args.concurrency, args.clients), None)
+        return 0
+
+    base_rps = None
+    for workers in args.workers:
+        base = f"http://127.0.0.1:{args.port}"
+        proc = start_server(args.port, workers, args.threads, args.scale)
+        try:
+            wait_ready(base, proc)
+            run_load(base, requests, args.warmup, args.concurrency, args.clients)
+            result = run_load(base, requests, args.duration, args.concurrency, args.clients)
+        except RuntimeError:
+            proc.log.seek(0)
+            print(proc.log.read().decode("utf-8", "replace")[-2000:], file=sys.stderr)
+            stop_server(proc)
+            raise
+        stop_server(proc)
+        base_rps = base_rps or result["rps"]
+        print_row(str(workers), result, base_rps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
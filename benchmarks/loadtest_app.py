@@ -0,0 +1,36 @@
+"""
+压测用应用工厂：合成图谱 + 内存版 Neo4j 驱动替身，其余与生产部署（app.create_app）完全一致
+
+由 loadtest.py 通过 gunicorn 启动（preload_app 下只在 master 中生成一次数据）：
+    gunicorn -c job_kg_app/gunicorn.conf.py --pythonpath benchmarks "loadtest_app:create_app()"
+规模由环境变量 KG_LOADTEST_SCALE 指定（同 bench.py 的 --scale，默认 small）。
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "job_kg_app"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from fake_neo4j import FakeDriver, FakeGraph  # noqa: E402
+from lazy import LazyProxy  # noqa: E402
+
+SCALES = {
+    "small": (1_000, 10_000, 10),
+    "medium": (10_000, 20_000, 12),
+    "large": (100_000, 50_000, 12),
+}
+
+
+def create_app():
+    import app as kg
+
+    n_jobs, n_skills, avg_skills = SCALES[os.environ.get("KG_LOADTEST_SCALE", "small")]
+    skills, jobs, records = synthetic.make_graph(n_jobs, n_skills, avg_skills, seed=0)
+    graph = FakeGraph(skills, jobs, records)
+    driver = LazyProxy(lambda: FakeDriver(graph))
+    kg.neo4j_driver = driver
+    kg.graph_cache._driver = driver
+    kg.app.extensions["kg_driver"] = driver
+    return kg.create_app()
@@ -0,0 +1,263 @@
+"""
+本地 OpenAI 兼容模拟服务 + 批量报告联调
+
+模拟 /v1/chat/completions（非流式）：随机延迟、服务端限速（超出 --max-rps 返回 429 + Retry-After）、
+按概率返回 429 / 500、按概率长时间不响应（触发客户端超时），用于验证 report_batch.py 的
+并发上限、令牌桶限速、退避重试、超时与断点续跑，不消耗真实 API 额度。
+
+用法（在项目根目录执行）：
+    python benchmarks/mock_llm.py serve --port 8808 --max-rps 20 --error-rate 0.1
+        # 另开终端：DEEPSEEK_BASE_URL=http://127.0.0.1:8808/v1 python job_kg_app/report_batch.py ...
+    python benchmarks/mock_llm.py run                          # 启动模拟服务并跑一批合成匹配结果
+    python benchmarks/mock_llm.py run --items 500 --interrupt 3  # 3 秒后中断，再用同一输出文件续跑
+run 结束时校验：每个条目恰有一条成功记录、服务端同时处理的请求数不超过并发上限（中断续跑时不校验，
+被取消的请求在服务端可能尚未结束），并输出客户端/服务端统计。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "job_kg_app"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=(0.05, 0.3), max_rps=None, error_rate=0.0, server_error_rate=0.0,
+                 hang_rate=0.0, hang_seconds=30.0, seed=0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.server_error_rate = server_error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "429_rate": 0, "429_random": 0, "500": 0, "hang": 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._window = []  # 最近 1 秒内放行的请求时间
+
+    def admit(self):
+        """服务端滑动窗口限速：1 秒内放行不超过 max_rps 个"""
+        if not self.max_rps:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.max_rps:
+                return False
+            self._window.append(now)
+            return True
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server.count("requests")
+        if not self.path.endswith("/chat/completions"):
+            return self._reply(404, {"error": {"message": "not found"}})
+        if not server.admit():
+            server.count("429_rate")
+            return self._reply(429, {"error": {"message": "rate limit exceeded", "type": "rate_limit"}},
+                               {"Retry-After": "0.5"})
+        with server.lock:
+            roll = server.rng.random()
+            delay = server.rng.uniform(*server.latency)
+        if roll < server.error_rate:
+            server.count("429_random")
+            return self._reply(429, {"error": {"message": "too many requests", "type": "rate_limit"}})
+        roll -= server.error_rate
+        if roll < server.server_error_rate:
+            server.count("500")
+            return self._reply(500, {"error": {"message": "internal error"}})
+        roll -= server.server_error_rate
+        if roll < server.hang_rate:
+            # 不响应，客户端超时后断开（不计入在途请求数）
+            server.count("hang")
+            time.sleep(server.hang_seconds)
+            return
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(delay)
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            content = f"【匹配情况总结】\n模拟报告（{len(prompt)} 字提示词）\n【行动小贴士】\n✅ 按优先级补齐技能"
+            server.count("ok")
+            return self._reply(200, {
+                "id": f"chatcmpl-mock-{server.counts['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(content),
+                          "total_tokens": len(prompt) + len(content)},
+            })
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 客户端超时后已断开
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def start_server(port=0, **options):
+    server = MockLLMServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_match_results(n, seed=0):
+    """合成匹配结果（字段同 /match-diag 的 match_result）"""
+    rng = random.Random(seed)
+    skills = synthetic.make_skills(500, seed)
+    results = []
+    for i in range(n):
+        required = rng.sample(skills, rng.randint(4, 12))
+        cut = rng.randint(0, len(required))
+        results.append({
+            "id": f"u{i}",
+            "job_name": f"开发工程师{i % 50}",
+            "match_score": rng.randint(0, 100),
+            "owned_skills": required[:cut],
+            "missing_skills": required[cut:],
+            "recommend_skills": required[cut:cut + 3],
+        })
+    return results
+
+
+def run_batch(args):
+    from openai import AsyncOpenAI
+
+    from app import LLM_MODEL, build_report_messages
+    from report_batch import BatchReportRunner, read_items
+
+    server = start_server(latency=(args.latency_min, args.latency_max), max_rps=args.max_rps,
+                          error_rate=args.error_rate, server_error_rate=args.server_error_rate,
+                          hang_rate=args.hang_rate, hang_seconds=args.timeout * 3)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    workdir = tempfile.mkdtemp(prefix="report_batch_")
+    input_path = os.path.join(workdir, "matches.jsonl")
+    output_path = os.path.join(workdir, "reports.jsonl")
+    with open(input_path, "w", encoding="utf-8") as f:
+        for row in make_match_results(args.items):
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def runner():
+        client = AsyncOpenAI(api_key="mock", base_url=base_url, max_retries=0)
+        return BatchReportRunner(client, build_report_messages, LLM_MODEL, concurrency=args.concurrency,
+                                 rate=args.rate, max_retries=args.retries, timeout=args.timeout,
+                                 backoff=args.backoff, out=lambda *a: print(*a, flush=True))
+
+    print(f"== {args.items} 条，并发 {args.concurrency}，限速 {args.rate}/s（服务端上限 {args.max_rps}/s），"
+          f"随机 429 {args.error_rate:.0%}，500 {args.server_error_rate:.0%}，超时 {args.hang_rate:.0%} ==")
+    t0 = time.perf_counter()
+    if args.interrupt:
+        async def interrupted():
+            try:
+                await asyncio.wait_for(runner().run(read_items(input_path, LLM_MODEL), output_path), args.interrupt)
+            except asyncio.TimeoutError:
+                pass
+        asyncio.run(interrupted())
+        with open(output_path, encoding="utf-8") as f:
+            print(f"第一轮在 {args.interrupt}s 时中断，已写入 {sum(1 for _ in f)} 条记录，续跑...")
+    stats = asyncio.run(runner().run(read_items(input_path, LLM_MODEL), output_path))
+    elapsed = time.perf_counter() - t0
+
+    ok_ids = []
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["status"] == "ok":
+                ok_ids.append(record["id"])
+    print(f"客户端: {stats}")
+    print(f"服务端: {server.counts}，最大在途 {server.max_in_flight}，"
+          f"平均 {server.counts['requests'] / elapsed:.1f} 次请求/s")
+    print(f"输出: {output_path}")
+    server.shutdown()
+
+    problems = []
+    if len(ok_ids) != len(set(ok_ids)):
+        problems.append(f"{len(ok_ids) - len(set(ok_ids))} 个条目有重复的成功记录")
+    if stats["error"] == 0 and len(set(ok_ids)) != args.items:
+        problems.append(f"成功 {len(set(ok_ids))} 条，应为 {args.items} 条")
+    if not args.interrupt and server.max_in_flight > args.concurrency:
+        problems.append(f"服务端在途请求 {server.max_in_flight} 超过并发上限 {args.concurrency}")
+    for problem in problems:
+        print(f"[FAIL] {problem}")
+    return 1 if problems else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地 OpenAI 兼容模拟服务 / 批量报告联调")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "run"):
+        p = sub.add_parser(name)
+        p.add_argument("--latency-min", type=float, default=0.05)
+        p.add_argument("--latency-max", type=float, default=0.3)
+        p.add_argument("--max-rps", type=int, default=20, help="服务端每秒放行上限，超出返回 429（0 为不限）")
+        p.add_argument("--error-rate", type=float, default=0.05, help="随机返回 429 的比例")
+        p.add_argument("--server-error-rate", type=float, default=0.02, help="随机返回 500 的比例")
+        p.add_argument("--hang-rate", type=float, default=0.01, help="长时间不响应的比例")
+    serve = sub.choices["serve"]
+    serve.add_argument("--port", type=int, default=8808)
+    serve.add_argument("--hang-seconds", type=float, default=120.0)
+    run = sub.choices["run"]
+    run.add_argument("--items", type=int, default=200)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--rate", type=float, default=15.0, help="客户端令牌桶速率（次/s）")
+    run.add_argument("--retries", type=int, default=5)
+    run.add_argument("--timeout", type=float, default=2.0, help="单次请求超时（秒）")
+    run.add_argument("--backoff", type=float, default=0.2, help="首次重试的基础等待（秒）")
+    run.add_argument("--interrupt", type=float, help="第一轮运行多少秒后中断，随后续跑")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        return run_batch(args)
+    server = start_server(args.port, latency=(args.latency_min, args.latency_max), max_rps=args.max_rps,
+                          error_rate=args.error_rate, server_error_rate=args.server_error_rate,
+                          hang_rate=args.hang_rate, hang_seconds=args.hang_seconds)
+    print(f"模拟服务已启动: http://127.0.0.1:{args.port}/v1（Ctrl-C 退出）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+合成数据生成器：岗位-技能图谱 + 简历文本
+
+技能热度服从 Zipf 分布（少数技能被大量岗位需要），与真实招聘数据的形态接近。
+"""
+import csv
+import os
+import random
+
+_CITIES = ["北京", "上海", "深圳", "广州", "杭州", "成都", "武汉", "南京", "西安", "苏州"]
+_JOB_WORDS = ["开发", "算法", "数据分析", "测试", "运维", "产品", "前端", "后端", "研究", "架构"]
+_LATIN = "abcdefghijklmnopqrstuvwxyz"
+_FILLER = ["负责", "参与", "熟悉", "掌握", "项目", "系统", "设计", "实现", "优化", "团队", "业务", "平台",
+           "experience", "with", "and", "the", "built", "service", "using", "team"]
+
+
+def make_skills(n_skills, seed=0):
+    """生成 n 个不重复的技能名（中英文混合、带版本号/符号的各占一部分）"""
+    rng = random.Random(seed)
+    skills = set()
+    while len(skills) < n_skills:
+        kind = rng.random()
+        if kind < 0.5:
+            name = "".join(rng.choice(_LATIN) for _ in range(rng.randint(2, 9))).capitalize()
+            if rng.random() < 0.2:
+                name += rng.choice([".js", "+", " 3", "DB", " Cloud"])
+        else:
+            name = rng.choice(["机器", "深度", "分布式", "数据", "云", "嵌入式", "图像", "自然语言"]) + \
+                   rng.choice(["学习", "计算", "存储", "处理", "开发", "建模", "挖掘"]) + str(len(skills) % 97)
+        skills.add(name)
+    return sorted(skills)
+
+
+def make_graph(n_jobs, n_skills, avg_skills=10, seed=0):
+    """
+    :return: (技能列表, 岗位列表 [{id, name, city}], REQUIRES 记录 [{job_id, job_name, city, skill, weight}])
+    """
+    rng = random.Random(seed)
+    skills = make_skills(n_skills, seed)
+    # Zipf 权重：第 k 个技能被选中的概率 ∝ 1/(k+1)
+    cum = []
+    total = 0.0
+    for k in range(n_skills):
+        total += 1.0 / (k + 1)
+        cum.append(total)
+
+    jobs = []
+    records = []
+    for i in range(n_jobs):
+        job_id = f"J{i:07d}"
+        name = rng.choice(_JOB_WORDS) + "工程师" + str(i % 1000)
+        city = rng.choice(_CITIES)
+        jobs.append({"id": job_id, "name": name, "city": city, "title": ""})
+        k = max(1, int(rng.gauss(avg_skills, avg_skills / 3)))
+        chosen = set(rng.choices(skills, cum_weights=cum, k=k))
+        for skill in chosen:
+            records.append({"job_id": job_id, "job_name": name, "city": city,
+                            "skill": skill, "weight": float(rng.randint(1, 5))})
+    return skills, jobs, records
+
+
+def make_user_skills(skills, n, seed=0):
+    rng = random.Random(seed)
+    # 偏向热门技能，更接近真实用户
+    head = skills[: max(n * 20, 100)]
+    return rng.sample(head, min(n, len(head)))
+
+
+def make_resume(skills, n_chars, skill_density=0.05, seed=0):
+    """生成约 n_chars 个字符的简历文本，按 skill_density 比例穿插技能名"""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < n_chars:
+        token = rng.choice(skills) if rng.random() < skill_density else rng.choice(_FILLER)
+        parts.append(token)
+        size += len(token) + 1
+    return " ".join(parts)
+
+
+def write_csvs(directory, skills, jobs, records):
+    """把合成图谱写成 graph_import.py 的输入格式，返回 (技能, 岗位, 岗位需求) 三个文件路径"""
+    paths = tuple(os.path.join(directory, name) for name in ("skills.csv", "jobs.csv", "requires.csv"))
+    with open(paths[0], "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["skill_name"])
+        writer.writerows([s] for s in skills)
+    with open(paths[1], "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["job_id", "name", "city", "title"])
+        writer.writerows([j["id"], j["name"], j["city"], j["title"]] for j in jobs)
+    with open(paths[2], "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["job_id", "skill", "weight"])
+        writer.writerows([r["job_id"], r["skill"], r["weight"]] for r in records)
+    return paths
@@ -1,58 +1,141 @@
+import gc
 import os
-import csv
+import json
 import time
+import uuid
 import warnings
-from flask import Flask, render_template, request, jsonify, session
+from datetime import timedelta
+from flask import Flask, render_template, request, jsonify, session, url_for, Response, stream_with_context
 from flask_wtf import FlaskForm
 from wtforms import HiddenField, validators
-from neo4j import GraphDatabase
-from openai import OpenAI
+
+import graph_dao
+import metrics
+from batch_match import match_batch
+from graph_payload import job_graph_payload, path_graph_payload, plan_path
+from graph_schema import bootstrap_schema
+from graph_snapshot import SnapshotCache
+from lazy import LazyProxy
+from report_cache import ReportCache, report_cache_key
+from report_jobs import ReportJobManager, ReportJobStore
+from skill_cache import load_skill_cache, read_skill_csv
+from skill_embed import PARTIAL_CREDIT
+from skill_extractor import SkillExtractor
+from skill_index import SkillIndex
 
 # 忽略无关警告
 warnings.filterwarnings("ignore", category=UserWarning, module='jieba')
 
 # ========== 初始化配置 ==========
 app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key-here'
+# 配置项均可由同名环境变量覆盖（生产部署必须设置 SECRET_KEY）；未设置时使用本地开发默认值
+DEV_SECRET_KEY = 'your-secret-key-here'
+app.config['SECRET_KEY'] = os.environ.get("SECRET_KEY", DEV_SECRET_KEY)
 app.config['JSON_AS_ASCII'] = False  # 解决中文乱码
 app.config['SESSION_TYPE'] = 'filesystem'
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)  # 会话用户身份保留时长
 
 # Neo4j配置
-NEO4J_URI = "bolt://127.0.0.1:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASSWORD = "12345678"
-neo4j_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://127.0.0.1:7687")
+NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "12345678")
+
+
+def create_neo4j_driver():
+    from neo4j import GraphDatabase
+    return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+
+
+# 驱动与 LLM 客户端均在首次使用时才创建（导入 app 不连接外部服务；多进程部署时各 worker 独立创建）
+neo4j_driver = LazyProxy(create_neo4j_driver)
+graph_dao.init_app(app, neo4j_driver)  # 请求级 session：每个请求最多打开一个，读查询请求内去重
+
+# 埋点：/metrics 输出 Prometheus 指标；KG_PROFILE=1 时请求头 X-Profile: 1 触发单次请求 profile
+app.config['PROFILE_ENABLED'] = os.environ.get("KG_PROFILE") == "1"
+app.config['PROFILE_DIR'] = os.environ.get("KG_PROFILE_DIR", "profiles")
+metrics.init_app(app)
 
 # DeepSeek API配置
-DEEPSEEK_API_KEY = ""
-client = OpenAI(
-    api_key=DEEPSEEK_API_KEY,
-    base_url="https://api.deepseek.com"
-)
+DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY", "")
+DEEPSEEK_BASE_URL = os.environ.get("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+
+
+def create_llm_client():
+    from openai import OpenAI
+    return OpenAI(
+        api_key=DEEPSEEK_API_KEY,
+        base_url=DEEPSEEK_BASE_URL
+    )
+
+
+def create_async_llm_client(**kwargs):
+    """异步客户端（report_batch.py 批量离线生成报告用；重试由调用方控制时传 max_retries=0）"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=DEEPSEEK_API_KEY, base_url=DEEPSEEK_BASE_URL, **kwargs)
+
+
+client = LazyProxy(create_llm_client)
+
+# 图谱快照缓存（岗位/技能/REQUIRES权重/统计等静态数据，进程内只读共享）
+GRAPH_SNAPSHOT_TTL = 300  # 秒，过期后检查版本标记节点，版本变化才重载
+graph_cache = SnapshotCache(neo4j_driver, ttl=GRAPH_SNAPSHOT_TTL)
+JOB_PAGE_SIZE = 50  # /explore 岗位列表每页条数
+JOB_LIST_LIMIT = 20  # /api/jobs 默认每页条数
+JOB_LIST_MAX_LIMIT = 100
+
+# LLM报告缓存（相同匹配结果直接复用报告；REPORT_CACHE_DB 为空时只用内存缓存）
+LLM_MODEL = "deepseek-chat"
+REPORT_CACHE_SIZE = 1024
+REPORT_CACHE_TTL = 7 * 24 * 3600  # 秒
+REPORT_CACHE_DB = os.environ.get("REPORT_CACHE_DB", "")  # 如 "report_cache.sqlite3"；gunicorn.conf.py 多 worker 时默认设置
+report_cache = ReportCache(max_entries=REPORT_CACHE_SIZE, ttl=REPORT_CACHE_TTL, db_path=REPORT_CACHE_DB or None)
+
+# LLM报告后台任务池（报告在后台线程生成，页面通过SSE流式拉取）
+# 设置了 REPORT_CACHE_DB 时任务状态与内容同步写入同一 SQLite，任意 worker 都能查询/续读
+REPORT_WORKERS = 8
+report_jobs = ReportJobManager(max_workers=REPORT_WORKERS,
+                               store=ReportJobStore(REPORT_CACHE_DB) if REPORT_CACHE_DB else None)
+
+# 批量匹配接口上限
+BATCH_MAX_USERS = 1000
+BATCH_MAX_JOBS = 1000
+BATCH_MAX_REPORTS = 50  # 请求生成AI报告时，用户数×岗位数不得超过该值
 
 # ========== 技能词典加载 ==========
 SKILL_CSV_PATH = "job_kg_app/skill_nodes.csv"
+# 技能列表、联想索引、抽取自动机的预编译缓存（mmap 打开，多进程共享；CSV 的 mtime/sha256 变化时自动重建）
+SKILL_CACHE_PATH = "job_kg_app/skill_nodes.cache"
 
 
 def load_skill_dict():
     """加载技能词典（去重、排序）"""
-    skill_set = set()
     try:
-        with open(SKILL_CSV_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # 跳过表头
-            for row in reader:
-                if row and row[0].strip():
-                    skill_set.add(row[0].strip())
+        return read_skill_csv(SKILL_CSV_PATH)
     except FileNotFoundError:
         # 内置默认技能（无CSV时兜底）
-        skill_set = {"Java", "Python", "MySQL", "Redis", "Spring Boot", "Vue.js", "React.js", "JavaScript", "HTML",
-                     "CSS"}
-    return sorted(list(skill_set))
+        return sorted(["Java", "Python", "MySQL", "Redis", "Spring Boot", "Vue.js", "React.js", "JavaScript", "HTML",
+                       "CSS"])
+
+
+def load_skill_data():
+    """
+    技能列表、联想索引、简历技能抽取器
+    优先走二进制缓存（列表与索引直接在映射上查询，零构建）；缓存不可写或 CSV 缺失时在内存中构建
+    抽取器在首次处理简历时才创建
+    """
+    try:
+        cache = load_skill_cache(SKILL_CSV_PATH, SKILL_CACHE_PATH)
+        return cache.skills, cache.skill_index(), LazyProxy(cache.skill_extractor)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[WARN] 技能词典缓存不可用，改为内存构建: {e}")
+    skills = load_skill_dict()
+    return skills, SkillIndex(skills), LazyProxy(lambda: SkillExtractor(skills))
 
 
-# 全局技能列表
-SKILL_LIST = load_skill_dict()
+# 全局技能列表 + 联想索引 + 简历技能抽取器
+SKILL_LIST, SKILL_INDEX, SKILL_EXTRACTOR = load_skill_data()
 
 
 # ========== 表单定义 ==========
@@ -123,12 +206,14 @@ def get_competition_summary(score, owned_skills, missing_skills):
         return f"🔧 你的技能匹配度仅{score}%，需系统学习{missing_text}等核心技能！"
 
 
-def generate_llm_report(match_result, user_skills):
-    """调用DeepSeek API生成分析报告"""
+def build_report_prompt(match_result):
+    """根据匹配结果拼接报告提示词"""
     # 过滤掉None值
     owned_skills = filter_none_skills(match_result.get('owned_skills', []))
     missing_skills = filter_none_skills(match_result.get('missing_skills', []))
     recommend_skills = filter_none_skills(match_result.get('recommend_skills', []))
+    similar_skills = [f"{skill}（已掌握相近的{v['skill']}）"
+                      for skill, v in (match_result.get('similar_skills') or {}).items()]
 
     prompt = f"""
         请基于以下岗位匹配信息，生成一份排版清晰的智能分析报告：
@@ -137,6 +222,7 @@ def generate_llm_report(match_result, user_skills):
         - 已具备技能：{safe_join(owned_skills, '、') if owned_skills else '无'}
         - 缺失技能：{safe_join(missing_skills, '、') if missing_skills else '无'}
         - 优先补齐建议：{safe_join(recommend_skills, '、') if recommend_skills else '无'}
+        - 可迁移的相近技能：{safe_join(similar_skills, '、') if similar_skills else '无'}
 
         报告必须包含以下板块：
         1. 【匹配情况总结】
@@ -153,44 +239,97 @@ def generate_llm_report(match_result, user_skills):
         - 内容用短句，每段不超过2行，关键信息用"✅""⚠️"标记；
         - 不要用任何Markdown格式，只输出纯文本+换行符。
     """
+    return prompt.strip()
+
 
+def build_report_messages(match_result):
+    return [
+        {"role": "system", "content": "你是一位职业技能分析助手"},
+        {"role": "user", "content": build_report_prompt(match_result)}
+    ]
+
+
+def get_cached_report(key):
+    """读报告缓存并记录命中率"""
+    cached = report_cache.get(key)
+    metrics.REPORT_CACHE.inc(result="miss" if cached is None else "hit")
+    return cached
+
+
+def stream_llm_report(match_result, check_cache=True):
+    """
+    流式调用DeepSeek API，逐段产出报告纯文本（供后台任务使用；成功生成的完整报告写入缓存）
+    :param check_cache: 提交方已查过缓存（未命中）时传 False，避免同一次未命中被重复计数
+    """
+    key = report_cache_key(match_result, LLM_MODEL)
+    if check_cache:
+        cached = get_cached_report(key)
+        if cached is not None:
+            yield cached
+            return
+
+    parts = []
+    start = time.perf_counter()
     try:
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": "你是一位职业技能分析助手"},
-                {"role": "user", "content": prompt.strip()}
-            ],
-            stream=False,
-            timeout=30
+        stream = client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=build_report_messages(match_result),
+            stream=True,
+            timeout=60
         )
-        # 关键：将纯文本的换行符替换为HTML的<br>标签，确保网页渲染换行
-        report_html = response.choices[0].message.content.replace("\n", "<br>")
-        return report_html
-        # return response.choices[0].message.content
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception:
+        # 抛给 ReportJobManager 标记为失败，SSE end 事件带 status: "error"，页面显示失败提示而非报告内容
+        metrics.LLM_ERRORS.inc(mode="stream")
+        raise
+    finally:
+        metrics.LLM_SECONDS.observe(time.perf_counter() - start, mode="stream")
+    if parts:
+        report_cache.set(key, "".join(parts))
+
+
+def get_job_option(job_id):
+    """岗位选择框的当前选中项 {"id", "name", "city"}；未选择或岗位不在快照中时返回 None"""
+    if not job_id:
+        return None
+    try:
+        job = graph_cache.get().job_by_id.get(job_id)
     except Exception as e:
-        return f"智能报告生成失败：{str(e)}"
+        print(f"[ERROR] 查询岗位失败: {e}")
+        return None
+    return {"id": job.id, "name": job.name, "city": job.city} if job else None
+
+
+def get_current_user_id():
+    """
+    当前访问者对应的 Person 节点ID（首次访问时生成并写入签名 Cookie 会话）
+    每个浏览器会话一个独立用户，不再共用同一个节点
+    """
+    user_id = session.get("user_id")
+    if not user_id:
+        user_id = f"session_{uuid.uuid4().hex}"
+        session["user_id"] = user_id
+        session.permanent = True
+    return user_id
 
 
 def create_user_skill_relation(user_id, skills):
-    """创建用户-技能关联（覆盖旧关系）"""
+    """创建用户-技能关联（覆盖旧关系，单个写事务、一次往返；需在请求上下文中调用）"""
     try:
-        # 过滤掉None值
-        skills = filter_none_skills(skills)
+        # 过滤掉None值并去重（保持顺序）
+        skills = list(dict.fromkeys(filter_none_skills(skills)))
         if not skills:
             return False
 
-        with neo4j_driver.session() as session:
-            # 创建用户节点（存在则更新）
-            session.run("MERGE (u:Person {id: $user_id}) SET u.name = '手动输入用户'", user_id=user_id)
-            # 删除旧技能关系
-            session.run("MATCH (u:Person {id: $user_id})-[r:HAS_SKILL]->() DELETE r", user_id=user_id)
-            # 批量创建新技能关系
-            for skill in skills:
-                session.run("""
-                    MERGE (s:Skill {name: $skill})
-                    MERGE (u:Person {id: $user_id})-[r:HAS_SKILL]->(s)
-                """, skill=skill, user_id=user_id)
+        graph_dao.get_graph().replace_user_skills(user_id, skills)
+        # 已缓存的推荐排名只按增删的技能增量调整
+        graph_cache.get().reco.update_user(user_id, skills)
         return True
     except Exception as e:
         print(f"[ERROR] 创建技能关系失败：{e}")
@@ -206,16 +345,64 @@ def home():
 
 @app.route('/api/skill/suggest', methods=['GET'])
 def skill_suggest():
-    """技能联想接口"""
+    """
+    技能联想接口
+    - prefix：输入前缀
+    - mode：prefix（默认）/ infix（包含匹配）/ fuzzy（模糊补足）
+    - sort=popular：按岗位需求热度排序
+    - limit：返回条数（默认10，最多50）
+    """
     prefix = request.args.get('prefix', '').strip().lower()
     if not prefix:
         return jsonify({"code": 0, "data": []})
 
-    match_skills = [
-        skill for skill in SKILL_LIST
-        if skill.lower().startswith(prefix)
-    ]
-    return jsonify({"code": 0, "data": match_skills[:10]})
+    mode = request.args.get('mode', 'prefix')
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+
+    popularity = None
+    if request.args.get('sort') == 'popular':
+        try:
+            popularity = graph_cache.get().skill_counts
+        except Exception as e:
+            print(f"[ERROR] 加载技能热度失败: {e}")
+
+    match_skills = SKILL_INDEX.suggest(prefix, limit=limit, mode=mode, popularity=popularity)
+    return jsonify({"code": 0, "data": match_skills})
+
+
+@app.route('/api/skill/similar', methods=['GET'])
+def skill_similar():
+    """
+    相近技能接口（共现 SVD 向量 + IVF 近邻索引，不调用在线模型）
+    - skill：技能名（任意写法，按规范技能解析）
+    - limit：返回条数（默认10，最多50）
+    返回 [{"skill": 技能名, "similarity": 余弦相似度}]，相似度降序
+    """
+    skill = request.args.get('skill', '').strip()
+    if not skill:
+        return jsonify({"code": 0, "data": []})
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+
+    snap = graph_cache.get()
+    embedding = snap.embedding
+    cols = snap.matrix.columns([skill])
+    with metrics.timed_scoring("similar"):
+        # 同一规范技能的多种写法取合并结果，排除这些写法本身
+        names = {snap.matrix.skill_names[c] for c in cols}
+        best = {}
+        for name in names:
+            for other, sim in embedding.neighbors(name, limit + len(names)):
+                if other not in names and sim > best.get(other, -1):
+                    best[other] = sim
+    data = [{"skill": name, "similarity": sim}
+            for name, sim in sorted(best.items(), key=lambda item: -item[1])[:limit]]
+    return jsonify({"code": 0, "data": data})
 
 
 # ========== 功能路由 ==========
@@ -223,79 +410,48 @@ def skill_suggest():
 def explore_page():
     """
     职位图谱浏览：
-    - 支持关键词搜索（职位名 / 城市，模糊匹配）
-    - 左边岗位列表
+    - 支持关键词搜索（职位名 / 城市，模糊匹配；多个关键词用空格分隔）
+    - 左边岗位列表（按相关度排序，分页）
     - 右边选中岗位的技能子图信息 + 前端画图所需数据
     """
     q = (request.args.get("q") or "").strip()
     selected_job_id = (request.args.get("job_id") or "").strip() or None
+    page = max(request.args.get("page", 1, type=int), 1)
 
     stats = {}
     jobs = []
+    total = 0
     selected_job = None
     job_skills = []
 
     try:
-        with neo4j_driver.session() as session:
-            # 统计节点 / 关系总数
-            stats_rec = session.run("""
-                CALL {
-                  MATCH (j:Job) RETURN count(j) AS job_count
-                }
-                CALL {
-                  MATCH (s:Skill) RETURN count(s) AS skill_count
-                }
-                CALL {
-                  MATCH ()-[r:REQUIRES]->() RETURN count(r) AS rel_count
-                }
-                RETURN job_count, skill_count, rel_count
-            """).single()
-
-            if stats_rec:
-                stats = {
-                    "job_count": stats_rec["job_count"],
-                    "skill_count": stats_rec["skill_count"],
-                    "rel_count": stats_rec["rel_count"],
+        snap = graph_cache.get()
+        # 统计节点 / 关系总数（来自快照）
+        stats = dict(snap.stats)
+
+        if not q:
+            # 无搜索词时按 job_id 顺序分页浏览快照中的岗位
+            total = len(snap.jobs)
+            start = (page - 1) * JOB_PAGE_SIZE
+            jobs = [{"id": j.id, "name": j.name, "city": j.city} for j in snap.jobs[start:start + JOB_PAGE_SIZE]]
+        else:
+            # 带模糊搜索的岗位列表（进程内 n-gram 倒排索引，按相关度排序）
+            with metrics.timed_scoring("search"):
+                total, jobs = snap.search.search(q, page=page, page_size=JOB_PAGE_SIZE)
+
+        # 默认选第一个
+        if jobs and not selected_job_id:
+            selected_job_id = jobs[0]["id"]
+
+        if selected_job_id:
+            job = snap.job_by_id.get(selected_job_id)
+            if job:
+                selected_job = {
+                    "id": job.id,
+                    "name": job.name,
+                    "city": job.city,
                 }
-
-            # 带模糊搜索的岗位列表
-            jobs_query = """
-                MATCH (j:Job)
-                WHERE $q = "" 
-                   OR toLower(coalesce(j.name, j.title, "")) CONTAINS toLower($q)
-                   OR toLower(coalesce(j.city, "")) CONTAINS toLower($q)
-                RETURN 
-                  j.job_id AS id,
-                  coalesce(j.name, j.title, "") AS name,
-                  coalesce(j.city, "未知") AS city
-                ORDER BY id
-                LIMIT 200
-            """
-            jobs = session.run(jobs_query, q=q).data()
-
-            # 默认选第一个
-            if jobs and not selected_job_id:
-                selected_job_id = jobs[0]["id"]
-
-            if selected_job_id:
-                rec = session.run("""
-                    MATCH (j:Job {job_id: $job_id})
-                    OPTIONAL MATCH (j)-[r:REQUIRES]->(s:Skill)
-                    RETURN 
-                      j.job_id AS id,
-                      coalesce(j.name, j.title, "") AS name,
-                      coalesce(j.city, "未知") AS city,
-                      collect({skill: s.name, weight: coalesce(r.weight, 1.0)}) AS skills
-                """, job_id=selected_job_id).single()
-
-                if rec:
-                    selected_job = {
-                        "id": rec["id"],
-                        "name": rec["name"],
-                        "city": rec["city"],
-                    }
-                    # 过滤掉技能为None的条目
-                    job_skills = [x for x in rec["skills"] if x["skill"] is not None and x["skill"].strip() != ""]
+                job_skills = [{"skill": name, "weight": weight} for name, weight in snap.requires.get(job.id, ())]
 
     except Exception as e:
         print("[ERROR] explore_page:", e)
@@ -305,6 +461,9 @@ def explore_page():
         "explore.html",
         q=q,
         jobs=jobs,
+        total=total,
+        page=page,
+        page_count=(total + JOB_PAGE_SIZE - 1) // JOB_PAGE_SIZE,
         stats=stats,
         selected_job=selected_job,
         job_skills=job_skills,
@@ -314,7 +473,7 @@ def explore_page():
 @app.route("/resume-kg", methods=["GET", "POST"])
 def resume_kg_page():
     """简历技能解析：从简历文本中抽技能，并写入知识图谱"""
-    user_id = "manual_input_user"  # 和 match_diag / path_reco 共用一个用户
+    user_id = get_current_user_id()  # 和 match_diag / path_reco 共用同一会话用户
     resume_text = ""
     extracted_skills = []
     message = None
@@ -326,12 +485,8 @@ def resume_kg_page():
         if not resume_text:
             message = {"status": "error", "msg": "请先粘贴简历内容"}
         else:
-            text_lower = resume_text.lower()
-            # 用技能词典做一个简单的匹配（以后你们也可以换成 LLM 抽取）
-            extracted = []
-            for skill in SKILL_LIST:
-                if skill.lower() in text_lower:
-                    extracted.append(skill)
+            # 用技能词典编译的 Aho–Corasick 自动机一次扫描抽取（以后你们也可以换成 LLM 抽取）
+            extracted = sorted(SKILL_EXTRACTOR.extract(resume_text))
             extracted_skills = filter_none_skills(extracted)
 
             if not extracted_skills:
@@ -349,15 +504,9 @@ def resume_kg_page():
                 else:
                     message = {"status": "error", "msg": "写入知识图谱失败，请稍后重试"}
 
-    # 从图谱里查当前这个用户已经挂上的技能
+    # 从图谱里查当前这个用户已经挂上的技能（刚写入时直接复用写入结果）
     try:
-        with neo4j_driver.session() as session:
-            recs = session.run("""
-                MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
-                RETURN s.name AS name
-                ORDER BY name
-            """, user_id=user_id).data()
-        graph_skills = filter_none_skills([r["name"] for r in recs])
+        graph_skills = graph_dao.get_graph().user_skills(user_id)
     except Exception as e:
         print("[ERROR] resume_kg_page:", e)
 
@@ -374,34 +523,22 @@ def resume_kg_page():
 @app.route("/match-diag", methods=["GET", "POST"])
 def match_diag_page():
     """岗位匹配与技能诊断（集成手动技能输入）"""
-    # 获取所有岗位
-    try:
-        with neo4j_driver.session() as session:
-            jobs = session.run("MATCH (j:Job) RETURN j.job_id AS id, j.name AS name").data()
-        all_jobs = jobs
-    except Exception as e:
-        print(f"[ERROR] 查询岗位失败: {e}")
-        all_jobs = []
-
-    # 初始化变量
+    # 初始化变量（岗位选择框通过 /api/jobs 按需联想加载，页面只带当前选中的岗位）
+    kg = graph_dao.get_graph()
     match_result = None
     skill_submit_msg = None
     form = SkillForm()
-    user_id = "manual_input_user"
+    user_id = get_current_user_id()
     user_existing_skills = []
     llm_report = None  # 初始化LLM报告
+    report_job_id = None  # 后台报告任务ID
     radar_data = None  # 雷达图数据
+    selected_job = None  # 当前选中的目标岗位
 
     # GET请求加载用户技能
     if request.method == "GET":
         try:
-            with neo4j_driver.session() as session:
-                recs = session.run("""
-                    MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
-                    RETURN s.name AS name
-                    ORDER BY name
-                """, user_id=user_id).data()
-            user_existing_skills = filter_none_skills([r["name"] for r in recs])
+            user_existing_skills = kg.user_skills(user_id)
         except Exception as e:
             print(f"[ERROR] 加载用户已有技能失败: {e}")
             user_existing_skills = []
@@ -427,91 +564,82 @@ def match_diag_page():
         # 处理岗位匹配
         if 'target_job_id' in request.form:
             target_job_id = request.form.get("target_job_id", "").strip()
+            selected_job = get_job_option(target_job_id)
             if not target_job_id:
                 match_result = {"error": "请选择目标岗位"}
             else:
                 try:
-                    # 查询用户技能
-                    with neo4j_driver.session() as session:
-                        user_records = session.run("""
-                            MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
-                            RETURN s.name AS name
-                        """, user_id=user_id).data()
-                    user_skills = filter_none_skills([r["name"] for r in user_records])
+                    # 用户技能 + 岗位技能需求（岗位需求优先取图谱快照，不在快照中时与用户技能合并查询）
+                    snap = graph_cache.get()
+                    user_skills, summary, job_name = kg.match_inputs(user_id, target_job_id, snap)
 
                     if not user_skills:
                         match_result = {"error": "请先提交个人技能"}
                     else:
-                        # 查询岗位技能需求
-                        with neo4j_driver.session() as session:
-                            job_records = session.run("""
-                                MATCH (j:Job {job_id: $job_id})-[r:REQUIRES]->(s:Skill)  
-                                RETURN s.name AS name, coalesce(r.weight, 1) AS weight, j.name AS job_name  
-                            """, job_id=target_job_id).data()
-
-                        if not job_records:
+                        if summary is None:
                             match_result = {"error": f"岗位无技能需求数据"}
                         else:
-                            # 过滤掉技能名称为None的记录
-                            job_records = [r for r in job_records if r["name"] is not None and r["name"].strip() != ""]
-
-                            if not job_records:
-                                match_result = {"error": f"岗位技能数据异常，请检查数据库"}
-                            else:
-                                # 计算匹配度
-                                req_dict = {r["name"]: r["weight"] for r in job_records}
-                                owned = [s for s in req_dict if s in user_skills]
-                                missing = [s for s in req_dict if s not in user_skills]
-                                total_w = sum(req_dict.values())
-                                owned_w = sum(req_dict[s] for s in owned)
+                            req_dict = summary.weights
+                            # 计算匹配度（总权重、按权重排序的技能已在快照中预先算好，只需遍历一遍用户技能）
+                            with metrics.timed_scoring("match"):
+                                # 按规范技能 ID 比较（"Vue.js" 与 "Vue"、"k8s" 与 "Kubernetes" 视为同一技能）
+                                user_ids = snap.canon.ids(user_skills)
+                                owned, missing = summary.split(user_ids)
+                                # 缺失技能与某个已掌握技能语义相近（如会 PyTorch、岗位要 TensorFlow）时给部分分
+                                similar = snap.embedding.closest(missing, snap.matrix.columns(user_skills))
+                                partial = {s: req_dict[s] * sim * PARTIAL_CREDIT for s, (_, sim) in similar.items()}
+                                total_w = summary.total_weight
+                                owned_w = summary.owned_weight(user_ids) + sum(partial.values())
                                 score = round((owned_w / total_w) * 100) if total_w > 0 else 0
 
-                                missing_sorted = sorted(missing, key=lambda x: req_dict[x], reverse=True)
-                                recommend = missing_sorted[:3]
-
-                                # 重新加载用户技能（用于页面显示）
-                                try:
-                                    with neo4j_driver.session() as session:
-                                        recs = session.run("""
-                                            MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
-                                            RETURN s.name AS name
-                                            ORDER BY name
-                                        """, user_id=user_id).data()
-                                    user_existing_skills = filter_none_skills([r["name"] for r in recs])
-                                except Exception as e:
-                                    print(f"[ERROR] 重新加载用户技能失败: {e}")
-
-                                # 雷达图数据
-                                skill_dimensions = list(req_dict.keys())
-                                if skill_dimensions:  # 确保有技能维度
-                                    max_weight = max(req_dict.values()) if req_dict else 1
-                                    job_weights = [round((req_dict[skill] / max_weight) * 10, 1) for skill in
-                                                   skill_dimensions]
-                                    user_weights = [
-                                        round((req_dict[skill] / max_weight) * 10, 1) if skill in user_skills else 0 for
-                                        skill in skill_dimensions]
-                                    radar_data = {
-                                        "dimensions": skill_dimensions,
-                                        "job_weights": job_weights,
-                                        "user_weights": user_weights
-                                    }
-                                else:
-                                    radar_data = None
-
-                                # 构建匹配结果（含竞争力总结）
-                                match_result = {
-                                    "job_name": job_records[0]["job_name"],
-                                    "match_score": score,
-                                    "match_level": get_match_level(score),
-                                    "owned_skills": owned,
-                                    "missing_skills": missing,
-                                    "recommend_skills": recommend,
-                                    "radar_data": radar_data,
-                                    "competition_summary": get_competition_summary(score, owned, missing)
+                                recommend = summary.top_missing(missing, 3)
+
+                            # 用户技能（用于页面显示，复用本请求已查询的结果）
+                            try:
+                                user_existing_skills = kg.user_skills(user_id)
+                            except Exception as e:
+                                print(f"[ERROR] 重新加载用户技能失败: {e}")
+
+                            # 雷达图数据
+                            skill_dimensions = list(req_dict.keys())
+                            if skill_dimensions:  # 确保有技能维度
+                                max_weight = summary.max_weight or 1
+                                credit = {s: req_dict[s] for s in owned}
+                                credit.update(partial)
+                                job_weights = [round((req_dict[skill] / max_weight) * 10, 1) for skill in
+                                               skill_dimensions]
+                                user_weights = [round((credit.get(skill, 0) / max_weight) * 10, 1) for
+                                                skill in skill_dimensions]
+                                radar_data = {
+                                    "dimensions": skill_dimensions,
+                                    "job_weights": job_weights,
+                                    "user_weights": user_weights
                                 }
-
-                                # 生成LLM报告
-                                llm_report = generate_llm_report(match_result, user_skills)
+                            else:
+                                radar_data = None
+
+                            # 构建匹配结果（含竞争力总结）
+                            match_result = {
+                                "job_name": job_name,
+                                "match_score": score,
+                                "match_level": get_match_level(score),
+                                "owned_skills": owned,
+                                "missing_skills": missing,
+                                "recommend_skills": recommend,
+                                "similar_skills": {s: {"skill": known, "similarity": sim}
+                                                   for s, (known, sim) in similar.items()},
+                                "radar_data": radar_data,
+                                "competition_summary": get_competition_summary(score, owned, missing)
+                            }
+
+                            # 报告缓存命中则直接展示，否则提交后台LLM报告任务，页面通过SSE流式获取
+                            report_key = report_cache_key(match_result, LLM_MODEL)
+                            cached_report = get_cached_report(report_key)
+                            if cached_report is not None:
+                                llm_report = cached_report.replace("\n", "<br>")
+                            else:
+                                report_job_id = report_jobs.submit(stream_llm_report, match_result, key=report_key,
+                                                                   check_cache=False)
                 except Exception as e:
                     error_msg = f"系统内部错误：{str(e)}"
                     print(f"[CRITICAL ERROR] {error_msg}")
@@ -522,37 +650,198 @@ def match_diag_page():
 
     return render_template(
         "match_diag.html",
-        all_jobs=all_jobs,
+        selected_job=selected_job,
         form=form,
         skill_submit_msg=skill_submit_msg,
         match_result=match_result,
         skill_list=SKILL_LIST,
         llm_report=llm_report,
+        report_job_id=report_job_id,
         user_existing_skills=user_existing_skills,
         radar_data=radar_data if match_result and 'error' not in match_result else None
     )
 
 
+@app.route("/api/match/batch", methods=["POST"])
+def batch_match_api():
+    """
+    批量匹配：N 个用户技能集合 × M 个岗位，一次稀疏矩阵乘法算出全部分数
+    请求体（JSON）：
+    - users: [{"id": 可选标识, "skills": [技能, ...]}, ...]（也可直接传技能列表）
+    - job_ids: [岗位ID, ...]
+    - details: 可选，默认 true，返回已掌握/缺失/推荐技能及相近技能（分数与 /match-diag 一致，含部分分）
+    - report: 可选，默认 false；为 true 时为每对结果提交后台AI报告任务（缓存命中直接返回报告），
+      通过 /api/report/<report_job_id> 或其 SSE 接口获取
+    """
+    body = request.get_json(silent=True) or {}
+    users = body.get("users") or []
+    job_ids = [str(j).strip() for j in body.get("job_ids") or [] if str(j).strip()]
+    details = bool(body.get("details", True))
+    with_report = bool(body.get("report", False))
+
+    if not isinstance(users, list) or not users or not job_ids:
+        return jsonify({"code": 1, "msg": "users 和 job_ids 不能为空"}), 400
+    if len(users) > BATCH_MAX_USERS or len(job_ids) > BATCH_MAX_JOBS:
+        return jsonify({"code": 1, "msg": f"单次最多 {BATCH_MAX_USERS} 个用户、{BATCH_MAX_JOBS} 个岗位"}), 400
+    if with_report and len(users) * len(job_ids) > BATCH_MAX_REPORTS:
+        return jsonify({"code": 1, "msg": f"生成AI报告时用户数×岗位数不能超过 {BATCH_MAX_REPORTS}"}), 400
+
+    user_ids, skill_sets = [], []
+    for i, user in enumerate(users):
+        if isinstance(user, dict):
+            user_ids.append(user.get("id", i))
+            skills = user.get("skills") or []
+        else:
+            user_ids.append(i)
+            skills = user
+        skill_sets.append(filter_none_skills([str(s).strip() for s in skills if s is not None]))
+
+    try:
+        snap = graph_cache.get()
+        with metrics.timed_scoring("batch"):
+            batch = match_batch(snap, skill_sets, job_ids, details=details or with_report)
+    except Exception as e:
+        print(f"[ERROR] 批量匹配失败: {e}")
+        return jsonify({"code": 1, "msg": "批量匹配失败"}), 500
+
+    for items in batch["results"]:
+        for item in items:
+            item["match_level"] = get_match_level(item["match_score"])
+            if with_report:
+                key = report_cache_key(item, LLM_MODEL)
+                cached = get_cached_report(key)
+                if cached is not None:
+                    item["report"] = cached
+                else:
+                    item["report_job_id"] = report_jobs.submit(stream_llm_report, dict(item), key=key,
+                                                               check_cache=False)
+            if with_report and not details:
+                for field in ("owned_skills", "missing_skills", "recommend_skills", "similar_skills"):
+                    item.pop(field, None)
+
+    data = {
+        "users": [{"id": uid, "results": items} for uid, items in zip(user_ids, batch["results"])],
+        "unknown_jobs": batch["unknown_jobs"],
+    }
+    return jsonify({"code": 0, "data": data})
+
+
+@app.route("/api/report/<job_id>")
+def report_status(job_id):
+    """查询报告任务状态及当前已生成的内容"""
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({"code": 1, "msg": "报告任务不存在或已过期"}), 404
+    return jsonify({"code": 0, "data": job.to_dict()})
+
+
+@app.route("/api/report/cache/stats")
+def report_cache_stats():
+    """报告缓存命中统计"""
+    return jsonify({"code": 0, "data": report_cache.stats()})
+
+
+@app.route("/api/report/<job_id>/stream")
+def report_stream(job_id):
+    """
+    SSE 流式推送报告内容：
+    - 默认事件：{"delta": 新生成的文本}，id 为已推送片段数（断线重连时据此续传）
+    - end 事件：{"status": done/error, "error": 错误信息}
+    """
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({"code": 1, "msg": "报告任务不存在或已过期"}), 404
+
+    try:
+        start = int(request.headers.get("Last-Event-ID") or 0)
+    except ValueError:
+        start = 0
+
+    def events():
+        pos = start
+        for chunk in job.iter_chunks(start):
+            if chunk is None:
+                yield ": keep-alive\n\n"
+                continue
+            pos += 1
+            yield f"id: {pos}\ndata: {json.dumps({'delta': chunk}, ensure_ascii=False)}\n\n"
+        end = {"status": job.status, "error": job.error}
+        yield f"event: end\ndata: {json.dumps(end, ensure_ascii=False)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/api/jobs")
+def job_list_api():
+    """
+    岗位列表（按 job_id 升序的键集分页，供页面岗位选择框按需联想加载）
+    - after：游标，上一页返回的 next（首页不传）
+    - limit：每页条数（默认20，最多100）
+    - city：城市（精确匹配）
+    - q：名称/职位名/城市关键词，多个关键词用空格分隔
+    返回 {"data": [{"id", "name", "city"}], "next": 下一页游标或 null}
+    """
+    after = request.args.get("after") or None
+    city = (request.args.get("city") or "").strip() or None
+    q = (request.args.get("q") or "").strip() or None
+    limit = min(max(request.args.get("limit", JOB_LIST_LIMIT, type=int), 1), JOB_LIST_MAX_LIMIT)
+    try:
+        snap = graph_cache.get()
+        with metrics.timed_scoring("job_list"):
+            jobs, next_after = snap.job_page(after=after, limit=limit, city=city, q=q)
+    except Exception as e:
+        print(f"[ERROR] 查询岗位列表失败: {e}")
+        return jsonify({"code": 1, "msg": "查询失败"}), 500
+    return jsonify({
+        "code": 0,
+        "data": [{"id": job.id, "name": job.name, "city": job.city} for job in jobs],
+        "next": next_after,
+    })
+
+
+@app.route("/api/graph/job/<job_id>")
+def job_graph_api(job_id):
+    """岗位技能图数据（列式），按权重降序分页：?offset=0&limit=60"""
+    offset = request.args.get("offset", 0, type=int)
+    limit = request.args.get("limit", type=int)
+    try:
+        payload = job_graph_payload(graph_cache.get(), job_id, offset=offset, limit=limit)
+    except Exception as e:
+        print(f"[ERROR] 查询岗位技能图失败: {e}")
+        return jsonify({"code": 1, "msg": "查询失败"}), 500
+    if payload is None:
+        return jsonify({"code": 1, "msg": "岗位不存在"}), 404
+    return jsonify({"code": 0, "data": payload})
+
+
+@app.route("/api/graph/path/<job_id>")
+def path_graph_api(job_id):
+    """当前用户到目标岗位的学习路径图数据（列式），?limit= 限制节点数"""
+    limit = request.args.get("limit", type=int)
+    try:
+        snap = graph_cache.get()
+        user_skills = graph_dao.get_graph().user_skills(get_current_user_id()) or ["Python", "SQL"]
+        with metrics.timed_scoring("path"):
+            plan = plan_path(snap, job_id, user_skills)
+    except Exception as e:
+        print(f"[ERROR] 生成学习路径图失败: {e}")
+        return jsonify({"code": 1, "msg": "查询失败"}), 500
+    if plan is None:
+        return jsonify({"code": 1, "msg": f"岗位ID【{job_id}】无技能需求数据"}), 404
+    return jsonify({"code": 0, "data": path_graph_payload(plan, limit=limit)})
+
+
 @app.route("/path-reco", methods=["GET", "POST"])
 def path_reco_page():
     """职业路径推荐"""
 
     target_job_id = request.args.get('job_id', '')  # 从URL获取目标岗位ID
 
-    # 获取所有岗位
-    try:
-        with neo4j_driver.session() as session:
-            jobs = session.run("""
-                MATCH (j:Job) 
-                RETURN j.job_id AS id, j.name AS name 
-                ORDER BY j.job_id
-            """).data()
-        all_jobs = jobs
-    except Exception as e:
-        print(f"[ERROR] 查询岗位失败: {e}")
-        all_jobs = []
-
-    person_id = "manual_input_user"
+    person_id = get_current_user_id()
     job_reco = []
     skill_path = None
 
@@ -561,184 +850,90 @@ def path_reco_page():
 
     try:
         # 查询用户技能
-        with neo4j_driver.session() as session:
-            user_records = session.run("""
-                MATCH (p:Person {id: $person_id})-[:HAS_SKILL]->(s:Skill)
-                RETURN s.name AS name
-            """, person_id=person_id).data()
-        user_skills = filter_none_skills([r["name"] for r in user_records]) or ["Python", "SQL"]
-
-        # 计算岗位匹配度推荐
-        with neo4j_driver.session() as session:
-            all_job_skills = session.run("""
-                MATCH (j:Job)-[r:REQUIRES]->(s:Skill)
-                RETURN j.job_id AS job_id, j.name AS job_name, j.city AS city, collect({name: s.name, weight: r.weight}) AS skill_list
-            """).data()
-
-        # 计算每个岗位的匹配度
-        for rec in all_job_skills:
-            # 过滤技能名称中的None值
-            skill_list = [s for s in rec["skill_list"] if s["name"] is not None and s["name"].strip() != ""]
-            skill_names = [s["name"] for s in skill_list]
-            total_weight = sum([s["weight"] for s in skill_list])
-            overlap_weight = sum([s["weight"] for s in skill_list if s["name"] in user_skills])
-            rate = round((overlap_weight / total_weight) * 100) if total_weight > 0 else 0
-
-            job_reco.append({
-                "job_id": rec["job_id"],
-                "job_name": rec["job_name"],
-                "city": rec.get("city", "未知"),
-                "match_rate": rate,
-                "overlap_skills": list(set(user_skills) & set(skill_names))
-            })
-
-        # 排序取TOP5
-        job_reco.sort(key=lambda x: x["match_rate"], reverse=True)
-        job_reco = job_reco[:5]
+        user_skills = graph_dao.get_graph().user_skills(person_id) or ["Python", "SQL"]
+
+        # 计算岗位匹配度推荐（倒排索引只计算与用户技能有交集的岗位，按用户缓存并增量更新，取TOP5）
+        snap = graph_cache.get()
+        with metrics.timed_scoring("recommend"):
+            job_reco = snap.reco.recommend(person_id, user_skills, k=5)
 
         # 生成目标岗位技能路径
         if target_job_id:
-            with neo4j_driver.session() as session:
-                target_records = session.run("""
-                    MATCH (j:Job {job_id: $job_id})-[r:REQUIRES]->(s:Skill)
-                    RETURN s.name AS name, coalesce(r.weight, 1) AS weight, j.name AS job_name
-                """, job_id=target_job_id).data()
+            with metrics.timed_scoring("path"):
+                plan = plan_path(snap, target_job_id, user_skills)
 
-            if not target_records:
+            if plan is None:
                 skill_path = {"error": f"岗位ID【{target_job_id}】无技能需求数据"}
             else:
-                # 过滤掉None值
-                target_records = [r for r in target_records if r["name"] is not None and r["name"].strip() != ""]
-                if not target_records:
-                    skill_path = {"error": f"岗位技能数据异常，请检查数据库"}
+                job_name = plan.job_name
+                owned = plan.owned
+                # 按技能先修关系拓扑排序（无先后约束的按权重降序）
+                missing_sorted = plan.missing
+
+                # 拆分学习阶段
+                phase1, phase2, phase3 = plan.phases
+
+                # ========== 动态生成岗位适配的学习建议 ==========
+                # 根据岗位类型判断学习建议
+                if "开发" in job_name:
+                    phase1_action = "优先掌握基础语法与框架使用，建议通过官方文档+Demo项目练习（如：搭建简单接口）"
+                    phase2_action = "进阶学习性能优化与中间件，结合开源项目（如：参与GitHub小项目）巩固"
+                    phase3_action = "深入框架源码与分布式架构，尝试独立开发中型系统（如：用户管理平台）"
+                elif "分析" in job_name:
+                    phase1_action = "优先掌握数据清洗与可视化工具，建议通过 Kaggle 入门项目练习（如：泰坦尼克号数据分析）"
+                    phase2_action = "进阶学习统计模型与算法，结合企业数据集（如：电商用户行为分析）实践"
+                    phase3_action = "深入机器学习与业务建模，参与真实业务场景的数据分析项目"
+                elif "研究" in job_name:
+                    phase1_action = "优先掌握基础理论与工具，建议通过论文复现+小型实验练习（如：复现经典算法）"
+                    phase2_action = "进阶学习前沿技术与实验设计，结合开源数据集（如：论文配套数据集）实践"
+                    phase3_action = "深入领域前沿与创新研究，尝试发表论文或参与竞赛（如：Kaggle竞赛）"
                 else:
-                    target_dict = {r["name"]: r["weight"] for r in target_records}
-                    owned = [s for s in target_dict if s in user_skills]
-                    missing = [s for s in target_dict if s not in user_skills]
-                    missing_sorted = sorted(missing, key=lambda x: target_dict[x], reverse=True)
-
-                    # 拆分学习阶段
-                    phase1 = missing_sorted[:2] if len(missing_sorted) >= 2 else missing_sorted
-                    phase2 = missing_sorted[2:4] if len(missing_sorted) >= 4 else (
-                        missing_sorted[2:] if len(missing_sorted) > 2 else [])
-                    phase3 = missing_sorted[4:] if len(missing_sorted) > 4 else []
-
-                    # ========== 动态生成岗位适配的学习建议 ==========
-                    job_name = target_records[0]["job_name"]
-                    # 根据岗位类型判断学习建议
-                    if "开发" in job_name:
-                        phase1_action = "优先掌握基础语法与框架使用，建议通过官方文档+Demo项目练习（如：搭建简单接口）"
-                        phase2_action = "进阶学习性能优化与中间件，结合开源项目（如：参与GitHub小项目）巩固"
-                        phase3_action = "深入框架源码与分布式架构，尝试独立开发中型系统（如：用户管理平台）"
-                    elif "分析" in job_name:
-                        phase1_action = "优先掌握数据清洗与可视化工具，建议通过 Kaggle 入门项目练习（如：泰坦尼克号数据分析）"
-                        phase2_action = "进阶学习统计模型与算法，结合企业数据集（如：电商用户行为分析）实践"
-                        phase3_action = "深入机器学习与业务建模，参与真实业务场景的数据分析项目"
-                    elif "研究" in job_name:
-                        phase1_action = "优先掌握基础理论与工具，建议通过论文复现+小型实验练习（如：复现经典算法）"
-                        phase2_action = "进阶学习前沿技术与实验设计，结合开源数据集（如：论文配套数据集）实践"
-                        phase3_action = "深入领域前沿与创新研究，尝试发表论文或参与竞赛（如：Kaggle竞赛）"
-                    else:
-                        phase1_action = "优先掌握基础技能，建议通过视频教程+小项目练习"
-                        phase2_action = "进阶技能学习，结合实战项目巩固"
-                        phase3_action = "核心技能突破，参与真实业务场景项目"
-
-                    # 构建图谱数据
-                    nodes = []
-                    # 已掌握技能
-                    for skill in owned:
-                        nodes.append({
-                            "name": skill,
-                            "category": 0,
-                            "symbolSize": 60 + (target_dict[skill] * 5),
-                            "itemStyle": {"color": "#10b981"},
-                            "tooltip": f"已掌握技能：{skill}\n权重：{target_dict[skill]}"
-                        })
-                    # 待学技能分阶段
-                    for skill in phase1:
-                        nodes.append({
-                            "name": skill, "category": 1, "symbolSize": 60 + (target_dict[skill] * 5),
-                            "itemStyle": {"color": "#2563eb"},
-                            "tooltip": f"阶段1学习：{skill}\n权重：{target_dict[skill]}"
-                        })
-                    for skill in phase2:
-                        nodes.append({
-                            "name": skill, "category": 2, "symbolSize": 60 + (target_dict[skill] * 5),
-                            "itemStyle": {"color": "#f59e0b"},
-                            "tooltip": f"阶段2学习：{skill}\n权重：{target_dict[skill]}"
-                        })
-                    for skill in phase3:
-                        nodes.append({
-                            "name": skill, "category": 3, "symbolSize": 60 + (target_dict[skill] * 5),
-                            "itemStyle": {"color": "#ef4444"},
-                            "tooltip": f"阶段3学习：{skill}\n权重：{target_dict[skill]}"
-                        })
-                    # 目标岗位节点
-                    nodes.append({
-                        "name": target_records[0]["job_name"], "category": 4, "symbolSize": 80,
-                        "itemStyle": {"color": "#8b5cf6"}, "tooltip": f"目标岗位：{target_records[0]['job_name']}"
-                    })
-
-                    # 构建连线
-                    links = []
-                    # 已掌握→阶段1
-                    for o_skill in owned:
-                        for p1_skill in phase1:
-                            links.append({"source": o_skill, "target": p1_skill, "lineStyle": {"width": 2}})
-                    # 阶段1→阶段2
-                    for p1_skill in phase1:
-                        for p2_skill in phase2:
-                            links.append({"source": p1_skill, "target": p2_skill, "lineStyle": {"width": 1.5}})
-                    # 阶段2→阶段3
-                    for p2_skill in phase2:
-                        for p3_skill in phase3:
-                            links.append({"source": p2_skill, "target": p3_skill, "lineStyle": {"width": 1}})
-                    # 最后阶段→目标岗位
-                    final_phase = phase3 if phase3 else (phase2 if phase2 else phase1)
-                    for skill in final_phase:
-                        links.append({
-                            "source": skill, "target": target_records[0]["job_name"],
-                            "lineStyle": {"width": 3, "color": "#2563eb"}
-                        })
-
-                    # 路径描述
-                    if not missing_sorted:
-                        desc = "✅ 你已具备该岗位的所有核心技能，可直接投递！"
-                    elif len(missing_sorted) <= 2:
-                        desc = f"⚠️ 优先学习（基础层）：{safe_join(missing_sorted[:2], '、')}，掌握后可达到岗位基础要求。"
-                    elif len(missing_sorted) <= 4:
-                        desc = f"""📚 分两阶段学习：
+                    phase1_action = "优先掌握基础技能，建议通过视频教程+小项目练习"
+                    phase2_action = "进阶技能学习，结合实战项目巩固"
+                    phase3_action = "核心技能突破，参与真实业务场景项目"
+
+                # 路径描述
+                if not missing_sorted:
+                    desc = "✅ 你已具备该岗位的所有核心技能，可直接投递！"
+                elif len(missing_sorted) <= 2:
+                    desc = f"⚠️ 优先学习（基础层）：{safe_join(missing_sorted[:2], '、')}，掌握后可达到岗位基础要求。"
+                elif len(missing_sorted) <= 4:
+                    desc = f"""📚 分两阶段学习：
 1. 第一阶段（1-2个月）：{safe_join(missing_sorted[:2], '、')}（核心权重技能）；
 2. 第二阶段（2-3个月）：{safe_join(missing_sorted[2:], '、')}（辅助技能）。"""
-                    else:
-                        desc = f"""📚 分三阶段学习：
+                else:
+                    desc = f"""📚 分三阶段学习：
 1. 第一阶段（1-2个月）：{safe_join(missing_sorted[:2], '、')}（核心权重技能）；
 2. 第二阶段（2-3个月）：{safe_join(missing_sorted[2:4], '、')}（重要技能）；
 3. 第三阶段（3-4个月）：{safe_join(missing_sorted[4:], '、')}（拓展技能）。"""
 
-                    skill_path = {
-                        "target_job_id": target_job_id,
-                        "target_job_name": target_records[0]["job_name"],
-                        "owned_skills": owned,
-                        "missing_skills": missing_sorted,
-                        "phase1": {
-                            "skills": phase1,
-                            "time_range": "1-2个月",
-                            "action": "优先掌握基础技能，建议通过视频教程+小项目练习"
-                        },
-                        "phase2": {
-                            "skills": phase2,
-                            "time_range": "2-3个月",
-                            "action": "进阶技能学习，结合实战项目巩固"
-                        },
-                        "phase3": {
-                            "skills": phase3,
-                            "time_range": "3-4个月",
-                            "action": "核心技能突破，参与真实业务场景项目"
-                        },
-                        "path_desc": desc,
-                        "graph_data": {"nodes": nodes, "links": links}
-                    }
+                skill_path = {
+                    "target_job_id": target_job_id,
+                    "target_job_name": job_name,
+                    "owned_skills": owned,
+                    "missing_skills": missing_sorted,
+                    "phase1": {
+                        "skills": phase1,
+                        "time_range": "1-2个月",
+                        "action": "优先掌握基础技能，建议通过视频教程+小项目练习"
+                    },
+                    "phase2": {
+                        "skills": phase2,
+                        "time_range": "2-3个月",
+                        "action": "进阶技能学习，结合实战项目巩固"
+                    },
+                    "phase3": {
+                        "skills": phase3,
+                        "time_range": "3-4个月",
+                        "action": "核心技能突破，参与真实业务场景项目"
+                    },
+                    "path_desc": desc,
+                    # 待学技能 → 语义相近的已掌握技能（"会 X，学 Y 上手快"）
+                    "similar_skills": {s: {"skill": known, "similarity": sim}
+                                       for s, (known, sim) in plan.similar.items()},
+                    # 图谱数据由页面加载后请求 /api/graph/path/<job_id> 获取
+                    "graph_url": url_for("path_graph_api", job_id=target_job_id),
+                }
 
     except Exception as e:
         error_msg = f"系统内部错误：{str(e)}"
@@ -750,14 +945,49 @@ def path_reco_page():
 
     return render_template(
         "path_reco.html",
-        all_jobs=all_jobs,
         person_id=person_id,
         job_reco=job_reco,
         skill_path=skill_path,
-        selected_job_id=target_job_id
+        selected_job_id=target_job_id,
+        # 岗位选择框通过 /api/jobs 按需联想加载，页面只带当前选中的岗位
+        selected_job=get_job_option(target_job_id)
     )
 
 
-# ========== 启动程序 ==========
+# ========== 生产部署入口 ==========
+def ensure_schema():
+    """确保约束与索引存在（幂等）；失败只告警，不阻止启动"""
+    try:
+        bootstrap_schema(neo4j_driver)
+    except Exception as e:
+        print(f"[WARN] 初始化图谱约束/索引失败: {e}")
+
+
+def warm_up():
+    """建立约束/索引后预加载只读数据：图谱快照（含推荐索引、先修关系图、技能向量）与简历技能抽取器"""
+    ensure_schema()
+    SKILL_EXTRACTOR.get()
+    try:
+        graph_cache.get()  # 快照换入前已建好先修关系图与技能向量
+    except Exception as e:
+        print(f"[WARN] 预加载图谱快照失败，将在首个请求时加载: {e}")
+
+
+def create_app():
+    """
+    应用工厂：gunicorn -c job_kg_app/gunicorn.conf.py "app:create_app()"
+    配合 preload_app 在 master 中调用一次：预加载只读数据后关闭 master 的 Neo4j 连接池并冻结 GC，
+    fork 出的 worker 以写时复制共享快照与技能词典，各自在首次查询时重新创建驱动
+    """
+    if app.config['SECRET_KEY'] == DEV_SECRET_KEY:
+        raise RuntimeError("生产部署必须通过环境变量 SECRET_KEY 设置会话密钥")
+    warm_up()
+    neo4j_driver.reset()
+    gc.freeze()  # 预加载对象移出 GC 跟踪，避免回收扫描触碰页面导致写时复制
+    return app
+
+
+# ========== 启动程序（开发服务器） ==========
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    ensure_schema()
+    app.run(debug=os.environ.get("FLASK_DEBUG", "1") == "1", host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+批量匹配：N 个技能集合 × M 个岗位
+
+为整批用户（如一个班的毕业生）同时计算岗位匹配度：
+- 用户×技能 0/1 稀疏矩阵 U（N×S），岗位×技能 权重稀疏矩阵 J（M×S，取自快照中的 CSR 矩阵）
+- 一次稀疏乘法 U·Jᵀ 得到每对 (用户, 岗位) 的已掌握技能权重之和，除以岗位总权重即匹配度
+- 已掌握/缺失技能列表按需生成（details=False 时只返回分数）
+用户技能经快照的 SkillCanon 归一化后映射到列号，写法不同的同一技能（"Vue.js" / "Vue"）视为已掌握。
+缺失技能与某个已掌握技能语义相近时（SkillEmbedding.closest）按 相似度 × PARTIAL_CREDIT 计部分分：
+U 中该技能列的值取部分分系数而不是 1，同一次乘法里一并算出。
+分数口径与 /match-diag 一致：round((已掌握权重 + 部分分) / 总权重 × 100)，details 时同样给出 similar_skills，
+两边相同匹配结果的报告缓存键一致。
+"""
+import numpy as np
+from scipy import sparse
+
+from skill_embed import PARTIAL_CREDIT
+
+RECOMMEND_COUNT = 3  # 与 /match-diag 的"优先补齐建议"条数一致
+
+
+def _user_matrix(user_cols, n_skills, user_credits=None):
+    """
+    用户列号集合 → N×S 的 CSR 矩阵：已掌握技能为 1，user_credits 中的技能为其部分分系数，其余为 0
+    （技能库中不存在的技能不影响任何岗位的分数，已在映射时忽略）
+    """
+    indptr = [0]
+    indices = []
+    data = []
+    for i, cols in enumerate(user_cols):
+        credits = user_credits[i] if user_credits is not None else {}
+        for col in sorted(set(cols) | set(credits)):
+            indices.append(col)
+            data.append(1.0 if col in cols else credits[col])
+        indptr.append(len(indices))
+    return sparse.csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+                              np.asarray(indptr, dtype=np.int64)), shape=(len(user_cols), n_skills))
+
+
+def similar_credits(embedding, matrix, user_cols, rows):
+    """
+    每个用户在这批岗位的缺失技能中，与其已掌握技能语义相近的 {列号: (已掌握技能, 相似度)}
+    （与 /match-diag 的 SkillEmbedding.closest 相同；每个用户只算一次，对所有岗位通用）
+    """
+    if not len(rows) or not any(user_cols):
+        return [{} for _ in user_cols]
+    job_cols = np.unique(np.concatenate([matrix.indices[matrix.indptr[r]:matrix.indptr[r + 1]] for r in rows]))
+    names = embedding.skill_names
+    result = []
+    for cols in user_cols:
+        known = np.fromiter(cols, dtype=np.int64, count=len(cols))
+        targets, matched, sims = embedding.closest_cols(job_cols[~np.isin(job_cols, known)], known)
+        result.append({t: (names[k], round(sim, 4)) for t, k, sim in zip(targets.tolist(), matched.tolist(),
+                                                                          sims.tolist())})
+    return result
+
+
+def batch_scores(matrix, user_skill_sets, rows, user_cols=None, user_similar=None):
+    """
+    :param matrix: JobSkillMatrix
+    :param user_skill_sets: N 个技能集合
+    :param rows: M 个岗位行号
+    :param user_cols: 可选，已由 matrix.columns() 映射好的 N 个列号集合
+    :param user_similar: 可选，similar_credits() 的结果；给出时缺失的相近技能计部分分
+    :return: N×M 匹配率（0~1，float64 ndarray）
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    jobs = sparse.csr_matrix((matrix.data.astype(np.float64), matrix.indices, matrix.indptr),
+                             shape=(matrix.n_jobs, matrix.n_skills))[rows]
+    if user_cols is None:
+        user_cols = [matrix.columns(skills) for skills in user_skill_sets]
+    user_credits = None
+    if user_similar is not None:
+        user_credits = [{col: sim * PARTIAL_CREDIT for col, (_, sim) in similar.items()} for similar in user_similar]
+    users = _user_matrix(user_cols, matrix.n_skills, user_credits)
+    overlap = (users @ jobs.T).toarray()
+    totals = matrix.row_totals[rows]
+    rates = np.zeros_like(overlap)
+    np.divide(overlap, totals, out=rates, where=totals > 0)
+    return rates
+
+
+def match_batch(snapshot, user_skill_sets, job_ids, details=True):
+    """
+    批量计算匹配结果
+    :param snapshot: GraphSnapshot
+    :param user_skill_sets: N 个技能集合（列表/集合均可）
+    :param job_ids: M 个岗位ID；快照中不存在或无技能需求的岗位放入 unknown_jobs
+    :param details: 是否生成已掌握/缺失/推荐技能列表
+    :return: {"results": N 个列表，每个列表 M' 项 {"job_id", "job_name", "match_score", ...}, "unknown_jobs": [...]}
+    """
+    matrix = snapshot.matrix
+    job_ids = list(dict.fromkeys(job_ids))
+    known = [jid for jid in job_ids if jid in matrix.job_index]
+    unknown = [jid for jid in job_ids if jid not in matrix.job_index]
+    user_cols = [matrix.columns(skills) for skills in user_skill_sets]
+
+    rows = [matrix.job_index[jid] for jid in known]
+    user_similar = similar_credits(snapshot.embedding, matrix, user_cols, rows)
+    rates = batch_scores(matrix, user_skill_sets, rows, user_cols, user_similar)
+    scores = np.rint(rates * 100).astype(np.int64).tolist()
+
+    names = [snapshot.job_name(jid) for jid in known]
+    # 每个岗位的 (技能, 列号)（原顺序）及按权重降序的版本（取自快照的岗位汇总），供所有用户复用
+    col_of = matrix.skill_index
+    skills = [[(s, col_of[s]) for s, _ in snapshot.requires.get(jid, ())] for jid in known]
+    ranked = [[(s, col_of[s]) for s in snapshot.job_summary(jid).ranked] for jid in known]
+    results = []
+    for cols, similar, user_scores in zip(user_cols, user_similar, scores):
+        items = []
+        for jid, name, job_skills, job_ranked, score in zip(known, names, skills, ranked, user_scores):
+            item = {"job_id": jid, "job_name": name, "match_score": score}
+            if details:
+                item["owned_skills"] = [s for s, c in job_skills if c in cols]
+                item["missing_skills"] = [s for s, c in job_skills if c not in cols]
+                recommend = []
+                for s, c in job_ranked:
+                    if c not in cols:
+                        recommend.append(s)
+                        if len(recommend) == RECOMMEND_COUNT:
+                            break
+                item["recommend_skills"] = recommend
+                item["similar_skills"] = {s: {"skill": similar[c][0], "similarity": similar[c][1]}
+                                          for s, c in job_skills if c in similar}
+            items.append(item)
+        results.append(items)
+    return {"results": results, "unknown_jobs": unknown}
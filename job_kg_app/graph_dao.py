@@ -0,0 +1,113 @@
+"""
+请求级图谱数据访问层
+
+一个请求内所有 Neo4j 读写共用一个 session（首次访问时才打开，请求结束时关闭），并且：
+- 相同语句+参数的读查询在请求内只执行一次（结果缓存在 RequestGraph 上）
+- 写入用户技能后直接用写入结果更新缓存，不再回查
+- 快照里找不到的岗位，用户技能与岗位需求合并成一条语句一次取回
+"""
+import json
+
+from flask import current_app, g
+
+import queries
+from job_summary import JobSummary
+from metrics import timed_query
+from queries import USER_SKILLS_QUERY, REPLACE_USER_SKILLS_QUERY, USER_SKILLS_WITH_JOB_QUERY
+
+# 语句 → 常量名（指标标签用）
+QUERY_NAMES = {value: name for name, value in vars(queries).items() if name.endswith("_QUERY")}
+
+
+def query_name(query):
+    return QUERY_NAMES.get(query, "other")
+
+
+class RequestGraph:
+    """绑定到单个请求的 Neo4j 访问对象"""
+
+    def __init__(self, driver):
+        self._driver = driver
+        self._session = None
+        self._memo = {}
+        self.round_trips = 0
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self._driver.session()
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _key(query, params):
+        return query, json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+    def read(self, query, **params):
+        """执行读查询并返回 data()；同一请求内相同查询只执行一次"""
+        key = self._key(query, params)
+        if key not in self._memo:
+            self.round_trips += 1
+            with timed_query(query_name(query)):
+                self._memo[key] = self.session.run(query, **params).data()
+        return self._memo[key]
+
+    def write(self, query, **params):
+        """在托管写事务中执行语句，并清空本请求的读缓存"""
+        self.round_trips += 1
+        self._memo.clear()
+        with timed_query(query_name(query)):
+            return self.session.execute_write(lambda tx: tx.run(query, **params).data())
+
+    # ---------- 业务查询 ----------
+    def user_skills(self, user_id):
+        """用户已拥有的技能（按名称排序，已过滤空值）"""
+        rows = self.read(USER_SKILLS_QUERY, user_id=user_id)
+        return [r["name"] for r in rows if r["name"] is not None and str(r["name"]).strip()]
+
+    def replace_user_skills(self, user_id, skills):
+        """原子替换用户技能集合，并用写入结果填充读缓存"""
+        self.write(REPLACE_USER_SKILLS_QUERY, user_id=user_id, skills=skills)
+        self._memo[self._key(USER_SKILLS_QUERY, {"user_id": user_id})] = [{"name": s} for s in sorted(skills)]
+
+    def match_inputs(self, user_id, job_id, snapshot):
+        """
+        匹配诊断所需的 (用户技能, 岗位需求汇总 JobSummary, 岗位名)
+        岗位在快照中时只查用户技能、直接用快照里预先算好的汇总；否则合并查询，一次往返取回两者，
+        现场汇总。岗位不存在或无技能需求时汇总为 None
+        """
+        summary = snapshot.job_summary(job_id)
+        if summary is not None:
+            return self.user_skills(user_id), summary, snapshot.job_name(job_id)
+
+        rows = self.read(USER_SKILLS_WITH_JOB_QUERY, user_id=user_id, job_id=job_id)
+        if not rows:
+            return [], None, ""
+        rec = rows[0]
+        user_skills = sorted(s for s in rec["user_skills"] if s is not None and str(s).strip())
+        req_dict = {r["name"]: r["weight"] for r in rec["requirements"]
+                    if r["name"] is not None and str(r["name"]).strip()}
+        summary = JobSummary.build(req_dict.items(), snapshot.canon) if req_dict else None
+        return user_skills, summary, rec["job_name"] or ""
+
+
+def init_app(app, driver):
+    """注册请求结束时关闭 session 的钩子"""
+    app.extensions["kg_driver"] = driver
+
+    @app.teardown_appcontext
+    def _close_request_graph(exc):
+        graph = g.pop("kg", None)
+        if graph is not None:
+            graph.close()
+
+
+def get_graph():
+    """当前请求的 RequestGraph（首次调用时创建）"""
+    if "kg" not in g:
+        g.kg = RequestGraph(current_app.extensions["kg_driver"])
+    return g.kg
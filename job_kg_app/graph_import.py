@@ -0,0 +1,320 @@
+"""
+CSV → 图谱批量导入
+
+按固定大小分块流式读取 CSV（不一次性读入内存），每块作为一个 UNWIND 批次写入，多个写事务并行执行：
+- 技能：skill_nodes.csv 同格式，首列（表头 skill_name）为技能名
+- 岗位：表头含 job_id, name, city, title（title 可省略）
+- 岗位需求：表头含 job_id, skill, weight（weight 缺失或非数字时按 1 处理）
+- 用户技能：表头含 user_id, skill，须按 user_id 排序（逐个用户流式汇总），每个用户的技能集合整体替换
+  （只删不再拥有的、只建缺少的 HAS_SKILL 边）
+所有写入都以唯一约束键 MERGE，重复导入结果不变。导入顺序为 技能 → 岗位 → 岗位需求 → 用户技能，
+导入了技能/岗位/岗位需求时递增图谱版本号，运行中的应用会在下个 TTL 内重载快照；
+命令行导入随后按新版本重算先修关系图与技能向量离线文件（--no-artifacts 跳过），应用重载时直接读取，不必各自重算。
+用户技能不在快照中，无需重载；应用的推荐排名每次按请求时读到的用户技能做增量同步，不会沿用旧技能。
+技能名默认经 SkillCanon 归一化后写入（"Vue.js"、"Vue 3" → "Vue"，别名见 skill_aliases.csv），--no-canonical 按原样导入。
+岗位需求按 job_id 哈希分配到固定的写入通道（每个通道内批次串行写入，通道之间并行），
+同一岗位的边总由同一通道按文件顺序写入，同一（岗位, 技能）出现多次时（含归一化后多个写法合并到同一技能）
+确定地取文件中后出现的一条；批次内先去重，不必读完整个文件。
+
+命令行用法（在项目根目录执行）：
+    python job_kg_app/graph_import.py --skills job_kg_app/skill_nodes.csv --jobs jobs.csv --requires requires.csv
+    python job_kg_app/graph_import.py --requires requires.csv --batch-size 10000 --workers 8
+    python job_kg_app/graph_import.py --requires requires.csv --aliases my_aliases.csv
+    python job_kg_app/graph_import.py --user-skills user_skills.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import deque
+from itertools import islice
+from operator import itemgetter
+
+from graph_schema import bootstrap_schema
+from graph_snapshot import GraphSnapshot, bump_graph_version
+from queries import BULK_REPLACE_USER_SKILLS_QUERY, IMPORT_JOBS_QUERY, IMPORT_REQUIRES_QUERY, IMPORT_SKILLS_QUERY
+from skill_canon import SKILL_ALIAS_PATH, SkillCanon, load_aliases
+from skill_embed import SKILL_EMBED_PATH, SkillEmbedding
+from skill_graph import SKILL_GRAPH_PATH, SkillPrereqGraph
+
+BATCH_SIZE = 5000
+WORKERS = 4
+PROGRESS_INTERVAL = 2.0  # 秒
+SKILL_CSV_PATH = "job_kg_app/skill_nodes.csv"  # 未指定 --skills 时用于构建归一化表
+
+
+def _clean(value):
+    return (value or "").strip()
+
+
+def read_skills(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # 跳过表头
+        for row in reader:
+            if row and row[0].strip():
+                yield {"name": row[0].strip()}
+
+
+def read_jobs(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            job_id = _clean(row.get("job_id"))
+            if job_id:
+                yield {"job_id": job_id, "name": _clean(row.get("name")),
+                       "city": _clean(row.get("city")) or "未知", "title": _clean(row.get("title"))}
+
+
+def read_requires(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            job_id, skill = _clean(row.get("job_id")), _clean(row.get("skill"))
+            if not job_id or not skill:
+                continue
+            try:
+                weight = float(row.get("weight") or 1.0)
+            except ValueError:
+                weight = 1.0
+            yield {"job_id": job_id, "skill": skill, "weight": weight}
+
+
+def read_user_skills(path):
+    """
+    按用户汇总技能，每个用户产出一行 {"user_id", "skills"}。
+    文件须按 user_id 排序：逐组流式汇总，同一用户的行分散在文件各处时会被拆成多次整体替换，因此直接报错
+    """
+    user_id, skills = None, {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            uid, skill = _clean(row.get("user_id")), _clean(row.get("skill"))
+            if not uid or not skill:
+                continue
+            if uid != user_id:
+                if user_id is not None:
+                    if uid < user_id:
+                        raise ValueError(f"{path} 第 {line} 行：用户技能 CSV 须按 user_id 排序")
+                    yield {"user_id": user_id, "skills": list(skills)}
+                user_id, skills = uid, {}
+            skills[skill] = None
+    if user_id is not None:
+        yield {"user_id": user_id, "skills": list(skills)}
+
+
+def canonical_rows(rows, canon, field, dedupe=False):
+    """把每行的技能名字段替换为规范写法；dedupe 时跳过已出现过的规范写法"""
+    seen = set()
+    for row in rows:
+        row[field] = canon.canonical(row[field])
+        if dedupe:
+            if row[field] in seen:
+                continue
+            seen.add(row[field])
+        yield row
+
+
+def dedupe_requires(rows):
+    """按（岗位, 技能）去重（用于单个批次内），权重取后出现的一条，按首次出现的顺序输出"""
+    weights = {}
+    for row in rows:
+        weights[row["job_id"], row["skill"]] = row["weight"]
+    for (job_id, skill), weight in weights.items():
+        yield {"job_id": job_id, "skill": skill, "weight": weight}
+
+
+def chunked(rows, size):
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Progress:
+    """按时间间隔打印进度与吞吐量"""
+
+    def __init__(self, stage, out=print, interval=PROGRESS_INTERVAL):
+        self.stage = stage
+        self.out = out
+        self.interval = interval
+        self.rows = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def add(self, n):
+        self.rows += n
+        self.batches += 1
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.out(f"  [{self.stage}] {self.rows} 行，{self.rate:.0f} 行/秒")
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def done(self):
+        self.out(f"[OK] {self.stage}: {self.rows} 行 / {self.batches} 批，{self.elapsed:.1f}s，{self.rate:.0f} 行/秒")
+        return {"rows": self.rows, "batches": self.batches, "seconds": round(self.elapsed, 3)}
+
+
+def write_batches(driver, query, rows, stage, batch_size=BATCH_SIZE, workers=WORKERS, out=print):
+    """
+    把 rows 分块后并行写入；同时在途的批次不超过 2×workers，内存占用与文件大小无关。
+    每个批次一个托管写事务（死锁等瞬时错误由驱动自动重试）
+    """
+    progress = Progress(stage, out)
+
+    def write(batch):
+        with driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+        return len(batch)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in chunked(rows, batch_size):
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    progress.add(fut.result())
+            pending.add(pool.submit(write, batch))
+        for fut in pending:
+            progress.add(fut.result())
+    return progress.done()
+
+
+def write_partitioned(driver, query, rows, stage, key, prepare=None, batch_size=BATCH_SIZE, workers=WORKERS,
+                      out=print):
+    """
+    按 hash(key(row)) 把行分到 workers 个写入通道：通道内的批次按文件顺序串行写入，通道之间并行，
+    同一键的行不会被并行事务同时写入。每个通道最多攒一个批次、在途 2 个批次，内存占用与文件大小无关。
+    :param prepare: 写入前对单个批次的处理（如去重），返回行列表
+    """
+    progress = Progress(stage, out)
+
+    def write(batch):
+        if prepare is not None:
+            batch = prepare(batch)
+        with driver.session() as session:
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+        return len(batch)
+
+    lanes = [ThreadPoolExecutor(max_workers=1) for _ in range(workers)]
+    buffers = [[] for _ in range(workers)]
+    pending = [deque() for _ in range(workers)]
+
+    def flush(i):
+        if len(pending[i]) >= 2:
+            progress.add(pending[i].popleft().result())
+        pending[i].append(lanes[i].submit(write, buffers[i]))
+        buffers[i] = []
+
+    try:
+        for row in rows:
+            i = hash(key(row)) % workers
+            buffers[i].append(row)
+            if len(buffers[i]) >= batch_size:
+                flush(i)
+        for i in range(workers):
+            if buffers[i]:
+                flush(i)
+        for lane in pending:
+            for fut in lane:
+                progress.add(fut.result())
+    finally:
+        for lane in lanes:
+            lane.shutdown()
+    return progress.done()
+
+
+def rebuild_artifacts(driver, out=print):
+    """按当前图谱（及版本号）重算先修关系图与技能向量离线文件，返回版本号"""
+    started = time.perf_counter()
+    snap = GraphSnapshot.load(driver)
+    SkillPrereqGraph.from_matrix(snap.matrix, version=snap.version).save(SKILL_GRAPH_PATH)
+    SkillEmbedding.from_matrix(snap.matrix, version=snap.version).save(SKILL_EMBED_PATH)
+    out(f"[OK] 离线结果（版本 {snap.version}）→ {SKILL_GRAPH_PATH}、{SKILL_EMBED_PATH}，"
+        f"{time.perf_counter() - started:.1f}s")
+    return snap.version
+
+
+def import_graph(driver, skills_path=None, jobs_path=None, requires_path=None, user_skills_path=None,
+                 batch_size=BATCH_SIZE, workers=WORKERS, schema=True, canon=None, artifacts=False, out=print):
+    """
+    导入技能/岗位/岗位需求/用户技能 CSV（均可选），返回各阶段统计
+    :param canon: SkillCanon，给出时技能名按规范写法写入
+    :param artifacts: 递增版本号后重算先修关系图与技能向量离线文件
+    """
+    if schema:
+        bootstrap_schema(driver)
+    stats = {}
+    stages = (
+        ("skills", skills_path, read_skills, IMPORT_SKILLS_QUERY),
+        ("jobs", jobs_path, read_jobs, IMPORT_JOBS_QUERY),
+        ("requires", requires_path, read_requires, IMPORT_REQUIRES_QUERY),
+        ("user_skills", user_skills_path, read_user_skills, BULK_REPLACE_USER_SKILLS_QUERY),
+    )
+    for stage, path, reader, query in stages:
+        if path:
+            rows = reader(path)
+            if canon is not None and stage == "skills":
+                rows = canonical_rows(rows, canon, "name", dedupe=True)
+            elif canon is not None and stage == "requires":
+                rows = canonical_rows(rows, canon, "skill")
+            elif canon is not None and stage == "user_skills":
+                rows = ({"user_id": row["user_id"], "skills": canon.canonicalize(row["skills"])} for row in rows)
+            if stage == "requires":
+                # 同一岗位的边固定由一个通道串行写入，重复的（岗位, 技能）确定地取后出现的一条
+                stats[stage] = write_partitioned(driver, query, rows, stage, itemgetter("job_id"),
+                                                 lambda batch: list(dedupe_requires(batch)),
+                                                 batch_size, workers, out)
+            else:
+                stats[stage] = write_batches(driver, query, rows, stage, batch_size, workers, out)
+    if stats.keys() - {"user_skills"}:
+        with driver.session() as session:
+            stats["version"] = session.execute_write(bump_graph_version)
+        if artifacts:
+            rebuild_artifacts(driver, out)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从 CSV 批量导入技能/岗位/岗位需求")
+    parser.add_argument("--skills", help="技能 CSV（首列 skill_name）")
+    parser.add_argument("--jobs", help="岗位 CSV（job_id,name,city,title）")
+    parser.add_argument("--requires", help="岗位需求 CSV（job_id,skill,weight）")
+    parser.add_argument("--user-skills", help="用户技能 CSV（user_id,skill，按 user_id 排序），按用户整体替换技能集合")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--no-schema", action="store_true", help="跳过约束/索引初始化")
+    parser.add_argument("--aliases", default=SKILL_ALIAS_PATH, help="技能别名表（alias,canonical）")
+    parser.add_argument("--no-canonical", action="store_true", help="技能名按原样导入，不做归一化")
+    parser.add_argument("--no-artifacts", action="store_true", help="导入后不重算先修关系图/技能向量离线文件")
+    args = parser.parse_args(argv)
+    if not (args.skills or args.jobs or args.requires or args.user_skills):
+        parser.error("至少指定 --skills / --jobs / --requires / --user-skills 之一")
+
+    canon = None
+    if not args.no_canonical:
+        dictionary = args.skills or SKILL_CSV_PATH
+        known = [row["name"] for row in read_skills(dictionary)] if os.path.exists(dictionary) else []
+        canon = SkillCanon(known, load_aliases(args.aliases))
+        print(f"[OK] 技能归一化表：{len(known)} 种写法 → {len(canon)} 个规范技能")
+
+    from app import neo4j_driver
+
+    import_graph(neo4j_driver, args.skills, args.jobs, args.requires, args.user_skills,
+                 batch_size=args.batch_size, workers=args.workers, schema=not args.no_schema, canon=canon,
+                 artifacts=not args.no_artifacts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+可视化图谱数据（列式 JSON）
+
+页面首屏不再内联图谱数据，而是渲染完成后再请求 /api/graph/... 接口：
+- 节点、连线都以列式数组返回（名称数组 + 类别下标数组，连线用节点下标），样式只在 categories 表中出现一次
+- 服务端限制单次返回的节点数，岗位技能图支持 offset/limit 分页
+"""
+from collections import namedtuple
+
+DEFAULT_GRAPH_NODES = 60
+MAX_GRAPH_NODES = 200
+
+# 学习路径图的节点类别（下标即节点的 category）
+PATH_CATEGORIES = (
+    {"name": "已掌握技能", "color": "#10b981"},
+    {"name": "阶段 1（基础）", "color": "#2563eb"},
+    {"name": "阶段 2（进阶）", "color": "#f59e0b"},
+    {"name": "阶段 3（核心）", "color": "#ef4444"},
+    {"name": "目标岗位", "color": "#8b5cf6"},
+)
+OWNED, PHASE1, PHASE2, PHASE3, TARGET = range(5)
+
+PathPlan = namedtuple("PathPlan", ["job_id", "job_name", "weights", "owned", "missing", "phases", "edges", "similar"])
+
+
+def clamp_limit(limit, default=DEFAULT_GRAPH_NODES):
+    """把请求参数中的节点数限制在 [1, MAX_GRAPH_NODES]"""
+    if not limit or limit <= 0:
+        return default
+    return min(limit, MAX_GRAPH_NODES)
+
+
+def split_phases(missing_sorted):
+    """待学技能按顺序拆成三个阶段：前 2 个、接下来 2 个、其余"""
+    return missing_sorted[:2], missing_sorted[2:4], missing_sorted[4:]
+
+
+def plan_path(snap, job_id, user_skills):
+    """
+    目标岗位的学习路径：已掌握技能、按先修关系排好序的待学技能、三个阶段、先修连线，
+    以及待学技能中与已掌握技能语义相近的 {待学技能: (已掌握技能, 相似度)}
+    岗位不存在或无技能需求时返回 None
+    """
+    summary = snap.job_summary(job_id)
+    if summary is None:
+        return None
+    weights = summary.weights
+    owned, missing = summary.split(snap.canon.ids(user_skills))
+    missing_sorted, edges = snap.prereq.order(missing, weights, known=owned)
+    similar = snap.embedding.closest(missing_sorted, snap.matrix.columns(user_skills))
+    return PathPlan(job_id, snap.job_name(job_id), weights, owned, missing_sorted,
+                    split_phases(missing_sorted), edges, similar)
+
+
+def path_graph_payload(plan, limit=DEFAULT_GRAPH_NODES):
+    """
+    学习路径图（列式）。节点超出 limit 时优先保留待学技能（按学习顺序），
+    剩余名额给权重最高的已掌握技能
+    """
+    limit = clamp_limit(limit)
+    weights = plan.weights
+    budget = max(limit - 1, 0)  # 目标岗位节点固定保留
+
+    kept_missing = plan.missing[:budget]
+    owned_sorted = sorted(plan.owned, key=lambda s: weights[s], reverse=True)
+    kept_owned = owned_sorted[:budget - len(kept_missing)]
+
+    names, categories = [], []
+    index = {}
+
+    def add(name, category):
+        index[name] = len(names)
+        names.append(name)
+        categories.append(category)
+
+    for skill in kept_owned:
+        add(skill, OWNED)
+    kept = set(kept_missing)
+    phases = [[s for s in phase if s in kept] for phase in plan.phases]
+    for category, phase in zip((PHASE1, PHASE2, PHASE3), phases):
+        for skill in phase:
+            add(skill, category)
+    job_node = len(names)
+    names.append(plan.job_name)
+    categories.append(TARGET)
+
+    sources, targets, widths = [], [], []
+
+    def link(source, target, width):
+        s, t = index.get(source), index.get(target)
+        if s is not None and t is not None:
+            sources.append(s)
+            targets.append(t)
+            widths.append(width)
+
+    # 先修关系边（置信度越高越粗）
+    for pre, skill, conf in plan.edges:
+        link(pre, skill, round(1 + 2 * conf, 2))
+    # 没有先修技能的待学技能，从上一阶段权重最高的技能连一条线（阶段1从已掌握技能连）
+    has_parent = {skill for _, skill, _ in plan.edges}
+    phase1, phase2, phase3 = phases
+    for prev_phase, phase, width in ((owned_sorted[:1], phase1, 2), (phase1[:1], phase2, 1.5),
+                                     (phase2[:1], phase3, 1)):
+        for skill in phase:
+            if skill not in has_parent and prev_phase:
+                link(prev_phase[0], skill, width)
+    # 最后阶段（截断后保留下来的）→ 目标岗位
+    for skill in phase3 or phase2 or phase1:
+        sources.append(index[skill])
+        targets.append(job_node)
+        widths.append(3)
+
+    return {
+        "job_id": plan.job_id,
+        "nodes": {
+            "name": names,
+            "category": categories,
+            "weight": [weights.get(n, 0) for n in names[:-1]] + [0],
+        },
+        "links": {"source": sources, "target": targets, "width": widths},
+        "categories": PATH_CATEGORIES,
+        "total_nodes": len(plan.owned) + len(plan.missing) + 1,
+        "truncated": len(names) < len(plan.owned) + len(plan.missing) + 1,
+    }
+
+
+def job_graph_payload(snap, job_id, offset=0, limit=DEFAULT_GRAPH_NODES):
+    """岗位技能图（列式，按权重降序分页）；岗位不存在时返回 None"""
+    job = snap.job_by_id.get(job_id)
+    if job is None:
+        return None
+    limit = clamp_limit(limit)
+    offset = max(offset, 0)
+    summary = snap.job_summary(job_id)
+    ranked = summary.ranked if summary is not None else ()
+    page = ranked[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(ranked) else None
+    return {
+        "job": {"id": job.id, "name": job.name, "city": job.city},
+        "skills": list(page),
+        "weights": [summary.weights[name] for name in page],
+        "total": len(ranked),
+        "offset": offset,
+        "next_offset": next_offset,
+    }
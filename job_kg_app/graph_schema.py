@@ -0,0 +1,139 @@
+"""
+Neo4j 约束/索引初始化与查询计划检查
+
+热点查询按 Job.job_id、Person.id、Skill.name 查找节点，没有唯一约束时每次 MERGE/查找都是按标签全扫描。
+- bootstrap_schema()：幂等创建唯一约束（自带索引）以及岗位搜索用的全文索引
+- check_query_plans()：对应用发出的每条语句执行 EXPLAIN，报告仍然使用 NodeByLabelScan 的语句
+
+命令行用法（在项目根目录执行）：
+    python job_kg_app/graph_schema.py            # 创建约束/索引并检查查询计划
+    python job_kg_app/graph_schema.py --check    # 只检查查询计划
+"""
+import argparse
+import sys
+
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT job_id_unique IF NOT EXISTS FOR (j:Job) REQUIRE j.job_id IS UNIQUE",
+    "CREATE CONSTRAINT person_id_unique IF NOT EXISTS FOR (p:Person) REQUIRE p.id IS UNIQUE",
+    "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+    "CREATE CONSTRAINT graph_version_id_unique IF NOT EXISTS FOR (v:GraphVersion) REQUIRE v.id IS UNIQUE",
+    # 岗位名称/城市全文索引（cjk 分析器按二元组切分中文；应用内搜索走 job_search.py，此索引供运维/临时查询使用）
+    """
+    CREATE FULLTEXT INDEX job_search IF NOT EXISTS
+    FOR (j:Job) ON EACH [j.name, j.title, j.city]
+    OPTIONS {indexConfig: {`fulltext.analyzer`: "cjk"}}
+    """,
+]
+
+# 这些语句本来就要读取全部岗位/技能（快照加载、统计），全扫描是预期行为
+EXPECTED_FULL_SCANS = {"JOBS_QUERY", "SKILLS_QUERY", "STATS_QUERY", "REQUIRES_QUERY"}
+
+
+def bootstrap_schema(driver):
+    """创建约束和索引（已存在则跳过），并等待索引上线"""
+    with driver.session() as session:
+        for stmt in SCHEMA_STATEMENTS:
+            session.run(stmt).consume()
+        session.run("CALL db.awaitIndexes(300)").consume()
+
+
+def shipped_queries():
+    """
+    应用发出的全部语句：[(名称, 语句, EXPLAIN 用的示例参数)]
+    """
+    import queries
+    import graph_snapshot
+
+    sample = {
+        "user_id": "__explain__",
+        "person_id": "__explain__",
+        "job_id": "__explain__",
+        "skills": ["__explain__"],
+        "rows": [{"user_id": "__explain__", "skills": ["__explain__"]}],
+    }
+    found = []
+    for module in (queries, graph_snapshot):
+        for name in dir(module):
+            value = getattr(module, name)
+            if name.endswith("_QUERY") and isinstance(value, str):
+                found.append((name, value, sample))
+    # 去重（graph_snapshot 中 REQUIRES_QUERY 是从 job_matrix 引入的别名）
+    seen = set()
+    result = []
+    for name, query, params in found:
+        if query not in seen:
+            seen.add(query)
+            result.append((name, query, params))
+    return result
+
+
+def _plan_operators(plan):
+    """递归收集执行计划中的全部算子名"""
+    if plan is None:
+        return []
+    if isinstance(plan, dict):
+        op = plan.get("operatorType", "")
+        children = plan.get("children", [])
+    else:
+        op = getattr(plan, "operator_type", "")
+        children = getattr(plan, "children", [])
+    ops = [op.split("@")[0]]
+    for child in children:
+        ops.extend(_plan_operators(child))
+    return ops
+
+
+def check_query_plans(driver, queries=None):
+    """
+    对每条语句执行 EXPLAIN（不会真正执行），返回
+    [{"name", "operators", "label_scan", "expected"}]
+    """
+    report = []
+    with driver.session() as session:
+        for name, query, params in (queries or shipped_queries()):
+            try:
+                summary = session.run("EXPLAIN " + query, **params).consume()
+                ops = _plan_operators(summary.plan)
+                error = None
+            except Exception as e:
+                ops = []
+                error = str(e)
+            report.append({
+                "name": name,
+                "operators": ops,
+                "label_scan": any(op.startswith("NodeByLabelScan") for op in ops),
+                "expected": name in EXPECTED_FULL_SCANS,
+                "error": error,
+            })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="初始化 Neo4j 约束/索引并检查查询计划")
+    parser.add_argument("--check", action="store_true", help="只检查查询计划，不创建约束/索引")
+    args = parser.parse_args(argv)
+
+    from app import neo4j_driver
+
+    if not args.check:
+        bootstrap_schema(neo4j_driver)
+        print(f"[OK] 已确保 {len(SCHEMA_STATEMENTS)} 个约束/索引存在")
+
+    bad = 0
+    for item in check_query_plans(neo4j_driver):
+        if item["error"]:
+            status = f"ERROR  {item['error']}"
+            bad += 1
+        elif item["label_scan"] and not item["expected"]:
+            status = "SCAN   仍在使用 NodeByLabelScan"
+            bad += 1
+        elif item["label_scan"]:
+            status = "scan   （预期的全量读取）"
+        else:
+            status = "OK"
+        print(f"{item['name']:<36} {status}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
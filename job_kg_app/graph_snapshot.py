@@ -0,0 +1,232 @@
+"""
+图谱快照缓存
+
+岗位、技能、REQUIRES 权重、统计数字几乎是静态数据，没必要每个请求都查 Neo4j。
+这里一次性把它们载入进程内的只读结构（GraphSnapshot），路由直接读快照：
+- 超过 TTL 后只查一次版本标记节点 (:GraphVersion {id: "main"})，版本未变则续期，变了才整体重载
+- 重载在后台锁内完成（含先修关系图、技能向量，换入前建好，不在请求中现场计算），期间其它请求继续读旧快照；
+  快照对象本身不可变，无需加锁读取
+- 修改岗位/技能数据的写入方应调用 bump_graph_version()，让所有进程在下个 TTL 内刷新
+"""
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import islice
+from functools import cached_property
+from types import MappingProxyType
+
+from job_matrix import JobSkillMatrix, LOAD_QUERY as REQUIRES_QUERY
+from job_reco import RecommendationIndex
+from job_search import JobSearchIndex
+from job_summary import JobSummary
+from metrics import SNAPSHOT_SECONDS, timed, timed_query
+from skill_canon import SKILL_ALIAS_PATH, SkillCanon, load_aliases
+from skill_embed import SKILL_EMBED_PATH, SkillEmbedding
+from skill_graph import SKILL_GRAPH_PATH, SkillPrereqGraph
+
+JobInfo = namedtuple("JobInfo", ["id", "name", "city", "title"])
+
+JOBS_QUERY = """
+    MATCH (j:Job)
+    RETURN j.job_id AS id, coalesce(j.name, j.title, "") AS name, coalesce(j.city, "未知") AS city,
+           coalesce(j.title, "") AS title
+    ORDER BY id
+"""
+
+SKILLS_QUERY = """
+    MATCH (s:Skill)
+    WHERE s.name IS NOT NULL AND trim(s.name) <> ""
+    RETURN s.name AS name
+    ORDER BY name
+"""
+
+STATS_QUERY = """
+    CALL {
+      MATCH (j:Job) RETURN count(j) AS job_count
+    }
+    CALL {
+      MATCH (s:Skill) RETURN count(s) AS skill_count
+    }
+    CALL {
+      MATCH ()-[r:REQUIRES]->() RETURN count(r) AS rel_count
+    }
+    RETURN job_count, skill_count, rel_count
+"""
+
+VERSION_QUERY = """
+    OPTIONAL MATCH (v:GraphVersion {id: "main"})
+    RETURN v.version AS version
+"""
+
+BUMP_VERSION_QUERY = """
+    MERGE (v:GraphVersion {id: "main"})
+    SET v.version = coalesce(v.version, 0) + 1, v.updated_at = timestamp()
+    RETURN v.version AS version
+"""
+
+
+class GraphSnapshot:
+    """某一时刻的图谱只读快照"""
+
+    def __init__(self, version, jobs, skills, requires, stats):
+        self.version = version
+        self.loaded_at = time.time()
+        # 岗位列表（按 job_id 排序）及索引
+        self.jobs = tuple(sorted((JobInfo(j["id"], j["name"], j["city"], j.get("title") or "") for j in jobs),
+                                 key=lambda job: str(job.id)))
+        self.job_by_id = MappingProxyType({j.id: j for j in self.jobs})
+        # 键集分页用：全部及按城市分组的 job_id 有序数组
+        self._job_keys = tuple(str(j.id) for j in self.jobs)
+        by_city = {}
+        for job in self.jobs:
+            by_city.setdefault(job.city, []).append(job)
+        self._jobs_by_city = {city: (tuple(items), tuple(str(j.id) for j in items))
+                              for city, items in by_city.items()}
+        # 岗位名称/城市搜索索引
+        self.search = JobSearchIndex.from_jobs(self.jobs)
+        # 全部技能名
+        self.skills = tuple(skills)
+        # job_id → ((技能, 权重), ...)，保持原始权重数值（不经过 float32）
+        self.requires = MappingProxyType({jid: tuple(items) for jid, items in requires.items()})
+        self.stats = MappingProxyType(dict(stats))
+        # 向量化打分用的稀疏矩阵
+        self.matrix = JobSkillMatrix.from_records(
+            {"job_id": jid, "job_name": self.job_name(jid), "city": self.job_city(jid),
+             "skill": skill, "weight": weight}
+            for jid, items in self.requires.items() for skill, weight in items
+        )
+        self.skill_counts = MappingProxyType(self.matrix.skill_counts())
+        # 技能归一化（大小写/版本号/别名 → 规范技能 ID），匹配打分按 ID 比较
+        self.canon = SkillCanon(self.skills + tuple(self.matrix.skill_names), load_aliases(SKILL_ALIAS_PATH))
+        self.matrix.attach_canon(self.canon)
+        # 每个岗位的需求汇总（总权重/最大权重/按权重排序的技能），随快照重载重算
+        self.summaries = MappingProxyType({jid: JobSummary.build(items, self.canon)
+                                           for jid, items in self.requires.items()})
+        # 技能→岗位倒排推荐索引（含按用户缓存的增量排名）
+        self.reco = RecommendationIndex(self.matrix)
+
+    @cached_property
+    def prereq(self):
+        """技能先修关系图（读取离线结果，版本不符则现场计算；SnapshotCache 换入快照前由 warm() 构建）"""
+        return SkillPrereqGraph.load_or_build(SKILL_GRAPH_PATH, self.matrix, self.version)
+
+    @cached_property
+    def embedding(self):
+        """技能向量与近邻索引（mmap 离线结果，版本不符则现场计算；SnapshotCache 换入快照前由 warm() 构建）"""
+        return SkillEmbedding.load_or_build(SKILL_EMBED_PATH, self.matrix, self.version)
+
+    def warm(self):
+        """构建按需加载的派生结构，返回自身"""
+        self.prereq
+        self.embedding
+        return self
+
+    def job_name(self, job_id):
+        job = self.job_by_id.get(job_id)
+        return job.name if job else ""
+
+    def job_city(self, job_id):
+        job = self.job_by_id.get(job_id)
+        return job.city if job else "未知"
+
+    def job_page(self, after=None, limit=20, city=None, q=None):
+        """
+        岗位列表的一页，按 job_id 升序做键集分页（游标为上一页最后一个 job_id），不随目录规模变慢
+        :param city: 城市（精确匹配）
+        :param q: 名称/职位名/城市关键词（同 /explore 搜索，多个关键词都需命中）
+        :return: (岗位列表, 下一页游标)；没有下一页时游标为 None
+        """
+        if q:
+            matches = self.search.iter_matches(q, after)
+            if city:
+                matches = (job for job in matches if job.city == city)
+            page = list(islice(matches, limit + 1))
+        else:
+            jobs, keys = self._jobs_by_city.get(city, ((), ())) if city else (self.jobs, self._job_keys)
+            start = bisect_right(keys, str(after)) if after else 0
+            page = list(jobs[start:start + limit + 1])
+        if len(page) > limit:
+            return page[:limit], page[limit - 1].id
+        return page, None
+
+    def job_requirements(self, job_id):
+        """岗位技能需求 {技能: 权重}，岗位不存在或无需求时返回空字典"""
+        return dict(self.requires.get(job_id, ()))
+
+    def job_summary(self, job_id):
+        """岗位需求汇总 JobSummary，岗位不存在或无需求时返回 None"""
+        return self.summaries.get(job_id)
+
+    @classmethod
+    def load(cls, driver):
+        """从 Neo4j 读取全部静态数据"""
+        with timed(SNAPSHOT_SECONDS), driver.session() as session:
+            with timed_query("VERSION_QUERY"):
+                version = session.run(VERSION_QUERY).single()["version"]
+            with timed_query("JOBS_QUERY"):
+                jobs = session.run(JOBS_QUERY).data()
+            with timed_query("SKILLS_QUERY"):
+                skills = [r["name"] for r in session.run(SKILLS_QUERY).data()]
+            with timed_query("STATS_QUERY"):
+                stats_rec = session.run(STATS_QUERY).single()
+            requires = {}
+            with timed_query("REQUIRES_QUERY"):
+                for rec in session.run(REQUIRES_QUERY).data():
+                    requires.setdefault(rec["job_id"], []).append((rec["skill"], rec["weight"]))
+
+            stats = {
+                "job_count": stats_rec["job_count"] if stats_rec else 0,
+                "skill_count": stats_rec["skill_count"] if stats_rec else 0,
+                "rel_count": stats_rec["rel_count"] if stats_rec else 0,
+            }
+            return cls(version, jobs, skills, requires, stats)
+
+
+class SnapshotCache:
+    """进程级快照缓存：TTL + 版本号双重失效"""
+
+    def __init__(self, driver, ttl=300):
+        self._driver = driver
+        self.ttl = ttl
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """获取当前快照；首次调用会同步加载，之后过期时才检查版本"""
+        snap = self._snapshot
+        if snap is not None and time.time() - self._checked_at < self.ttl:
+            return snap
+        # 同一时刻只允许一个线程检查/重载，其余线程直接用旧快照
+        if snap is not None and not self._lock.acquire(blocking=False):
+            return snap
+        if snap is None:
+            self._lock.acquire()
+        try:
+            if self._snapshot is None or time.time() - self._checked_at >= self.ttl:
+                self._refresh_locked()
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            print(f"[ERROR] 刷新图谱快照失败，继续使用旧快照: {e}")
+            self._checked_at = time.time()
+        finally:
+            self._lock.release()
+        return self._snapshot
+
+    def _refresh_locked(self):
+        if self._snapshot is not None:
+            with self._driver.session() as session, timed_query("VERSION_QUERY"):
+                version = session.run(VERSION_QUERY).single()["version"]
+            if version == self._snapshot.version:
+                self._checked_at = time.time()
+                return
+        # 先修关系图、技能向量在锁内建好再换入，请求线程不会现场计算，也不会多个线程同时计算
+        self._snapshot = GraphSnapshot.load(self._driver).warm()
+        self._checked_at = time.time()
+
+
+def bump_graph_version(tx):
+    """在写事务内递增图谱版本号，使各进程的快照失效"""
+    return tx.run(BUMP_VERSION_QUERY).single()["version"]
@@ -0,0 +1,36 @@
+"""
+gunicorn 生产部署配置（在项目根目录执行）：
+    SECRET_KEY=... NEO4J_URI=bolt://db:7687 NEO4J_PASSWORD=... \
+        gunicorn -c job_kg_app/gunicorn.conf.py "app:create_app()"
+
+- preload_app：master 先导入应用并调用 create_app() 建立约束/索引（幂等）、预加载技能词典、图谱快照、先修关系图、技能向量、简历抽取器，
+  再 fork 出 worker，这些只读数据以写时复制方式共享，worker 启动无需再加载
+- gthread：每个 worker 多线程处理请求（SSE 报告流会在生成期间占用一个线程，按并发报告数调大 KG_THREADS）
+- 多 worker：后台报告任务在创建它的 worker 内生成，状态与已生成片段同步写入 REPORT_CACHE_DB
+  （report_jobs.ReportJobStore），/api/report/<id> 及其 SSE 流落到任意 worker 上都能读取/续读。
+  未设置 REPORT_CACHE_DB 时默认使用当前目录下的 report_cache.sqlite3（同时作为报告缓存的磁盘层）
+
+环境变量：
+    KG_BIND      监听地址，默认 0.0.0.0:5000
+    KG_WORKERS   worker 进程数，默认 CPU 核数
+    KG_THREADS   每个 worker 的线程数，默认 8
+    KG_TIMEOUT   worker 无响应超时（秒），默认 120
+    KG_ACCESS_LOG  访问日志路径，"-" 为标准输出，默认不记录
+应用本身的配置（SECRET_KEY、NEO4J_URI/USER/PASSWORD、DEEPSEEK_API_KEY、REPORT_CACHE_DB、KG_PROFILE/KG_PROFILE_DIR）见 app.py。
+"""
+import multiprocessing
+import os
+
+pythonpath = "job_kg_app"
+bind = os.environ.get("KG_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("KG_WORKERS", multiprocessing.cpu_count()))
+if workers > 1:
+    # 报告任务需跨 worker 共享（配置在 preload 导入应用之前执行）
+    os.environ.setdefault("REPORT_CACHE_DB", "report_cache.sqlite3")
+threads = int(os.environ.get("KG_THREADS", 8))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.environ.get("KG_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.environ.get("KG_ACCESS_LOG") or None
@@ -0,0 +1,202 @@
+"""
+岗位-技能稀疏矩阵引擎
+
+把 (:Job)-[:REQUIRES]->(:Skill) 整张图一次性载入内存，存成 CSR 稀疏矩阵：
+- 行：岗位（job_id → 行号）
+- 列：技能（技能名 → 列号）
+- 值：REQUIRES 权重
+
+给定用户技能集合，一次向量化乘法即可得到所有岗位的加权重合率，
+再用 argpartition 做部分 TOP-K 选择，避免逐岗位 Python 循环。
+挂上 SkillCanon 后，用户技能按规范技能 ID 映射到列（"Vue.js" 命中 "Vue" 列），否则按技能名精确匹配。
+"""
+import numpy as np
+
+# 一次性拉取全部岗位需求边（权重缺失时按 1 处理）
+LOAD_QUERY = """
+    MATCH (j:Job)-[r:REQUIRES]->(s:Skill)
+    WHERE s.name IS NOT NULL AND trim(s.name) <> ""
+    RETURN j.job_id AS job_id, j.name AS job_name, j.city AS city,
+           s.name AS skill, coalesce(r.weight, 1.0) AS weight
+    ORDER BY job_id
+"""
+
+
+class JobSkillMatrix:
+    """岗位×技能 CSR 矩阵（只读）"""
+
+    def __init__(self, job_ids, job_names, job_cities, skill_names, indptr, indices, data):
+        self.job_ids = list(job_ids)
+        self.job_names = list(job_names)
+        self.job_cities = list(job_cities)
+        self.skill_names = list(skill_names)
+        # 字符串 → 整数 的驻留表
+        self.job_index = {jid: i for i, jid in enumerate(self.job_ids)}
+        self.skill_index = {name: i for i, name in enumerate(self.skill_names)}
+        self.canon = None
+        self._canon_cols = {}  # 规范技能 ID → 列号元组
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+
+        # 每个岗位的总权重只依赖图数据，预先算好
+        self.row_totals = self._row_sum(self.data)
+
+    @property
+    def n_jobs(self):
+        return len(self.job_ids)
+
+    @property
+    def n_skills(self):
+        return len(self.skill_names)
+
+    @property
+    def nnz(self):
+        return int(self.indices.shape[0])
+
+    # ---------- 构建 ----------
+    @classmethod
+    def from_records(cls, records):
+        """
+        由 (job_id, job_name, city, skill, weight) 记录构建矩阵。
+        同一岗位重复出现的技能只保留一条（取最后一次的权重）。
+        """
+        job_ids, job_names, job_cities = [], [], []
+        job_index = {}
+        skill_names = []
+        skill_index = {}
+        rows = []  # 每个岗位：{技能列号: 权重}
+
+        for rec in records:
+            skill = rec["skill"]
+            if skill is None or not str(skill).strip():
+                continue
+            jid = rec["job_id"]
+            row = job_index.get(jid)
+            if row is None:
+                row = len(job_ids)
+                job_index[jid] = row
+                job_ids.append(jid)
+                job_names.append(rec.get("job_name"))
+                job_cities.append(rec.get("city") or "未知")
+                rows.append({})
+            col = skill_index.get(skill)
+            if col is None:
+                col = len(skill_names)
+                skill_index[skill] = col
+                skill_names.append(skill)
+            weight = rec.get("weight")
+            rows[row][col] = float(weight if weight is not None else 1.0)
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        for i, row in enumerate(rows):
+            indptr[i + 1] = indptr[i] + len(row)
+        indices = np.empty(int(indptr[-1]), dtype=np.int32)
+        data = np.empty(int(indptr[-1]), dtype=np.float32)
+        for i, row in enumerate(rows):
+            start = indptr[i]
+            cols = sorted(row)
+            indices[start:start + len(cols)] = cols
+            data[start:start + len(cols)] = [row[c] for c in cols]
+
+        return cls(job_ids, job_names, job_cities, skill_names, indptr, indices, data)
+
+    @classmethod
+    def load(cls, driver):
+        """从 Neo4j 读取全部 REQUIRES 边并构建矩阵"""
+        with driver.session() as session:
+            records = session.run(LOAD_QUERY).data()
+        return cls.from_records(records)
+
+    def attach_canon(self, canon):
+        """挂上技能归一化表：同一规范技能的各种写法互相命中"""
+        cols = {}
+        for col, name in enumerate(self.skill_names):
+            cid = canon.id(name)
+            if cid is not None:
+                cols.setdefault(cid, []).append(col)
+        self._canon_cols = {cid: tuple(c) for cid, c in cols.items()}
+        self.canon = canon
+
+    def columns(self, skills):
+        """用户技能 → 列号集合（未收录的技能直接忽略）"""
+        if self.canon is None:
+            index = self.skill_index
+            return {index[s] for s in skills if s in index}
+        get = self._canon_cols.get
+        cols = set()
+        for cid in self.canon.ids(skills):
+            cols.update(get(cid, ()))
+        return cols
+
+    # ---------- 计算 ----------
+    def _row_sum(self, values):
+        """按行求和（空行为 0）"""
+        out = np.zeros(self.n_jobs, dtype=np.float64)
+        nonempty = self.indptr[:-1] < self.indptr[1:]
+        if values.size:
+            out[nonempty] = np.add.reduceat(values.astype(np.float64), self.indptr[:-1][nonempty])
+        return out
+
+    def user_vector(self, skills):
+        """用户技能 → 0/1 向量（未收录的技能直接忽略）"""
+        vec = np.zeros(self.n_skills, dtype=np.float32)
+        cols = self.columns(skills)
+        if cols:
+            vec[list(cols)] = 1.0
+        return vec
+
+    def overlap_weights(self, skills):
+        """每个岗位中用户已掌握技能的权重之和（即 矩阵 × 用户向量）"""
+        vec = self.user_vector(skills)
+        return self._row_sum(self.data * vec[self.indices])
+
+    def match_rates(self, skills):
+        """所有岗位的加权匹配率（0~1）"""
+        overlap = self.overlap_weights(skills)
+        rates = np.zeros(self.n_jobs, dtype=np.float64)
+        np.divide(overlap, self.row_totals, out=rates, where=self.row_totals > 0)
+        return rates
+
+    def skill_counts(self):
+        """每个技能被多少个岗位需要（技能名 → 次数）"""
+        counts = np.bincount(self.indices, minlength=self.n_skills)
+        return dict(zip(self.skill_names, counts.tolist()))
+
+    def job_skills(self, row):
+        """取某一行的 (技能名, 权重) 列表"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return [(self.skill_names[c], float(w))
+                for c, w in zip(self.indices[start:end], self.data[start:end])]
+
+    def overlap_skills(self, row, cols):
+        """某一行中列号属于 cols 的技能名（保持行内顺序）"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return [self.skill_names[c] for c in self.indices[start:end].tolist() if c in cols]
+
+    def top_k(self, skills, k=5):
+        """
+        返回匹配率最高的 k 个岗位，格式与 /path-reco 页面的 job_reco 一致。
+        """
+        if self.n_jobs == 0 or k <= 0:
+            return []
+        rates = self.match_rates(skills)
+        k = min(k, self.n_jobs)
+        # 部分选择后只对 k 个候选排序
+        cand = np.argpartition(-rates, k - 1)[:k]
+        cand = cand[np.lexsort((cand, -rates[cand]))]
+
+        cols = self.columns(skills)
+        result = []
+        for row in cand:
+            row = int(row)
+            result.append({
+                "job_id": self.job_ids[row],
+                "job_name": self.job_names[row],
+                "city": self.job_cities[row],
+                "match_rate": round(float(rates[row]) * 100),
+                "overlap_skills": self.overlap_skills(row, cols),
+            })
+        return result
+
@@ -0,0 +1,133 @@
+"""
+岗位推荐索引（技能 → 岗位倒排表）
+
+JobSkillMatrix.top_k 每次都要对全部岗位打分。这里把 CSR 矩阵转置成按技能组织的倒排表，
+每条记录存的是该技能对岗位匹配率的贡献 weight / 岗位总权重，因此：
+    岗位匹配率 = 用户技能在该岗位倒排表中的贡献之和
+- recommend()：按用户缓存各岗位的累计得分，技能增删时只沿被增删技能的倒排表加减分数，不再整体重算，
+  开销只与被增删技能覆盖的岗位数有关，与岗位总数无关
+不缓存用户的一次性查询直接用 JobSkillMatrix.top_k：按倒排表逐条游标做 WAND 剪枝在 Python 里
+比 numpy 整体打分慢一个数量级，这里不提供无状态检索。
+索引挂在 GraphSnapshot 上，快照重载时用户缓存随之丢弃。
+"""
+import heapq
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _UserRanking:
+    """单个用户的累计得分：岗位行号 → 匹配率"""
+
+    __slots__ = ("cols", "scores", "hits", "_top")
+
+    def __init__(self):
+        self.cols = set()  # 已计入的技能列号
+        self.scores = {}
+        self.hits = {}  # 岗位行号 → 命中技能数，归零时删除，避免浮点残差
+        self._top = None
+
+    def apply(self, rows, contrib, sign):
+        scores, hits = self.scores, self.hits
+        for row, c in zip(rows, contrib):
+            n = hits.get(row, 0) + sign
+            if n:
+                hits[row] = n
+                scores[row] = scores.get(row, 0.0) + sign * c
+            else:
+                del hits[row]
+                del scores[row]
+        self._top = None
+
+    def top(self, k):
+        if self._top is None or len(self._top) < k:
+            self._top = heapq.nsmallest(k, self.scores.items(), key=lambda item: (-item[1], item[0]))
+        return self._top[:k]
+
+
+class RecommendationIndex:
+    """基于 JobSkillMatrix 的倒排推荐索引"""
+
+    def __init__(self, matrix, max_users=10000):
+        self.matrix = matrix
+        n_jobs = matrix.n_jobs
+
+        # CSR → 按技能列分组（稳定排序保证每条倒排表内岗位行号递增）
+        rows = np.repeat(np.arange(n_jobs, dtype=np.int32), np.diff(matrix.indptr))
+        totals = matrix.row_totals[rows] if rows.size else np.zeros(0)
+        contrib = np.zeros(rows.shape[0], dtype=np.float64)
+        np.divide(matrix.data.astype(np.float64), totals, out=contrib, where=totals > 0)
+
+        order = np.argsort(matrix.indices, kind="stable")
+        self._rows = rows[order]
+        self._contrib = contrib[order]
+        self._ptr = np.zeros(matrix.n_skills + 1, dtype=np.int64)
+        np.cumsum(np.bincount(matrix.indices, minlength=matrix.n_skills), out=self._ptr[1:])
+
+        self.max_users = max_users
+        self._users = OrderedDict()  # user_id → _UserRanking（LRU）
+        self._lock = threading.Lock()
+
+    def _posting(self, col):
+        start, end = self._ptr[col], self._ptr[col + 1]
+        return self._rows[start:end].tolist(), self._contrib[start:end].tolist()
+
+    # ---------- 按用户增量维护 ----------
+    def recommend(self, user_id, skills, k=5):
+        """
+        用户的 TOP-K 推荐。首次调用按用户技能的倒排表累计得分并缓存；
+        之后技能集合变化时只对增删的技能做增量调整。
+        """
+        cols = self.matrix.columns(skills)
+        with self._lock:
+            ranking = self._users.get(user_id)
+            if ranking is None:
+                ranking = self._users[user_id] = _UserRanking()
+                if len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user_id)
+            self._sync(ranking, cols)
+            top = ranking.top(k)
+        return self._format(top, cols, k)
+
+    def update_user(self, user_id, skills):
+        """用户技能变更后调用：已缓存的用户按差集增量更新，未缓存的不处理（下次推荐时再建）"""
+        with self._lock:
+            ranking = self._users.get(user_id)
+            if ranking is not None:
+                self._sync(ranking, self.matrix.columns(skills))
+
+    def forget_user(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def _sync(self, ranking, cols):
+        """按列号差集增减（用户技能已经过归一化映射成列号，同一规范技能的多种写法不会重复计分）"""
+        for col in ranking.cols - cols:
+            ranking.apply(*self._posting(col), -1)
+        for col in cols - ranking.cols:
+            ranking.apply(*self._posting(col), 1)
+        ranking.cols = cols
+
+    # ---------- 输出 ----------
+    def _format(self, top, cols, k):
+        """[(行号, 匹配率)] → 页面用的字典列表；命中岗位不足 k 个时按行号补齐 0 分岗位"""
+        m = self.matrix
+        top = list(top)
+        if len(top) < min(k, m.n_jobs):
+            taken = {row for row, _ in top}
+            for row in range(m.n_jobs):
+                if len(top) >= k:
+                    break
+                if row not in taken:
+                    top.append((row, 0.0))
+
+        return [{
+            "job_id": m.job_ids[row],
+            "job_name": m.job_names[row],
+            "city": m.job_cities[row],
+            "match_rate": round(score * 100),
+            "overlap_skills": m.overlap_skills(row, cols),
+        } for row, score in top]
@@ -0,0 +1,154 @@
+"""
+岗位搜索索引（字符 n-gram 倒排索引）
+
+/explore 原来用 toLower(...) CONTAINS $q 全量扫描 Job 节点。这里在进程内对岗位名称、职位名、城市
+建立字符级 n-gram（单字 + 二元组）倒排表，中文无需分词即可做子串检索：
+- 查询按空格拆成多个关键词，所有关键词都需命中（可分别命中名称或城市，如"北京 开发"）
+- 取最稀有的 n-gram 的倒排表作为候选，再逐个校验子串，结果与 CONTAINS 语义一致
+- 按命中字段打分排序，支持分页
+- 按 job_id 升序逐个产出命中岗位（键集分页用）：文档按 job_id 顺序加入时倒排表本身有序，
+  从游标处二分定位后顺序校验，取满一页即停止
+- 支持增量 add / remove，无需整体重建
+"""
+from array import array
+from bisect import bisect_right
+
+
+def _normalize(text):
+    return (text or "").strip().lower()
+
+
+def _grams(text):
+    """文本的全部单字和二元组"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    grams.discard(" ")
+    return grams
+
+
+class JobSearchIndex:
+    """岗位名称/职位名/城市的 n-gram 倒排索引"""
+
+    def __init__(self):
+        self._docs = []  # 内部文档号 → (job, 名称小写, 职位名小写, 城市小写)；删除后置 None
+        self._doc_by_job = {}  # job_id → 内部文档号
+        self._postings = {}  # n-gram → array('i') 文档号（追加写，删除靠 _docs 置空）
+        self._ids = []  # 内部文档号 → job_id（删除后保留，供倒排表按 job_id 二分）
+        self._ordered = True  # 文档号顺序与 job_id 顺序一致（按 job_id 升序加入且未更新过）
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        index = cls()
+        for job in jobs:
+            index.add(job)
+        return index
+
+    def __len__(self):
+        return len(self._doc_by_job)
+
+    # ---------- 增量维护 ----------
+    def add(self, job):
+        """
+        加入（或更新）一个岗位
+        :param job: 具有 id / name / city 属性的对象（如 GraphSnapshot 中的 JobInfo），可选 title
+        """
+        if job.id in self._doc_by_job:
+            self.remove(job.id)
+        name = _normalize(job.name)
+        title = _normalize(getattr(job, "title", "") or "")
+        city = _normalize(job.city)
+        if title == name:
+            title = ""
+
+        doc = len(self._docs)
+        if self._ids and str(job.id) <= self._ids[-1]:
+            self._ordered = False
+        self._docs.append((job, name, title, city))
+        self._ids.append(str(job.id))
+        self._doc_by_job[job.id] = doc
+        for gram in _grams(name) | _grams(title) | _grams(city):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("i")
+            posting.append(doc)
+
+    def remove(self, job_id):
+        """删除岗位（倒排表中的旧文档号在查询时被跳过）"""
+        doc = self._doc_by_job.pop(job_id, None)
+        if doc is not None:
+            self._docs[doc] = None
+
+    # ---------- 查询 ----------
+    def _candidates(self, term):
+        """term 中最稀有 n-gram 的倒排表"""
+        grams = [term[i:i + 2] for i in range(len(term) - 1)] or [term]
+        best = None
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best
+
+    @staticmethod
+    def _score(terms, name, title, city):
+        """所有关键词都命中时返回得分，否则返回 None"""
+        score = 0.0
+        for term in terms:
+            if term in name:
+                score += 10 + (5 if name.startswith(term) else 0)
+            elif term in title:
+                score += 6
+            elif term in city:
+                score += 3 + (2 if city == term else 0)
+            else:
+                return None
+        return score
+
+    def iter_matches(self, q, after=None):
+        """
+        按 job_id 升序逐个产出所有关键词都命中的岗位（只含 job_id 大于 after 的）
+        按序加入的索引只校验游标之后的候选，调用方取够一页即可停止迭代
+        """
+        terms = [t for t in _normalize(q).split() if t]
+        if not terms:
+            return
+        candidates = min((self._candidates(t) for t in terms), key=len)
+        key = self._ids.__getitem__
+        if self._ordered:
+            start = bisect_right(candidates, str(after), key=key) if after is not None else 0
+            docs = (candidates[i] for i in range(start, len(candidates)))
+        else:
+            docs = sorted((d for d in candidates if after is None or key(d) > str(after)), key=key)
+        for doc in docs:
+            entry = self._docs[doc]
+            if entry is not None and self._score(terms, *entry[1:]) is not None:
+                yield entry[0]
+
+    def search(self, q, page=1, page_size=50):
+        """
+        :return: (命中总数, 当前页岗位列表)；每项为 {"id", "name", "city"}
+        """
+        terms = [t for t in _normalize(q).split() if t]
+        if not terms:
+            return 0, []
+
+        # 以最稀有关键词的候选集为起点逐个校验
+        candidates = min((self._candidates(t) for t in terms), key=len)
+        hits = []
+        for doc in candidates:
+            entry = self._docs[doc]
+            if entry is None:
+                continue
+            job, name, title, city = entry
+            score = self._score(terms, name, title, city)
+            if score is not None:
+                hits.append((-score, len(name), str(job.id), job))
+
+        hits.sort(key=lambda h: h[:3])
+        page = max(page, 1)
+        start = (page - 1) * page_size
+        result = [{"id": h[3].id, "name": h[3].name, "city": h[3].city}
+                  for h in hits[start:start + page_size]]
+        return len(hits), result
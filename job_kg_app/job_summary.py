@@ -0,0 +1,69 @@
+"""
+岗位需求汇总（物化的按岗位聚合）
+
+匹配诊断、路径推荐、岗位技能图、批量匹配原来每次请求都要对岗位的全部 REQUIRES 重新求总权重、
+最大权重并按权重排序。这些只依赖图数据，快照加载时给每个岗位算一次（JobSummary）：
+- total_weight / max_weight：总权重、最大权重（原始权重数值，不经过 float32）
+- skills / ids：技能名及对应的规范技能 ID（图中原顺序）
+- ranked：按权重降序的技能名（同权重保持原顺序）
+- id_weights：规范技能 ID → 权重和，打分时只需遍历一遍用户技能，不再逐岗位汇总
+REQUIRES 变化时写入方递增图谱版本号（bump_graph_version），各进程重载快照时随之重算。
+"""
+from collections import namedtuple
+from operator import itemgetter
+from types import MappingProxyType
+
+_FIELDS = ["total_weight", "max_weight", "skills", "ids", "ranked", "weights", "id_weights"]
+
+
+class JobSummary(namedtuple("JobSummary", _FIELDS)):
+    """单个岗位的技能需求汇总（只读）"""
+
+    __slots__ = ()
+
+    @classmethod
+    def build(cls, items, canon=None):
+        """
+        :param items: ((技能, 权重), ...)；同一技能出现多次时取后出现的权重
+        :param canon: SkillCanon，给出时按规范技能 ID 比较，否则按技能名精确匹配
+        """
+        weights = dict(items)
+        skills = tuple(weights)
+        values = weights.values()
+        if canon is not None:
+            ids = tuple(map(canon.id, skills))
+            id_weights = dict(zip(ids, values))
+            if len(id_weights) < len(ids) or None in id_weights:
+                # 多种写法归一到同一技能（或有无法识别的技能）时逐个累加
+                id_weights = {}
+                for cid, weight in zip(ids, values):
+                    if cid is not None:
+                        id_weights[cid] = id_weights.get(cid, 0) + weight
+        else:
+            ids, id_weights = skills, weights
+        ranked = tuple(map(itemgetter(0), sorted(weights.items(), key=itemgetter(1), reverse=True)))
+        return cls(sum(values), max(values, default=0), skills, ids, ranked,
+                   MappingProxyType(weights), id_weights)
+
+    def owned_weight(self, user_ids):
+        """用户已掌握技能（规范技能 ID 集合）覆盖的权重和"""
+        get = self.id_weights.get
+        return sum(get(cid, 0) for cid in user_ids)
+
+    def split(self, user_ids):
+        """(已掌握技能, 缺失技能)，均保持原顺序"""
+        owned, missing = [], []
+        for skill, cid in zip(self.skills, self.ids):
+            (owned if cid in user_ids else missing).append(skill)
+        return owned, missing
+
+    def top_missing(self, missing, n):
+        """缺失技能中权重最高的 n 个（按权重降序）"""
+        missing = set(missing)
+        top = []
+        for skill in self.ranked:
+            if len(top) == n:
+                break
+            if skill in missing:
+                top.append(skill)
+        return top
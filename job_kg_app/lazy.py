@@ -0,0 +1,51 @@
+"""
+延迟创建的对象代理
+
+模块导入时只登记工厂函数，首次访问属性时才真正创建对象（线程安全，只创建一次）：
+- Neo4j 驱动 / OpenAI 客户端：导入 app 不再依赖 neo4j、openai 包的导入耗时，也不要求服务可达；
+  多进程部署时每个 worker 在 fork 之后各自创建连接，不会共享父进程的 socket
+- 简历技能抽取器：只有真正处理简历的进程才编译自动机
+"""
+import threading
+
+
+class LazyProxy:
+    """首次访问属性时调用 factory() 创建目标对象，之后所有属性访问转发给它"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """返回目标对象（必要时创建）"""
+        target = self._target
+        if target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+                target = self._target
+        return target
+
+    def reset(self):
+        """丢弃已创建的目标对象（有 close() 时先关闭），下次访问时重新创建；用于 fork 前释放连接"""
+        with self._lock:
+            target, self._target = self._target, None
+        if target is not None and hasattr(target, "close"):
+            target.close()
+
+    @property
+    def created(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):  # 未初始化（如反序列化途中）时避免递归
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __len__(self):
+        return len(self.get())
+
+    def __repr__(self):
+        state = repr(self._target) if self._target is not None else "未创建"
+        return f"<LazyProxy {state}>"
@@ -0,0 +1,216 @@
+"""
+热点路径埋点与 Prometheus 指标
+
+- Counter / Histogram：进程内指标（带标签、线程安全），/metrics 按 Prometheus 文本格式输出
+- timed()：计时上下文管理器，同时把耗时记入当前请求的分段统计
+- init_app()：为每个路由记录请求数与耗时、模板渲染耗时、未处理异常数，并注册 /metrics
+- 请求头带 X-Profile: 1 时（需 PROFILE_ENABLED），本次请求在 cProfile 下执行：
+  响应头 Server-Timing 给出 Neo4j / 模板渲染 / 打分等各段耗时，profile 结果写入 PROFILE_DIR
+"""
+import bisect
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import (Response, before_render_template, g, got_request_exception, has_request_context, request,
+                   template_rendered)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, doc, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1.0, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(n, "") for n in self.labels), 0.0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # 标签 → [各桶计数..., +Inf 计数, 总和]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            slot = self._values.get(key)
+            if slot is None:
+                slot = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            slot[i] += 1
+            slot[-1] += value
+
+    def count(self, **labels):
+        slot = self._values.get(tuple(labels.get(n, "") for n in self.labels))
+        return sum(slot[:-1]) if slot else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(slot)) for key, slot in self._values.items())
+        for key, slot in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), slot[:-1]):
+                cumulative += n
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {slot[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+def render_all():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------- 指标定义 ----------
+HTTP_REQUESTS = Counter("kg_http_requests_total", "HTTP 请求数", ("endpoint", "method", "status"))
+HTTP_SECONDS = Histogram("kg_http_request_seconds", "路由处理耗时（秒）", ("endpoint", "method"))
+HTTP_EXCEPTIONS = Counter("kg_http_exceptions_total", "路由未处理异常数", ("endpoint",))
+NEO4J_SECONDS = Histogram("kg_neo4j_query_seconds", "Neo4j 查询耗时（秒）", ("query",))
+NEO4J_ERRORS = Counter("kg_neo4j_errors_total", "Neo4j 查询失败数", ("query",))
+LLM_SECONDS = Histogram("kg_llm_request_seconds", "LLM 报告生成耗时（秒）", ("mode",),
+                        buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0))
+LLM_ERRORS = Counter("kg_llm_errors_total", "LLM 报告生成失败数", ("mode",))
+REPORT_CACHE = Counter("kg_report_cache_total", "报告缓存查询次数", ("result",))
+RENDER_SECONDS = Histogram("kg_template_render_seconds", "模板渲染耗时（秒）", ("template",))
+SCORING_SECONDS = Histogram("kg_scoring_seconds", "匹配/推荐打分耗时（秒）", ("op",),
+                            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+SNAPSHOT_SECONDS = Histogram("kg_snapshot_load_seconds", "图谱快照加载耗时（秒）",
+                             buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+
+
+# ---------- 计时 ----------
+def _record_span(segment, seconds):
+    """累加到当前请求的分段耗时（Server-Timing 用）"""
+    if has_request_context():
+        spans = g.setdefault("metric_spans", {})
+        spans[segment] = spans.get(segment, 0.0) + seconds
+
+
+@contextmanager
+def timed(histogram, errors=None, segment=None, **labels):
+    """
+    计时块：耗时记入 histogram；抛出异常时 errors 计数加一
+    segment 为该耗时在 Server-Timing 中的分段名（默认不计入）
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if errors is not None:
+            errors.inc(**labels)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, **labels)
+        if segment:
+            _record_span(segment, elapsed)
+
+
+def timed_query(name):
+    """Neo4j 查询计时"""
+    return timed(NEO4J_SECONDS, NEO4J_ERRORS, segment="neo4j", query=name)
+
+
+def timed_scoring(op):
+    return timed(SCORING_SECONDS, segment="scoring", op=op)
+
+
+# ---------- Flask 集成 ----------
+def init_app(app):
+    """注册请求计时钩子、模板渲染计时、/metrics 及按请求 profile"""
+    app.config.setdefault("PROFILE_ENABLED", False)
+    app.config.setdefault("PROFILE_DIR", "profiles")
+
+    @app.before_request
+    def _start_timer():
+        g.metric_start = time.perf_counter()
+        if app.config["PROFILE_ENABLED"] and request.headers.get("X-Profile"):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def _observe(response):
+        start = g.pop("metric_start", None)
+        if start is None:
+            return response
+        endpoint = request.endpoint or "unknown"
+        elapsed = time.perf_counter() - start
+        HTTP_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method)
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(app.config["PROFILE_DIR"], exist_ok=True)
+            path = os.path.join(app.config["PROFILE_DIR"], f"{int(time.time() * 1000)}_{endpoint}.prof")
+            profiler.dump_stats(path)
+            spans = dict(g.get("metric_spans", {}))
+            spans["total"] = elapsed
+            response.headers["Server-Timing"] = ", ".join(
+                f"{name};dur={seconds * 1000:.2f}" for name, seconds in spans.items())
+            response.headers["X-Profile-Dump"] = path
+        return response
+
+    def _before_render(sender, template, context, **extra):
+        if has_request_context():
+            g.setdefault("render_starts", []).append(time.perf_counter())
+
+    def _after_render(sender, template, context, **extra):
+        starts = g.get("render_starts") if has_request_context() else None
+        if starts:
+            elapsed = time.perf_counter() - starts.pop()
+            RENDER_SECONDS.observe(elapsed, template=template.name or "")
+            _record_span("render", elapsed)
+
+    def _on_exception(sender, exception, **extra):
+        HTTP_EXCEPTIONS.inc(endpoint=request.endpoint or "unknown")
+
+    before_render_template.connect(_before_render, app, weak=False)
+    template_rendered.connect(_after_render, app, weak=False)
+    got_request_exception.connect(_on_exception, app, weak=False)
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_all(), mimetype="text/plain; version=0.0.4; charset=utf-8")
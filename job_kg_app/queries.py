@@ -0,0 +1,76 @@
+"""
+应用使用的 Cypher 语句
+
+集中放在这里，方便 graph_schema.py 对所有语句做 EXPLAIN 检查（是否走索引）。
+"""
+
+# 用户已拥有的技能
+USER_SKILLS_QUERY = """
+    MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
+    RETURN s.name AS name
+    ORDER BY name
+"""
+
+# 用户技能 + 岗位需求合并查询（一次往返）
+USER_SKILLS_WITH_JOB_QUERY = """
+    OPTIONAL MATCH (p:Person {id: $user_id})-[:HAS_SKILL]->(s:Skill)
+    WITH collect(DISTINCT s.name) AS user_skills
+    OPTIONAL MATCH (j:Job {job_id: $job_id})-[r:REQUIRES]->(js:Skill)
+    RETURN user_skills, j.name AS job_name,
+           collect({name: js.name, weight: coalesce(r.weight, 1)}) AS requirements
+"""
+
+# 新建 Person 节点的默认名称（单用户/批量替换语句共用）
+DEFAULT_USER_NAME = "手动输入用户"
+
+# 单条语句完成技能集合替换：只删除不再拥有的技能边，只新建缺少的技能边
+# 先 SET 取得 Person 节点写锁，同一用户的并发替换在数据库侧串行执行，读方只会看到完整的旧集合或新集合
+REPLACE_USER_SKILLS_QUERY = """
+    MERGE (u:Person {id: $user_id})
+    ON CREATE SET u.name = '%s', u.created_at = timestamp()
+    SET u.updated_at = timestamp()
+    WITH u
+    OPTIONAL MATCH (u)-[r:HAS_SKILL]->(old:Skill)
+    WHERE NOT old.name IN $skills
+    DELETE r
+    WITH DISTINCT u
+    UNWIND $skills AS skill
+    MERGE (s:Skill {name: skill})
+    MERGE (u)-[:HAS_SKILL]->(s)
+""" % DEFAULT_USER_NAME
+
+# 多用户批量版本（graph_import.py --user-skills）：每行 {user_id, skills}；默认名称、时间戳与单用户版本一致
+BULK_REPLACE_USER_SKILLS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (u:Person {id: row.user_id})
+    ON CREATE SET u.name = '%s', u.created_at = timestamp()
+    SET u.updated_at = timestamp()
+    WITH u, row
+    OPTIONAL MATCH (u)-[r:HAS_SKILL]->(old:Skill)
+    WHERE NOT old.name IN row.skills
+    DELETE r
+    WITH DISTINCT u, row
+    UNWIND row.skills AS skill
+    MERGE (s:Skill {name: skill})
+    MERGE (u)-[:HAS_SKILL]->(s)
+""" % DEFAULT_USER_NAME
+
+# ---------- 批量导入（graph_import.py），每批 $rows 为一个 UNWIND 列表 ----------
+IMPORT_SKILLS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (s:Skill {name: row.name})
+"""
+
+IMPORT_JOBS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (j:Job {job_id: row.job_id})
+    SET j.name = row.name, j.city = row.city, j.title = row.title
+"""
+
+IMPORT_REQUIRES_QUERY = """
+    UNWIND $rows AS row
+    MATCH (j:Job {job_id: row.job_id})
+    MERGE (s:Skill {name: row.skill})
+    MERGE (j)-[r:REQUIRES]->(s)
+    SET r.weight = row.weight
+"""
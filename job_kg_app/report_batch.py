@@ -0,0 +1,288 @@
+"""
+批量离线生成 AI 报告（异步并发）
+
+给一批匹配结果（如 /api/match/batch 的输出）逐个生成报告时，同步逐个调用会被 LLM 延迟拖住，
+直接并发又容易触发 429。这里用 OpenAI 兼容的异步客户端：
+- 并发上限：BoundedSemaphore 限制同时在途的请求数，输入按需读取，任务数不随批量大小增长
+- 限速：令牌桶控制平均请求速率（允许 burst 个突发）
+- 重试：429 / 5xx / 超时 / 连接错误按指数退避重试（带抖动；服务端给了 Retry-After 时按其等待），
+  4xx 参数/鉴权错误不重试
+- 超时：每次请求单独计时，超时计为一次失败进入重试
+- 结果逐条追加写入 JSONL 并 flush，中断后用同一输出文件重跑会跳过已成功的条目（失败的条目重跑时再试）
+- 与页面共用报告缓存：缓存命中直接复用，新生成的报告写回缓存
+
+输入 JSONL 每行一个匹配结果（含 job_name / match_score / owned_skills / missing_skills / recommend_skills，
+可带 id）；也可以是 /api/match/batch 返回的用户项 {"id", "results": [...]}，按 "用户ID:岗位ID" 展开。
+没有 id 的条目以匹配结果的缓存键作为 id。
+
+命令行用法（在项目根目录执行）：
+    python job_kg_app/report_batch.py --input matches.jsonl --output reports.jsonl
+    python job_kg_app/report_batch.py --input matches.jsonl --output reports.jsonl --concurrency 16 --rate 8
+本地联调可先启动 benchmarks/mock_llm.py，再设 DEEPSEEK_BASE_URL 指向它。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+import openai
+
+from report_cache import report_cache_key
+
+CONCURRENCY = 8  # 同时在途的请求数
+RATE = 5.0  # 平均每秒请求数
+MAX_RETRIES = 5  # 首次请求之外的重试次数
+TIMEOUT = 60.0  # 单次请求超时（秒）
+BACKOFF = 1.0  # 首次重试前的基础等待（秒），之后每次翻倍
+MAX_BACKOFF = 30.0
+PROGRESS_INTERVAL = 5.0  # 进度输出间隔（秒）
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class TokenBucket:
+    """异步令牌桶：平均 rate 个/秒，最多积攒 capacity 个；等待者按到达顺序取令牌"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def is_retryable(exc):
+    """429、5xx、超时与连接错误可重试；其余 4xx（参数、鉴权）重试也不会成功"""
+    if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+def retry_after(exc):
+    """服务端 Retry-After 头给出的等待秒数（没有或无法解析时返回 None）"""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+# ========== 输入 / 输出 ==========
+def read_items(path, model):
+    """逐行读取输入 JSONL，产出 (id, 匹配结果)；空行跳过"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} 第 {line_no} 行不是合法 JSON: {e}") from None
+            if isinstance(row.get("results"), list):
+                for result in row["results"]:
+                    yield f"{row.get('id')}:{result.get('job_id')}", result
+            else:
+                match_result = row.get("match_result", row)
+                yield str(row.get("id") or report_cache_key(match_result, model)), match_result
+
+
+def load_done(path):
+    """已成功的条目 id（输出文件不存在时为空）；中断时写了半行的末行忽略"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == STATUS_OK:
+                done.add(record.get("id"))
+    return done
+
+
+def open_output(path):
+    """以追加方式打开输出文件；上次中断留下的半行补上换行，后续记录从新行开始"""
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                with open(path, "ab") as tail:
+                    tail.write(b"\n")
+    return open(path, "a", encoding="utf-8")
+
+
+# ========== 执行 ==========
+class BatchReportRunner:
+    """
+    异步批量报告执行器
+    :param client: openai.AsyncOpenAI（建议 max_retries=0，重试由本类控制）
+    :param build_messages: 匹配结果 → chat messages（与页面报告共用 app.build_report_messages）
+    :param cache: 可选的 ReportCache，命中直接复用，生成成功写回
+    """
+
+    def __init__(self, client, build_messages, model, cache=None, concurrency=CONCURRENCY, rate=RATE, burst=None,
+                 max_retries=MAX_RETRIES, timeout=TIMEOUT, backoff=BACKOFF, max_backoff=MAX_BACKOFF, out=print):
+        self.client = client
+        self.build_messages = build_messages
+        self.model = model
+        self.cache = cache
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.out = out
+        self._bucket = None
+
+    def _delay(self, attempt, exc):
+        """第 attempt 次失败后的等待：指数退避 + 抖动，服务端要求更久时以其为准"""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+        hinted = retry_after(exc)
+        return max(delay, min(hinted, self.max_backoff)) if hinted is not None else delay
+
+    async def generate(self, match_result):
+        """生成一份报告，返回 (报告文本, 尝试次数)；重试用尽或不可重试时抛出最后一次的异常"""
+        messages = self.build_messages(match_result)
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._bucket.acquire()
+            try:
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(model=self.model, messages=messages, stream=False,
+                                                        timeout=self.timeout),
+                    self.timeout)
+                content = response.choices[0].message.content
+                if not content:
+                    raise ValueError("模型返回空内容")
+                return content, attempt
+            except Exception as e:
+                if attempt > self.max_retries or not is_retryable(e):
+                    e.attempts = attempt
+                    raise
+                await asyncio.sleep(self._delay(attempt, e))
+
+    async def _process(self, item_id, match_result):
+        key = report_cache_key(match_result, self.model)
+        start = time.perf_counter()
+        record = {"id": item_id, "key": key, "job_name": match_result.get("job_name")}
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            record.update(status=STATUS_OK, report=cached, attempts=0, cached=True)
+            return record
+        try:
+            report, attempts = await self.generate(match_result)
+        except Exception as e:
+            record.update(status=STATUS_ERROR, error=f"{type(e).__name__}: {e}", attempts=getattr(e, "attempts", 1))
+        else:
+            if self.cache is not None:
+                self.cache.set(key, report)
+            record.update(status=STATUS_OK, report=report, attempts=attempts)
+        record["seconds"] = round(time.perf_counter() - start, 3)
+        return record
+
+    async def run(self, items, output_path):
+        """
+        处理 (id, 匹配结果) 序列，每完成一条追加写入 output_path
+        :return: 统计 {"total", "skipped", "ok", "error", "cached", "retries", "seconds"}
+        """
+        self._bucket = TokenBucket(self.rate, self.burst)
+        done = load_done(output_path)
+        stats = {"total": 0, "skipped": 0, "ok": 0, "error": 0, "cached": 0, "retries": 0}
+        semaphore = asyncio.BoundedSemaphore(self.concurrency)
+        pending = set()
+        seen = set()
+        start = last_report = time.perf_counter()
+
+        with open_output(output_path) as f:
+            async def worker(item_id, match_result):
+                try:
+                    record = await self._process(item_id, match_result)
+                finally:
+                    semaphore.release()
+                # 事件循环单线程，逐条写入不会交错
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                stats[record["status"]] += 1
+                stats["cached"] += bool(record.get("cached"))
+                stats["retries"] += max(record["attempts"] - 1, 0)
+
+            try:
+                for item_id, match_result in items:
+                    stats["total"] += 1
+                    if item_id in done or item_id in seen:
+                        stats["skipped"] += 1
+                        continue
+                    seen.add(item_id)
+                    await semaphore.acquire()
+                    task = asyncio.create_task(worker(item_id, match_result))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                    now = time.perf_counter()
+                    if now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        finished = stats["ok"] + stats["error"]
+                        self.out(f"[report_batch] 完成 {finished}（失败 {stats['error']}，"
+                                 f"重试 {stats['retries']} 次），{finished / (now - start):.1f} 条/s")
+                if pending:
+                    await asyncio.gather(*pending)
+            finally:
+                # 被中断（Ctrl-C / 取消）时先取消在途请求再关闭文件；未完成的条目不写记录，续跑时重做
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量离线生成 AI 报告（异步并发、限速、重试、可断点续跑）")
+    parser.add_argument("--input", required=True, help="匹配结果 JSONL")
+    parser.add_argument("--output", required=True, help="报告 JSONL（已存在时跳过其中已成功的条目）")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=RATE, help="平均每秒请求数")
+    parser.add_argument("--burst", type=float, help="令牌桶容量（默认等于 --rate）")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="单次请求超时（秒）")
+    parser.add_argument("--no-cache", action="store_true", help="不读写报告缓存")
+    args = parser.parse_args(argv)
+
+    from app import LLM_MODEL, build_report_messages, create_async_llm_client, report_cache
+
+    runner = BatchReportRunner(
+        create_async_llm_client(max_retries=0), build_report_messages, LLM_MODEL,
+        cache=None if args.no_cache else report_cache, concurrency=args.concurrency, rate=args.rate,
+        burst=args.burst, max_retries=args.retries, timeout=args.timeout,
+    )
+    stats = asyncio.run(runner.run(read_items(args.input, LLM_MODEL), args.output))
+    print(f"[OK] 共 {stats['total']} 条：成功 {stats['ok']}（缓存命中 {stats['cached']}），失败 {stats['error']}，"
+          f"跳过已完成 {stats['skipped']}，重试 {stats['retries']} 次，用时 {stats['seconds']}s → {args.output}")
+    return 1 if stats["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
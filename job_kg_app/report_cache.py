@@ -0,0 +1,133 @@
+"""
+LLM 报告缓存
+
+相同的 (岗位, 匹配分数, 已有技能, 缺失技能, 推荐技能) 输入生成的报告没必要重复付费调用。
+以输入的规范化哈希为键：
+- 内存层：LRU 淘汰 + TTL 过期
+- 磁盘层（可选）：SQLite，进程重启/多进程间共享
+- 命中/未命中计数，便于观察缓存效果
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def report_cache_key(match_result, model="deepseek-chat"):
+    """
+    计算匹配结果的规范化哈希。
+    已有/缺失技能与顺序无关（排序后参与哈希），推荐技能保留优先级顺序。
+    """
+    payload = {
+        "model": model,
+        "job_name": match_result.get("job_name"),
+        "match_score": match_result.get("match_score"),
+        "owned": sorted(s for s in match_result.get("owned_skills") or [] if s),
+        "missing": sorted(s for s in match_result.get("missing_skills") or [] if s),
+        "recommend": [s for s in match_result.get("recommend_skills") or [] if s],
+        "similar": sorted((s, v["skill"]) for s, v in (match_result.get("similar_skills") or {}).items()),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """两级报告缓存（线程安全）"""
+
+    def __init__(self, max_entries=1024, ttl=7 * 24 * 3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._mem = OrderedDict()  # key → (写入时间, 文本)
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        self._conn = None
+        self._conn_pid = None
+        if db_path:
+            self._connect()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn_pid = os.getpid()
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS report_cache (
+                key TEXT PRIMARY KEY,
+                report TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @property
+    def _db(self):
+        """SQLite 连接；连接不能跨 fork 使用，子进程（如 gunicorn worker）首次访问时重新打开"""
+        if self.db_path and self._conn_pid != os.getpid():
+            self._connect()
+        return self._conn
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key):
+        """命中返回报告文本，否则返回 None"""
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if not self._expired(item[0], now):
+                    self._mem.move_to_end(key)
+                    self.hits_memory += 1
+                    return item[1]
+                del self._mem[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT report, created_at FROM report_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        self._put_memory_locked(key, row[0], row[1])
+                        self.hits_disk += 1
+                        return row[0]
+                    self._db.execute("DELETE FROM report_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key, report):
+        now = time.time()
+        with self._lock:
+            self._put_memory_locked(key, report, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO report_cache (key, report, created_at) VALUES (?, ?, ?)",
+                    (key, report, now)
+                )
+                self._db.commit()
+
+    def _put_memory_locked(self, key, report, created_at):
+        self._mem[key] = (created_at, report)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            disk_size = None
+            if self._db is not None:
+                disk_size = self._db.execute("SELECT count(*) FROM report_cache").fetchone()[0]
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "memory_size": len(self._mem),
+                "disk_size": disk_size,
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": round((self.hits_memory + self.hits_disk) / lookups, 4) if lookups else 0.0,
+            }
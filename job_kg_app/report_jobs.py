@@ -0,0 +1,309 @@
+"""
+后台报告任务
+
+LLM 报告生成耗时数秒到数十秒，不能占着 Flask 工作线程等待。
+这里用线程池在后台执行生成任务，请求处理函数只拿到一个任务ID立即返回页面；
+前端再通过 SSE 接口按 token 流式拉取生成内容。
+多进程部署（gunicorn 多 worker）时任务状态与已生成片段同步写入共享 SQLite（ReportJobStore），
+查询/SSE 请求落到其它 worker 上时从库中读取并轮询续读，不需要按会话粘滞。
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+
+STORE_FLUSH_INTERVAL = 0.2  # 秒，生成中的片段最多攒这么久写一次库
+STORE_POLL_INTERVAL = 0.2  # 秒，其它进程读取进行中任务的轮询间隔
+STORE_STALE_AFTER = 180  # 秒，进行中的任务超过该时长没有写入视为生成进程已退出
+
+
+class ReportJob:
+    """单个报告任务：保存已生成的文本片段，并通知等待中的读者"""
+
+    def __init__(self, job_id, key=None):
+        self.id = job_id
+        self.key = key
+        self.status = STATUS_PENDING
+        self.chunks = []
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_ERROR)
+
+    @property
+    def text(self):
+        with self._cond:
+            return "".join(self.chunks)
+
+    def _append(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def _finish(self, status, error=None):
+        with self._cond:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def iter_chunks(self, start=0, heartbeat=15):
+        """
+        按顺序产出文本片段，直到任务结束。
+        等待超过 heartbeat 秒仍无新内容时产出 None（调用方可据此发送保活消息）。
+        """
+        pos = start
+        while True:
+            with self._cond:
+                if pos >= len(self.chunks) and not self.finished:
+                    self._cond.wait(timeout=heartbeat)
+                new_chunks = self.chunks[pos:]
+                finished = self.finished
+            if new_chunks:
+                pos += len(new_chunks)
+                for chunk in new_chunks:
+                    yield chunk
+            elif finished:
+                return
+            else:
+                yield None
+
+    def to_dict(self):
+        return {"id": self.id, "status": self.status, "text": self.text, "error": self.error}
+
+
+class StoredReportJob:
+    """其它进程创建的任务（从 ReportJobStore 读取），接口与 ReportJob 相同"""
+
+    def __init__(self, store, job_id, status, error, updated_at):
+        self.id = job_id
+        self._store = store
+        self.status = status
+        self.error = error
+        self._updated_at = updated_at
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_ERROR)
+
+    @property
+    def text(self):
+        return "".join(self._store.chunks(self.id))
+
+    def _refresh(self):
+        row = self._store.status(self.id)
+        if row is None:
+            self.status, self.error = STATUS_ERROR, "报告任务已过期"
+            return
+        self.status, self.error, self._updated_at = row
+        if not self.finished and time.time() - self._updated_at > STORE_STALE_AFTER:
+            self.status, self.error = STATUS_ERROR, "报告生成进程已退出"
+
+    def iter_chunks(self, start=0, heartbeat=15, poll=STORE_POLL_INTERVAL):
+        """与 ReportJob.iter_chunks 相同；按 poll 间隔轮询库中的新片段"""
+        pos = start
+        idle = 0.0
+        while True:
+            self._refresh()  # 先读状态再读片段：读到已结束时，结束前写入的片段一定也能读到
+            finished = self.finished
+            new_chunks = self._store.chunks(self.id, pos)
+            if new_chunks:
+                idle = 0.0
+                pos += len(new_chunks)
+                yield from new_chunks
+            elif finished:
+                return
+            elif idle >= heartbeat:
+                idle = 0.0
+                yield None
+            else:
+                time.sleep(poll)
+                idle += poll
+
+    def to_dict(self):
+        return {"id": self.id, "status": self.status, "text": self.text, "error": self.error}
+
+
+class ReportJobStore:
+    """
+    报告任务的共享存储（SQLite，可与报告缓存共用同一数据库文件）：
+    report_jobs 存状态，report_job_chunks 按序号存已生成片段（序号即 SSE 的事件 id，跨进程续传一致）
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn_pid = os.getpid()
+        self._conn.execute("PRAGMA journal_mode=WAL")  # 多进程并发读写
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS report_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS report_job_chunks (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                chunk TEXT NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            );
+        """)
+        self._conn.commit()
+
+    @property
+    def _db(self):
+        """连接不能跨 fork 使用，子进程（如 gunicorn worker）首次访问时重新打开"""
+        if self._conn_pid != os.getpid():
+            self._connect()
+        return self._conn
+
+    def save(self, job_id, status, error=None, chunks=(), seq=0, finished_at=None):
+        """写入任务状态，并追加从序号 seq 开始的片段"""
+        with self._lock:
+            db = self._db
+            db.execute(
+                "INSERT OR REPLACE INTO report_jobs (id, status, error, updated_at, finished_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, status, error, time.time(), finished_at)
+            )
+            if chunks:
+                db.executemany(
+                    "INSERT OR REPLACE INTO report_job_chunks (job_id, seq, chunk) VALUES (?, ?, ?)",
+                    [(job_id, seq + i, chunk) for i, chunk in enumerate(chunks)]
+                )
+            db.commit()
+
+    def status(self, job_id):
+        """(状态, 错误信息, 最后写入时间)；不存在返回 None"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT status, error, updated_at FROM report_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+    def chunks(self, job_id, start=0):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT chunk FROM report_job_chunks WHERE job_id = ? AND seq >= ? ORDER BY seq", (job_id, start)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, job_id):
+        row = self.status(job_id)
+        return StoredReportJob(self, job_id, *row) if row is not None else None
+
+    def purge(self, before):
+        """删除 before 之前结束的任务"""
+        with self._lock:
+            db = self._db
+            expired = [row[0] for row in db.execute(
+                "SELECT id FROM report_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (before,))]
+            if expired:
+                db.executemany("DELETE FROM report_job_chunks WHERE job_id = ?", [(jid,) for jid in expired])
+                db.executemany("DELETE FROM report_jobs WHERE id = ?", [(jid,) for jid in expired])
+                db.commit()
+
+
+class ReportJobManager:
+    """后台报告任务池"""
+
+    def __init__(self, max_workers=8, retention=600, store=None):
+        """
+        :param store: ReportJobStore；给出时任务同步写入共享库，其它进程也能查询/续读
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._jobs = {}
+        self._running_by_key = {}  # 去重键 → 进行中的任务
+        self._lock = threading.Lock()
+        self.retention = retention  # 已完成任务保留时长（秒）
+        self.store = store
+
+    def submit(self, producer, *args, key=None, **kwargs):
+        """
+        提交任务，立即返回任务ID
+        :param producer: 生成器函数，逐段产出报告文本
+        :param key: 去重键；同键任务仍在进行中时直接复用，不重复生成
+        """
+        with self._lock:
+            self._purge_locked()
+            if key is not None:
+                running = self._running_by_key.get(key)
+                if running is not None and not running.finished:
+                    return running.id
+            job = ReportJob(uuid.uuid4().hex, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._running_by_key[key] = job
+        if self.store is not None:
+            self._save(job, 0)  # 返回任务ID前先落库，其它进程随后查询时不会 404
+        self._executor.submit(self._run, job, producer, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        """本进程的任务直接返回；否则从共享库读取（其它 worker 创建的任务）"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    def _run(self, job, producer, args, kwargs):
+        job.status = STATUS_RUNNING
+        saved = 0  # 已写入共享库的片段数
+        last_save = 0.0
+        try:
+            for chunk in producer(*args, **kwargs):
+                if chunk:
+                    job._append(chunk)
+                    if self.store is not None and time.monotonic() - last_save >= STORE_FLUSH_INTERVAL:
+                        saved = self._save(job, saved)
+                        last_save = time.monotonic()
+            job._finish(STATUS_DONE)
+        except Exception as e:
+            print(f"[ERROR] 报告任务 {job.id} 失败: {e}")
+            job._finish(STATUS_ERROR, str(e))
+        finally:
+            if self.store is not None:
+                self._save(job, saved)
+            if job.key is not None:
+                with self._lock:
+                    if self._running_by_key.get(job.key) is job:
+                        del self._running_by_key[job.key]
+
+    def _save(self, job, saved):
+        """把 saved 之后的新片段与当前状态写入共享库，返回已写入的片段数（写库失败不影响本进程内的任务）"""
+        with job._cond:
+            new_chunks = job.chunks[saved:]
+            status, error, finished_at = job.status, job.error, job.finished_at
+        try:
+            self.store.save(job.id, status, error, new_chunks, saved, finished_at)
+        except Exception as e:
+            print(f"[ERROR] 报告任务 {job.id} 写入共享库失败: {e}")
+            return saved
+        return saved + len(new_chunks)
+
+    def _purge_locked(self):
+        """清理超过保留时长的已完成任务"""
+        now = time.time()
+        expired = [jid for jid, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.retention]
+        for jid in expired:
+            del self._jobs[jid]
+        if self.store is not None and expired:
+            self.store.purge(now - self.retention)
@@ -0,0 +1,251 @@
+"""
+技能词典二进制缓存（内存映射）
+
+把 skill_nodes.csv 解析、排序后的技能列表，以及 SkillIndex（排序数组 + 后缀数组）、
+SkillExtractor（Aho–Corasick 自动机）预编译成扁平数组，写入单个二进制文件：
+- 启动时 mmap 打开，技能列表与联想索引直接在映射上查询，不再解析 CSV、不再排序；
+  多个 worker 映射同一文件，共享操作系统页缓存，而不是每个进程各持一份
+- 文件头记录 CSV 的 mtime / 大小 / sha256：mtime 与大小未变直接使用；变了再比对 sha256，
+  内容相同（仅被 touch）时沿用，否则重新编译
+- 写入先落临时文件再原子替换，已映射旧文件的进程不受影响
+
+文件布局：魔数 | 头长度(uint32) | JSON 头 | 按 8 字节对齐的各段原始数组
+
+应用启动时会自动检查并重建；部署时也可预先编译（在项目根目录执行）：
+    python job_kg_app/skill_cache.py
+    python job_kg_app/skill_cache.py --csv other_skills.csv --output /tmp/skill_nodes.cache
+"""
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from functools import cached_property
+from itertools import pairwise
+
+from skill_extractor import SkillExtractor
+from skill_index import SkillIndex
+
+SKILL_CACHE_PATH = "job_kg_app/skill_nodes.cache"
+CACHE_FORMAT = 2  # 2：以 "." 加字母开头的模式也做左侧词边界检查（need_left 变化）
+_MAGIC = b"KGSKDICT"
+_ALIGN = 8
+
+
+def read_skill_csv(path):
+    """读取技能 CSV（首列为技能名，跳过表头），返回去重排序后的技能列表"""
+    skills = set()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if row and row[0].strip():
+                skills.add(row[0].strip())
+    return sorted(skills)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StringTable(Sequence):
+    """
+    UTF-8 字符串表：全部字符串拼接后存于 buf[base:]，offsets[i]:offsets[i+1] 为第 i 个；按下标访问时才解码
+    buf 为 mmap 时切片直接得到 bytes，比经 memoryview 转换快一倍
+    """
+
+    def __init__(self, buf, offsets, base=0):
+        self._buf = buf
+        self._offsets = offsets
+        self._base = base
+        self._len = len(offsets) - 1
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        # 二分查找的热点：非负整数下标走最短路径，越界时 offsets[i + 1] 抛 IndexError
+        if i.__class__ is not int or i < 0:
+            if isinstance(i, slice):
+                return [self[j] for j in range(*i.indices(self._len))]
+            i += self._len
+            if i < 0:
+                raise IndexError(i)
+        base = self._base
+        return self._buf[base + self._offsets[i]:base + self._offsets[i + 1]].decode("utf-8")
+
+
+# ========== 编译 ==========
+def _strings(values):
+    blob = bytearray()
+    offsets = array("q", [0])
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return {"blob": array("B", blob), "offsets": offsets}
+
+
+def _sections(skills):
+    """技能列表 → {段名: array}"""
+    lower, names, suffix_ids, suffix_starts = SkillIndex(skills).tables()
+    automaton = SkillExtractor(skills).tables()
+    variant_ptr = [0]
+    for forms in automaton["variants"]:
+        variant_ptr.append(variant_ptr[-1] + len(forms))
+
+    sections = {}
+    groups = {
+        "skills": _strings(skills),
+        "index.lower": _strings(lower),
+        "index.names": _strings(names),
+        "extractor.patterns": _strings(automaton["patterns"]),
+        "extractor.variants": _strings(v for forms in automaton["variants"] for v in forms),
+    }
+    for group, parts in groups.items():
+        for part, values in parts.items():
+            sections[f"{group}.{part}"] = values
+    sections["index.suffix_ids"] = array("i", suffix_ids)
+    sections["index.suffix_starts"] = array("i", suffix_starts)
+    sections["extractor.variant_ptr"] = array("q", variant_ptr)
+    for name in ("need_left", "need_right"):
+        sections[f"extractor.{name}"] = array("B", automaton[name])
+    for name in ("goto_ptr", "out_ptr"):
+        sections[f"extractor.{name}"] = array("q", automaton[name])
+    for name in ("goto_chars", "goto_next", "fail", "out_ids"):
+        sections[f"extractor.{name}"] = array("i", automaton[name])
+    return sections
+
+
+def build_cache(csv_path, cache_path=SKILL_CACHE_PATH):
+    """由技能 CSV 编译缓存文件（原子替换），返回技能数"""
+    source = os.stat(csv_path)
+    sha256 = file_sha256(csv_path)
+    skills = read_skill_csv(csv_path)
+    sections = _sections(skills)
+
+    layout = {}
+    offset = 0
+    for name, values in sections.items():
+        nbytes = len(values) * values.itemsize
+        layout[name] = [values.typecode, offset, nbytes]
+        offset += -(-nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({
+        "format": CACHE_FORMAT,
+        "source": {"mtime_ns": source.st_mtime_ns, "size": source.st_size, "sha256": sha256},
+        "count": len(skills),
+        "sections": layout,
+    }).encode("utf-8")
+    prefix = len(_MAGIC) + 4 + len(header)
+    header += b" " * (-prefix % _ALIGN)  # 数据区起点对齐
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for name, values in sections.items():
+                data = values.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % _ALIGN))
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(skills)
+
+
+# ========== 载入 ==========
+class SkillDictCache:
+    """mmap 打开的缓存文件；各段为映射上的零拷贝 memoryview"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        head = len(_MAGIC) + 4
+        if self._mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"不是技能词典缓存文件: {path}")
+        (header_len,) = struct.unpack("<I", self._mm[len(_MAGIC):head])
+        header = json.loads(self._mm[head:head + header_len])
+        if header.get("format") != CACHE_FORMAT:
+            raise ValueError(f"缓存格式版本不符: {header.get('format')}")
+        self.path = path
+        self.source = header["source"]
+        base = head + header_len
+        view = memoryview(self._mm)
+        self._starts = {name: base + offset for name, (_, offset, _) in header["sections"].items()}
+        self._sections = {name: view[base + offset:base + offset + nbytes].cast(typecode)
+                          for name, (typecode, offset, nbytes) in header["sections"].items()}
+
+    def _table(self, name):
+        return StringTable(self._mm, self._sections[f"{name}.offsets"], self._starts[f"{name}.blob"])
+
+    def is_fresh(self, csv_path):
+        """缓存是否对应当前 CSV 内容"""
+        stat = os.stat(csv_path)
+        if stat.st_mtime_ns == self.source["mtime_ns"] and stat.st_size == self.source["size"]:
+            return True
+        return stat.st_size == self.source["size"] and file_sha256(csv_path) == self.source["sha256"]
+
+    @cached_property
+    def skills(self):
+        """去重排序后的技能列表（只读序列）"""
+        return self._table("skills")
+
+    def skill_index(self):
+        """直接在映射上查询的 SkillIndex"""
+        s = self._sections
+        return SkillIndex.from_tables(self._table("index.lower"), self._table("index.names"),
+                                      s["index.suffix_ids"], s["index.suffix_starts"])
+
+    def skill_extractor(self):
+        """由缓存数组还原的 SkillExtractor（转移表需还原为 dict，按需调用）"""
+        s = self._sections
+        forms = self._table("extractor.variants")
+        variants = [forms[a:b] for a, b in pairwise(s["extractor.variant_ptr"])]
+        return SkillExtractor.from_tables(
+            self._table("extractor.patterns"), variants, s["extractor.need_left"], s["extractor.need_right"],
+            s["extractor.goto_ptr"], s["extractor.goto_chars"], s["extractor.goto_next"], s["extractor.fail"],
+            s["extractor.out_ptr"], s["extractor.out_ids"],
+        )
+
+
+def load_skill_cache(csv_path, cache_path=SKILL_CACHE_PATH):
+    """
+    打开技能词典缓存；文件缺失、损坏、格式不符或 CSV 已变化时重新编译
+    CSV 不存在时抛出 FileNotFoundError
+    """
+    try:
+        cache = SkillDictCache(cache_path)
+        if cache.is_fresh(csv_path):
+            return cache
+    except FileNotFoundError:
+        if not os.path.exists(csv_path):
+            raise
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"[WARN] 技能词典缓存不可用，重新编译: {e}")
+    build_cache(csv_path, cache_path)
+    return SkillDictCache(cache_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="预编译技能词典缓存")
+    parser.add_argument("--csv", default="job_kg_app/skill_nodes.csv")
+    parser.add_argument("--output", default=SKILL_CACHE_PATH)
+    args = parser.parse_args(argv)
+    count = build_cache(args.csv, args.output)
+    print(f"[OK] {count} 个技能 → {args.output}（{os.path.getsize(args.output)} 字节）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
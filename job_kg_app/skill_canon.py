@@ -0,0 +1,155 @@
+"""
+技能名归一化与别名解析
+
+技能词典和图谱里同一技能常有多种写法（".NET" / ".NET 6"、"Vue" / "Vue.js" / "VUEJS"、"k8s" / "Kubernetes"），
+按字符串精确比较会漏掉真实的重合。这里把任意写法映射到一个规范技能 ID：
+- 折叠：NFKC 全半角统一、大小写折叠，去掉空白、连字符、下划线（"Spring Boot" = "springboot"）
+- 去版本号：结尾用空格或 v 分隔的版本（"Vue 3"、".NET 6"、"Angular v15"）、紧跟字母的多段版本（"vue2.0"）
+- 去 .js/js 后缀："Vue.js"、"VueJS" → vue；_JS_DISTINCT 中的技能除外（"AngularJS" 与 "Angular" 是两个框架），
+  其 "Angular.js"、"Angular JS" 等写法统一到 angularjs
+- 别名表 skill_aliases.csv（alias,canonical）：缩写与同义词，如 k8s → Kubernetes
+同一 ID 下的规范写法：优先别名表目标，其次只需折叠即相同的写法，再次去后缀、去版本号得到的写法；
+同级取最短，再优先大小写混排的写法（"Vue" 优先于 "VUE"、"vue"）。
+编译结果是"写法 → ID"的哈希表，查询时已知写法一次字典查找即可；图谱导入和匹配打分都经过这里。
+"""
+import csv
+import re
+import unicodedata
+
+SKILL_ALIAS_PATH = "job_kg_app/skill_aliases.csv"
+
+_VERSION = re.compile(r"(?:\s+v?\d+(?:\.\d+)*(?:\.x|\+)?|(?<=[a-z])\d+(?:\.\d+)+)$")
+_JS_SUFFIX = re.compile(r"(?<=[a-z0-9]{2})\.?js$")
+# 去掉 js 后缀后是另一个技能的名字（键为去后缀后的形式）
+_JS_DISTINCT = frozenset({"angular"})
+
+# 规范写法的优先级（越小越优先）
+_ALIAS, _FOLDED, _NO_SUFFIX, _NO_VERSION = range(4)
+
+
+def _preference(name, rank):
+    single_case = name == name.upper() or name == name.lower()
+    return rank, len(name), single_case, name
+
+
+def fold(name):
+    """全半角统一、大小写折叠、空白归一"""
+    if not name.isascii():
+        name = unicodedata.normalize("NFKC", name)
+    return " ".join(name.casefold().split())
+
+
+def skill_key(name):
+    """
+    归一化键及其"改动程度"：(键, 优先级)
+    只折叠即得到键的写法优先级最高，去掉 .js 后缀次之，去掉版本号最低
+    """
+    key = fold(name)
+    rank = _FOLDED
+    # 快照加载时要对全部技能名调用，先用廉价的结尾判断跳过绝大多数不需要正则的名字
+    if key[-1:].isdigit() or key.endswith(("+", ".x")):
+        stripped = _VERSION.sub("", key)
+        if stripped and stripped != key:
+            key, rank = stripped, _NO_VERSION
+    if key.endswith("js"):
+        stripped = _JS_SUFFIX.sub("", key)
+        if stripped in _JS_DISTINCT:
+            if key != stripped + "js":  # "angular.js" → "angularjs"
+                key, rank = stripped + "js", max(rank, _NO_SUFFIX)
+        elif stripped != key:
+            key, rank = stripped, max(rank, _NO_SUFFIX)
+    return key.replace(" ", "").replace("-", "").replace("_", ""), rank
+
+
+def load_aliases(path=SKILL_ALIAS_PATH):
+    """读取别名表 [(别名, 规范技能)]；文件不存在时返回空列表"""
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return [(row["alias"].strip(), row["canonical"].strip()) for row in csv.DictReader(f)
+                    if (row.get("alias") or "").strip() and (row.get("canonical") or "").strip()]
+    except FileNotFoundError:
+        return []
+
+
+class SkillCanon:
+    """技能写法 → 规范技能 ID 的归一化表（构建后只读，可多线程共享）"""
+
+    _MAX_CACHED = 100_000  # 未登记写法的查询缓存上限
+
+    def __init__(self, skills, aliases=()):
+        # 快照每次加载都要重建，大部分名字已是去掉首尾空白的唯一写法，只对需要的做 strip
+        skills = dict.fromkeys(s if isinstance(s, str) else str(s or "") for s in skills)
+        if any(name[:1].isspace() or name[-1:].isspace() for name in skills):
+            skills = dict.fromkeys(name.strip() for name in skills)
+        aliases = list(aliases)
+        keys = {name: skill_key(name) for name in skills if name}
+        self.names = []  # ID → 规范写法
+        self._key_ids = {}  # 归一化键 → ID
+        ranks = []  # ID → 当前规范写法的优先级
+
+        def assign(key, name, rank):
+            cid = self._key_ids.get(key)
+            if cid is None:
+                cid = self._key_ids[key] = len(self.names)
+                self.names.append(name)
+                ranks.append(rank)
+            # 同一 ID 出现多个写法时才比较完整的写法偏好
+            elif _preference(name, rank) < _preference(self.names[cid], ranks[cid]):
+                self.names[cid] = name
+                ranks[cid] = rank
+            return cid
+
+        for name, (key, rank) in keys.items():
+            if key:
+                assign(key, name, rank)
+        # 别名：别名的键并入目标技能所在的 ID
+        for alias, target in aliases:
+            target_key, _ = skill_key(target)
+            cid = assign(target_key, target, _ALIAS)
+            alias_key, _ = skill_key(alias)
+            if alias_key:
+                self._key_ids[alias_key] = cid
+
+        # 已登记的原始写法直接命中，不再走正则（技能名的键上面已算好，只有别名两端需要再算）
+        key_ids = self._key_ids
+        self._surface_ids = {name: key_ids[key] for name, (key, _) in keys.items() if key}
+        for name in (a for pair in aliases for a in pair):
+            cid = key_ids.get(keys[name][0] if name in keys else skill_key(name)[0])
+            if cid is not None:
+                self._surface_ids[name] = cid
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, surface):
+        """任意写法 → 规范技能 ID；不在表中时返回 None"""
+        cid = self._surface_ids.get(surface)
+        if cid is not None:
+            return cid
+        cache = self._cache
+        if surface in cache:
+            return cache[surface]
+        cid = self._key_ids.get(skill_key(str(surface or ""))[0])
+        if len(cache) >= self._MAX_CACHED:
+            cache.clear()
+        cache[surface] = cid
+        return cid
+
+    def ids(self, surfaces):
+        """写法集合 → ID 集合（不在表中的忽略）"""
+        out = set()
+        for surface in surfaces:
+            cid = self.id(surface)
+            if cid is not None:
+                out.add(cid)
+        return out
+
+    def canonical(self, surface):
+        """规范写法；不在表中时返回去掉首尾空白的原写法"""
+        cid = self.id(surface)
+        return self.names[cid] if cid is not None else str(surface or "").strip()
+
+    def canonicalize(self, skills):
+        """批量转换为规范写法，去重并保持首次出现的顺序"""
+        return list(dict.fromkeys(self.canonical(s) for s in skills if s and str(s).strip()))
@@ -0,0 +1,309 @@
+"""
+技能语义相似度（离线计算的共现 SVD 向量 + IVF 近邻索引）
+
+精确匹配只比较规范技能 ID，"PyTorch" 对要求 "TensorFlow" 的岗位没有任何贡献。
+这里由全部 REQUIRES 数据给每个技能算一个稠密向量，常与同一批技能一起被要求的技能向量夹角小：
+- 岗位×技能 0/1 稀疏矩阵 B，一次稀疏乘法 Bᵀ·B 得到技能共现次数，去掉对角线后转成正点互信息 PPMI
+- 截断 SVD 取前 dim 维，向量 = U·√Σ 并按 L2 归一化，余弦相似度即点积；没有任何共现的技能不参与
+- IVF 索引：球面 k-means 把向量分成约 √n 个簇，文件中向量按簇连续存放，
+  查近邻时只扫描质心最接近的 nprobe 个簇（nprobe 不小于簇数即精确暴力搜索）
+全程只用 numpy/scipy 在 CPU 上计算，查询不调用任何在线模型。
+
+结果写成单个二进制文件（布局同 skill_cache：魔数 | 头长度(uint32) | JSON 头 | 按 64 字节对齐的各段数组），
+应用 mmap 打开后直接在映射上计算，多个 worker 共享页缓存；
+文件缺失、损坏或与当前图谱版本不一致时，由 GraphSnapshot 在进程内重新计算。
+
+命令行用法（在项目根目录执行）：
+    python job_kg_app/skill_embed.py                     # 从 Neo4j 计算并写入 SKILL_EMBED_PATH
+    python job_kg_app/skill_embed.py --dim 32 --output /tmp/skill_embed.bin
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+from scipy import sparse
+
+SKILL_EMBED_PATH = "job_kg_app/skill_embed.bin"
+EMBED_FORMAT = 1
+_MAGIC = b"KGSKEMBD"
+_ALIGN = 64
+
+DIM = 64  # 向量维数
+NPROBE = 8  # 查近邻时扫描的簇数
+KMEANS_ITERS = 10
+MIN_SIMILARITY = 0.5  # 低于此相似度视为不相近
+PARTIAL_CREDIT = 0.5  # 相近技能按 岗位权重 × 相似度 × PARTIAL_CREDIT 计入匹配分
+_DENSE_SVD_LIMIT = 2_000  # 技能数不超过此值时直接做稠密 SVD
+
+
+# ========== 计算 ==========
+def _ppmi(matrix):
+    """技能×技能 PPMI 矩阵（CSR，对角线为 0）"""
+    n_skills = matrix.n_skills
+    b = sparse.csr_matrix((np.ones(matrix.nnz, dtype=np.int32), matrix.indices, matrix.indptr),
+                          shape=(matrix.n_jobs, n_skills))
+    co = (b.T @ b).tocoo()
+    df = np.bincount(matrix.indices, minlength=n_skills).astype(np.float64)
+    a, c, count = co.row, co.col, co.data.astype(np.float64)
+    keep = a != c
+    a, c, count = a[keep], c[keep], count[keep]
+    pmi = np.log(count * matrix.n_jobs / (df[a] * df[c]))
+    keep = pmi > 0
+    return sparse.csr_matrix((pmi[keep].astype(np.float32), (a[keep], c[keep])), shape=(n_skills, n_skills))
+
+
+def _svd_vectors(ppmi, dim):
+    """PPMI → 行归一化的 U·√Σ（n × k，k ≤ dim）"""
+    n = ppmi.shape[0]
+    k = min(dim, n - 1)
+    if k < 1 or ppmi.nnz == 0:
+        return np.zeros((n, 0), dtype=np.float32)
+    if n <= _DENSE_SVD_LIMIT:
+        u, s, _ = np.linalg.svd(ppmi.toarray(), hermitian=True)
+        u, s = u[:, :k], s[:k]
+    else:
+        from scipy.sparse.linalg import svds  # 只在计算向量时需要，导入较慢
+
+        # 固定初始向量，同一份数据每次得到相同的结果
+        u, s, _ = svds(ppmi.astype(np.float64), k=k, v0=np.full(n, 1 / np.sqrt(n)))
+    vectors = (u * np.sqrt(s)).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _kmeans(data, n_lists, iters=KMEANS_ITERS, seed=0):
+    """球面 k-means（余弦距离），返回 (质心, 每个向量所属簇)"""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+    rows = np.arange(len(data))
+    for _ in range(iters):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        members = sparse.csr_matrix((np.ones(len(data), dtype=np.float32), (assign, rows)),
+                                    shape=(n_lists, len(data)))
+        sums = np.asarray(members @ data)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # 空簇保留原质心
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+    return centroids, np.argmax(data @ centroids.T, axis=1)
+
+
+class SkillEmbedding:
+    """
+    技能向量 + IVF 索引（只读，可多线程共享）
+    列号与 JobSkillMatrix 一致；vectors 只含有向量的技能，按簇连续存放：
+    - rows[列号] → vectors 中的行号（无向量为 -1），cols[行号] → 列号
+    - 第 i 个簇占 vectors[list_ptr[i]:list_ptr[i + 1]]，质心为 centroids[i]
+    """
+
+    def __init__(self, skill_names, vectors, rows, cols, centroids, list_ptr, version=None, buffer=None):
+        self.skill_names = list(skill_names)
+        self.skill_index = {name: i for i, name in enumerate(self.skill_names)}
+        self.vectors = vectors
+        self.rows = rows
+        self.cols = cols
+        self.centroids = centroids
+        self.list_ptr = list_ptr
+        self.version = version
+        self._buffer = buffer  # mmap 载入时持有映射
+
+    @property
+    def dim(self):
+        return int(self.vectors.shape[1])
+
+    @property
+    def n_vectors(self):
+        return int(self.vectors.shape[0])
+
+    @property
+    def n_lists(self):
+        return len(self.list_ptr) - 1
+
+    @classmethod
+    def from_matrix(cls, matrix, dim=DIM, version=None):
+        """由 JobSkillMatrix 计算技能向量并建 IVF 索引"""
+        vectors = _svd_vectors(_ppmi(matrix), dim)
+        present = np.flatnonzero(np.any(vectors != 0, axis=1)) if vectors.shape[1] else np.zeros(0, np.int64)
+        data = vectors[present]
+        if len(present):
+            n_lists = max(1, min(len(present), int(np.sqrt(len(present)))))
+            centroids, assign = _kmeans(data, n_lists)
+        else:
+            centroids, assign = np.zeros((0, vectors.shape[1]), dtype=np.float32), np.zeros(0, np.int64)
+            n_lists = 0
+        order = np.argsort(assign, kind="stable")
+        cols = present[order].astype(np.int32)
+        rows = np.full(matrix.n_skills, -1, dtype=np.int32)
+        rows[cols] = np.arange(len(cols), dtype=np.int32)
+        list_ptr = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=n_lists), out=list_ptr[1:])
+        return cls(matrix.skill_names, np.ascontiguousarray(data[order]), rows, cols,
+                   np.ascontiguousarray(centroids, dtype=np.float32), list_ptr, version)
+
+    # ---------- 持久化 ----------
+    def _sections(self):
+        return {"vectors": self.vectors, "rows": self.rows, "cols": self.cols,
+                "centroids": self.centroids, "list_ptr": self.list_ptr}
+
+    def save(self, path):
+        """写入二进制文件（先写临时文件再原子替换，已映射旧文件的进程不受影响）"""
+        layout = {}
+        offset = 0
+        for name, values in self._sections().items():
+            layout[name] = [values.dtype.str, list(values.shape), offset]
+            offset += -(-values.nbytes // _ALIGN) * _ALIGN
+        header = json.dumps({
+            "format": EMBED_FORMAT,
+            "version": self.version,
+            "skill_names": self.skill_names,
+            "sections": layout,
+        }, ensure_ascii=False).encode("utf-8")
+        prefix = len(_MAGIC) + 4 + len(header)
+        header += b" " * (-prefix % _ALIGN)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                for values in self._sections().values():
+                    data = np.ascontiguousarray(values).tobytes()
+                    f.write(data)
+                    f.write(b"\0" * (-len(data) % _ALIGN))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path):
+        """mmap 打开文件，各段数组为映射上的只读视图"""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        head = len(_MAGIC) + 4
+        if mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"不是技能向量文件: {path}")
+        (header_len,) = struct.unpack("<I", mm[len(_MAGIC):head])
+        header = json.loads(mm[head:head + header_len])
+        if header.get("format") != EMBED_FORMAT:
+            raise ValueError(f"技能向量文件格式版本不符: {header.get('format')}")
+        base = head + header_len
+        arrays = {}
+        for name, (dtype, shape, offset) in header["sections"].items():
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(mm, dtype=dtype, count=count, offset=base + offset).reshape(shape)
+        return cls(header["skill_names"], arrays["vectors"], arrays["rows"], arrays["cols"],
+                   arrays["centroids"], arrays["list_ptr"], header["version"], mm)
+
+    @classmethod
+    def load_or_build(cls, path, matrix, version=None):
+        """优先读取离线结果；文件缺失、损坏或版本不一致时现场计算"""
+        if path and os.path.exists(path):
+            try:
+                embedding = cls.load(path)
+                if embedding.version == version and embedding.skill_names == matrix.skill_names:
+                    return embedding
+            except Exception as e:
+                print(f"[WARN] 读取技能向量失败，改为现场计算: {e}")
+        return cls.from_matrix(matrix, version=version)
+
+    # ---------- 查询 ----------
+    def search(self, query, k=10, nprobe=NPROBE):
+        """
+        近似最近邻：只扫描质心与 query 最接近的 nprobe 个簇
+        :return: [(列号, 相似度)]，相似度降序
+        """
+        if self.n_lists == 0 or k <= 0:
+            return []
+        ptr = self.list_ptr
+        if nprobe >= self.n_lists:
+            spans = [(0, self.n_vectors)]
+        else:
+            probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            spans = [(int(ptr[p]), int(ptr[p + 1])) for p in probe.tolist()]
+        # 各簇的分数写进同一个缓冲区，只做一次部分排序
+        sizes = [end - start for start, end in spans]
+        scores = np.empty(sum(sizes), dtype=np.float32)
+        offset = 0
+        for (start, end), size in zip(spans, sizes):
+            np.matmul(self.vectors[start:end], query, out=scores[offset:offset + size])
+            offset += size
+        k = min(k, offset)
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        # 缓冲区位置 → vectors 行号
+        bounds = np.cumsum(sizes)
+        span = np.searchsorted(bounds, best, side="right")
+        starts = np.array([start for start, _ in spans]) - (bounds - sizes)
+        rows = best + starts[span]
+        return list(zip(self.cols[rows].tolist(), scores[best].tolist()))
+
+    def neighbors(self, skill, k=10, nprobe=NPROBE, min_similarity=MIN_SIMILARITY):
+        """与技能最相近的 k 个技能 [(技能名, 相似度)]（不含自身）；技能不存在或没有向量时返回空列表"""
+        col = self.skill_index.get(skill)
+        if col is None or self.rows[col] < 0:
+            return []
+        hits = self.search(self.vectors[self.rows[col]], k + 1, nprobe)
+        return [(self.skill_names[c], round(score, 4)) for c, score in hits
+                if c != col and score >= min_similarity][:k]
+
+    def closest(self, targets, known_cols, min_similarity=MIN_SIMILARITY):
+        """
+        "会 X，所以 Y 上手快"：每个目标技能在已掌握技能中最相近的一个
+        :param targets: 目标技能名（没有向量的忽略）
+        :param known_cols: 已掌握技能的列号（JobSkillMatrix.columns 的结果）
+        :return: {目标技能: (最相近的已掌握技能, 相似度)}，只含相似度不低于 min_similarity 的
+        """
+        index = self.skill_index
+        target_cols = [index[name] for name in dict.fromkeys(targets) if name in index]
+        names = self.skill_names
+        return {names[t]: (names[k], round(sim, 4))
+                for t, k, sim in zip(*(a.tolist() for a in self.closest_cols(target_cols, known_cols, min_similarity)))}
+
+    def closest_cols(self, target_cols, known_cols, min_similarity=MIN_SIMILARITY):
+        """
+        closest 的列号版本（批量匹配按列号调用，不经过技能名）
+        :return: (目标列号, 最相近的已掌握技能列号, 相似度) 三个等长数组，只含相似度不低于 min_similarity 的
+        """
+        rows = self.rows
+        target_cols = np.asarray(target_cols, dtype=np.int64)
+        target_cols = target_cols[rows[target_cols] >= 0]
+        known_cols = np.fromiter(known_cols, dtype=np.int64)
+        known_cols = known_cols[(known_cols >= 0) & (known_cols < len(rows))]
+        known_cols = known_cols[rows[known_cols] >= 0]
+        if not len(target_cols) or not len(known_cols):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=self.vectors.dtype)
+        sims = self.vectors[rows[target_cols]] @ self.vectors[rows[known_cols]].T
+        best = sims.argmax(axis=1)
+        best_sims = sims[np.arange(len(best)), best]
+        keep = best_sims >= min_similarity
+        return target_cols[keep], known_cols[best[keep]], best_sims[keep]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从 REQUIRES 数据计算技能向量与近邻索引")
+    parser.add_argument("--output", default=SKILL_EMBED_PATH)
+    parser.add_argument("--dim", type=int, default=DIM)
+    args = parser.parse_args(argv)
+
+    from app import neo4j_driver
+    from graph_snapshot import GraphSnapshot
+
+    snap = GraphSnapshot.load(neo4j_driver)
+    embedding = SkillEmbedding.from_matrix(snap.matrix, args.dim, snap.version)
+    embedding.save(args.output)
+    print(f"[OK] {snap.matrix.n_skills} 个技能，{embedding.n_vectors} 个 {embedding.dim} 维向量，"
+          f"{embedding.n_lists} 个簇 → {args.output}（{os.path.getsize(args.output)} 字节）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
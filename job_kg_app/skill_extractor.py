@@ -0,0 +1,215 @@
+"""
+简历技能抽取（Aho–Corasick 多模式匹配）
+
+把技能词典一次性编译成 Aho–Corasick 自动机，单次线性扫描简历文本即可找出全部技能：
+- 大小写不敏感，返回命中位置与出现次数
+- 英文/数字技能要求词边界，避免 "C"、"Go" 命中单词内部（如 "Cloud"、"Google"）；
+  后接字母的 "." 也算单词内部，"JS"、"Node" 不会从 "Vue.js"、"Node.js" 中拆出，".NET" 也不会从 "ASP.NET" 中拆出
+- 中日韩字符不需要空格分词：中文技能可直接命中，中文与英文相邻也视为边界（如 "熟悉Python开发"）
+- 提供批量接口，可选多进程并行，用于批量导入简历
+自动机可导出为扁平数组（tables()）由 skill_cache 缓存，下次启动直接还原，跳过 trie 构建与失配指针计算。
+"""
+from collections import namedtuple
+from itertools import pairwise
+from concurrent.futures import ProcessPoolExecutor
+
+SkillMatch = namedtuple("SkillMatch", ["skill", "start", "end"])
+
+# 视为"单词内部"的额外符号（C++、C#、snake_case 等）
+_WORD_SYMBOLS = frozenset("_+#")
+
+
+def _is_cjk(ch):
+    """是否为中日韩文字（含假名、韩文、全角兼容区）"""
+    code = ord(ch)
+    return (0x3040 <= code <= 0x30FF or 0x3400 <= code <= 0x9FFF or 0xF900 <= code <= 0xFAFF
+            or 0xAC00 <= code <= 0xD7AF or 0x20000 <= code <= 0x2FA1F)
+
+
+def _is_word_char(ch):
+    """需要词边界保护的字符：字母、数字、_+#，但不包括中日韩文字"""
+    return (ch.isalnum() or ch in _WORD_SYMBOLS) and not _is_cjk(ch)
+
+
+def _is_letter(ch):
+    return ch.isalpha() and not _is_cjk(ch)
+
+
+def _fold(text):
+    """小写化并保证长度不变（个别字符小写后会变长，保持原样以免偏移错位）"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class SkillExtractor:
+    """基于技能词典编译的 Aho–Corasick 自动机（构建后只读，可多线程共享）"""
+
+    def __init__(self, skills):
+        # 小写形式 → 原始写法列表（如 "java" → ["JAVA", "Java"]）
+        variants = {}
+        for skill in skills:
+            if skill is None:
+                continue
+            skill = str(skill).strip()
+            if skill:
+                variants.setdefault(_fold(skill), []).append(skill)
+
+        self._patterns = list(variants)
+        self._variants = [variants[p] for p in self._patterns]
+        # 模式首尾是否需要词边界检查（".net" 这类以 "." 加字母开头的模式同样需要）
+        self._need_left = [_is_word_char(p[0]) or (p[0] == "." and len(p) > 1 and _is_letter(p[1]))
+                           for p in self._patterns]
+        self._need_right = [_is_word_char(p[-1]) for p in self._patterns]
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self._build()
+
+    @classmethod
+    def from_tables(cls, patterns, variants, need_left, need_right, goto_ptr, goto_chars, goto_next, fail,
+                    out_ptr, out_ids):
+        """由 tables() 导出的数组还原自动机（转移表按状态以 CSR 存储，字符为码位）"""
+        extractor = cls.__new__(cls)
+        extractor._patterns = list(patterns)
+        extractor._variants = [list(v) for v in variants]
+        extractor._need_left = [bool(x) for x in need_left]
+        extractor._need_right = [bool(x) for x in need_right]
+        chars = "".join(map(chr, goto_chars))
+        targets = list(goto_next)
+        extractor._goto = [dict(zip(chars[a:b], targets[a:b])) for a, b in pairwise(goto_ptr)]
+        extractor._fail = list(fail)
+        out_ids = tuple(out_ids)
+        extractor._out = [out_ids[a:b] for a, b in pairwise(out_ptr)]
+        return extractor
+
+    def tables(self):
+        """导出自动机：模式、各模式的原始写法、词边界标记、CSR 转移表、失配指针、CSR 输出集合"""
+        goto_ptr, goto_chars, goto_next = [0], [], []
+        for edges in self._goto:
+            for ch, nxt in edges.items():
+                goto_chars.append(ord(ch))
+                goto_next.append(nxt)
+            goto_ptr.append(len(goto_chars))
+        out_ptr, out_ids = [0], []
+        for pids in self._out:
+            out_ids.extend(pids)
+            out_ptr.append(len(out_ids))
+        return {
+            "patterns": self._patterns, "variants": self._variants,
+            "need_left": self._need_left, "need_right": self._need_right,
+            "goto_ptr": goto_ptr, "goto_chars": goto_chars, "goto_next": goto_next,
+            "fail": self._fail, "out_ptr": out_ptr, "out_ids": out_ids,
+        }
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _build(self):
+        goto, out = self._goto, self._out
+        # 1. 构建 trie
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    self._fail.append(0)
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (pid,)
+
+        # 2. BFS 计算失配指针，并合并输出集合
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in goto[f]:
+                    f = self._fail[f]
+                fail = goto[f].get(ch, 0)
+                self._fail[nxt] = fail
+                if out[fail]:
+                    out[nxt] = out[nxt] + out[fail]
+
+    # ---------- 匹配 ----------
+    def find_all(self, text):
+        """返回全部命中（按结束位置排序），每项为 SkillMatch(技能, 起始偏移, 结束偏移)"""
+        if not text:
+            return []
+        folded = _fold(text)
+        n = len(folded)
+        goto, fail, out = self._goto, self._fail, self._out
+        patterns, variants = self._patterns, self._variants
+        need_left, need_right = self._need_left, self._need_right
+
+        matches = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for pid in out[state]:
+                start = end - len(patterns[pid])
+                # 相邻的单词字符，或后接字母的 "."（"Vue.js" 中的 "js"、"Node.js" 中的 "node"）都不算词边界
+                if need_left[pid] and start > 0:
+                    prev = folded[start - 1]
+                    if _is_word_char(prev) or (prev == "." and _is_letter(folded[start])):
+                        continue
+                if need_right[pid] and end < n:
+                    nxt = folded[end]
+                    if _is_word_char(nxt) or (nxt == "." and end + 1 < n and _is_letter(folded[end + 1])):
+                        continue
+                # 同一小写形式有多种写法时，优先返回与原文大小写一致的写法
+                forms = variants[pid]
+                skill = forms[0]
+                if len(forms) > 1:
+                    surface = text[start:end]
+                    if surface in forms:
+                        skill = surface
+                matches.append(SkillMatch(skill, start, end))
+        return matches
+
+    def extract(self, text):
+        """返回 {技能: 出现次数}，按首次出现顺序排列；大小写变体合并计数"""
+        counts = {}
+        canonical = {}
+        for m in self.find_all(text):
+            key = _fold(m.skill)
+            skill = canonical.setdefault(key, m.skill)
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def extract_batch(self, texts, workers=None, chunksize=64):
+        """
+        批量抽取，返回与 texts 等长的 [{技能: 次数}, ...]
+        :param workers: 进程数，None 或 <=1 时在当前进程顺序执行
+        """
+        texts = list(texts)
+        if not workers or workers <= 1 or len(texts) < chunksize:
+            return [self.extract(t) for t in texts]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+            return list(pool.map(_worker_extract, texts, chunksize=chunksize))
+
+
+# ========== 多进程批量抽取 ==========
+_worker_extractor = None
+
+
+def _init_worker(extractor):
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _worker_extract(text):
+    return _worker_extractor.extract(text)
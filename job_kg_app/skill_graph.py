@@ -0,0 +1,186 @@
+"""
+技能共现 / 先修关系图（离线计算）
+
+由全部 REQUIRES 数据统计技能之间的关系：
+- 岗位×技能 0/1 稀疏矩阵 B，一次稀疏乘法 Bᵀ·B 得到技能共现次数 C（对角线为各技能出现的岗位数 df）
+- 条件概率 P(a|b) = C[a,b] / df[b]：需要 b 的岗位中有多大比例也需要 a
+- P(a|b) 足够高、共现次数足够多、且 a 比 b 更常见（df[a] > df[b]，同频按列号）时，记一条先修边 a → b
+  （"学 b 之前一般先会 a"）；按出现频次定向保证整张图无环
+
+结果以 CSR 邻接表（indptr / indices / confidence）存成 .npz，应用启动时直接载入；
+文件缺失或与当前图谱版本不一致时，由 GraphSnapshot 在进程内重新计算。
+
+命令行用法（在项目根目录执行）：
+    python job_kg_app/skill_graph.py                     # 从 Neo4j 计算并写入 SKILL_GRAPH_PATH
+    python job_kg_app/skill_graph.py --min-confidence 0.5 --output /tmp/skill_prereq.npz
+"""
+import argparse
+import heapq
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+SKILL_GRAPH_PATH = "job_kg_app/skill_prereq.npz"
+MIN_SUPPORT = 3  # 至少在这么多岗位中共现
+MIN_CONFIDENCE = 0.6  # P(先修技能 | 后续技能) 下限
+MAX_PARENTS = 2  # 路径图中每个待学技能最多保留的先修连线数
+
+
+class SkillPrereqGraph:
+    """技能先修关系 CSR 邻接表：行 = 先修技能，列 = 后续技能"""
+
+    def __init__(self, skill_names, indptr, indices, confidence, version=None):
+        self.skill_names = list(skill_names)
+        self.skill_index = {name: i for i, name in enumerate(self.skill_names)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.confidence = np.asarray(confidence, dtype=np.float32)
+        self.version = version
+
+        # 反向邻接（后续技能 → 先修技能），路径构建时按目标技能查父节点
+        adj = sparse.csr_matrix((self.confidence, self.indices, self.indptr),
+                                shape=(len(self.skill_names), len(self.skill_names)))
+        rev = adj.T.tocsr()
+        rev.sort_indices()
+        self._rev_indptr = rev.indptr.astype(np.int64)
+        self._rev_indices = rev.indices.astype(np.int32)
+        self._rev_conf = rev.data.astype(np.float32)
+
+    @property
+    def n_edges(self):
+        return int(self.indices.shape[0])
+
+    # ---------- 计算 ----------
+    @classmethod
+    def from_matrix(cls, matrix, min_support=MIN_SUPPORT, min_confidence=MIN_CONFIDENCE, version=None):
+        """由 JobSkillMatrix 计算先修关系"""
+        n_skills = matrix.n_skills
+        if matrix.nnz == 0:
+            return cls(matrix.skill_names, np.zeros(n_skills + 1), [], [], version)
+
+        b = sparse.csr_matrix((np.ones(matrix.nnz, dtype=np.int32), matrix.indices, matrix.indptr),
+                              shape=(matrix.n_jobs, n_skills))
+        co = (b.T @ b).tocoo()  # 技能×技能 共现次数
+        df = np.bincount(matrix.indices, minlength=n_skills)  # 即 co 的对角线
+
+        a, c, count = co.row, co.col, co.data
+        # a 比 c 更常见（同频按列号）才可能是 c 的先修
+        keep = (a != c) & (count >= min_support) & ((df[a] > df[c]) | ((df[a] == df[c]) & (a < c)))
+        a, c, count = a[keep], c[keep], count[keep]
+        conf = count / df[c]
+        keep = conf >= min_confidence
+        a, c, conf = a[keep], c[keep], conf[keep]
+
+        adj = sparse.csr_matrix((conf.astype(np.float32), (a, c)), shape=(n_skills, n_skills))
+        adj.sort_indices()
+        return cls(matrix.skill_names, adj.indptr, adj.indices, adj.data, version)
+
+    # ---------- 持久化 ----------
+    def save(self, path):
+        """先写临时文件再原子替换，其它进程不会读到写了一半的文件"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(
+                    f, skill_names=np.array(self.skill_names, dtype=str), indptr=self.indptr, indices=self.indices,
+                    confidence=self.confidence, version=np.array(-1 if self.version is None else self.version),
+                )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            version = int(f["version"])
+            return cls(f["skill_names"].tolist(), f["indptr"], f["indices"], f["confidence"],
+                       None if version < 0 else version)
+
+    @classmethod
+    def load_or_build(cls, path, matrix, version=None):
+        """优先读取离线结果；文件缺失、损坏或版本不一致时现场计算"""
+        if path and os.path.exists(path):
+            try:
+                graph = cls.load(path)
+                if graph.version == version and graph.skill_names == matrix.skill_names:
+                    return graph
+            except Exception as e:
+                print(f"[WARN] 读取技能先修关系失败，改为现场计算: {e}")
+        return cls.from_matrix(matrix, version=version)
+
+    # ---------- 查询 ----------
+    def prerequisites(self, skill):
+        """技能的先修技能 [(技能名, 置信度)]，按置信度降序"""
+        col = self.skill_index.get(skill)
+        if col is None:
+            return []
+        start, end = self._rev_indptr[col], self._rev_indptr[col + 1]
+        pairs = [(self.skill_names[i], float(w))
+                 for i, w in zip(self._rev_indices[start:end], self._rev_conf[start:end])]
+        pairs.sort(key=lambda p: -p[1])
+        return pairs
+
+    def order(self, skills, weights, known=(), max_parents=MAX_PARENTS):
+        """
+        给待学技能排学习顺序
+        :param skills: 待学技能
+        :param weights: {技能: 岗位权重}，无先后约束时权重高的先学
+        :param known: 已掌握技能（可作为连线起点，不参与排序）
+        :return: (有序技能列表, [(先修技能, 后续技能, 置信度)] 只含每个技能最强的 max_parents 条先修边)
+        """
+        skills = list(dict.fromkeys(skills))
+        pending = set(skills)
+        known = set(known)
+        parents = {}  # 技能 → 待学技能中的先修
+        edges = []
+        for skill in skills:
+            chosen = 0
+            parents[skill] = []
+            for pre, conf in self.prerequisites(skill):
+                if pre in pending:
+                    parents[skill].append(pre)
+                if chosen < max_parents and (pre in pending or pre in known):
+                    edges.append((pre, skill, conf))
+                    chosen += 1
+
+        # Kahn 拓扑排序，同层按权重降序、名称升序
+        indegree = {s: len(parents[s]) for s in skills}
+        children = {s: [] for s in skills}
+        for skill, pres in parents.items():
+            for pre in pres:
+                children[pre].append(skill)
+        ready = [(-weights.get(s, 0), s) for s in skills if indegree[s] == 0]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            _, skill = heapq.heappop(ready)
+            ordered.append(skill)
+            for child in children[skill]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, (-weights.get(child, 0), child))
+        return ordered, edges
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从 REQUIRES 数据计算技能先修关系")
+    parser.add_argument("--output", default=SKILL_GRAPH_PATH)
+    parser.add_argument("--min-support", type=int, default=MIN_SUPPORT)
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    args = parser.parse_args(argv)
+
+    from app import neo4j_driver
+    from graph_snapshot import GraphSnapshot
+
+    snap = GraphSnapshot.load(neo4j_driver)
+    graph = SkillPrereqGraph.from_matrix(snap.matrix, args.min_support, args.min_confidence, snap.version)
+    graph.save(args.output)
+    print(f"[OK] {snap.matrix.n_skills} 个技能，{graph.n_edges} 条先修边 → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+技能联想索引
+
+在技能词典加载时一次性构建，供 /api/skill/suggest 使用：
+- 前缀匹配：小写排序数组 + 二分查找，O(log n + N)
+- 中缀匹配：小写后缀数组 + 二分查找
+- 模糊匹配：difflib 相似度（仅在显式请求时使用）
+- 热度排序：按 REQUIRES 边数（被多少岗位需要）排序
+也可由 skill_cache 预编译的表（mmap 视图）直接构造，省去启动时的排序。
+"""
+import difflib
+from bisect import bisect_left
+
+
+class _SuffixKeys:
+    """后缀数组的键视图：第 j 个后缀为 lower[ids[j]][starts[j]:]，二分查找时按需切片"""
+
+    def __init__(self, lower, ids, starts):
+        self._lower = lower
+        self._ids = ids
+        self._starts = starts
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, j):
+        return self._lower[self._ids[j]][self._starts[j]:]
+
+
+class SkillIndex:
+    """技能名前缀/中缀/模糊检索索引（构建后只读，可多线程共享）"""
+
+    def __init__(self, skills):
+        pairs = sorted({(s.lower(), s) for s in skills if s})
+        self._lower = [p[0] for p in pairs]
+        self._names = [p[1] for p in pairs]
+
+        # 后缀数组：(后缀, 技能下标)，用于中缀查找
+        suffixes = []
+        for i, low in enumerate(self._lower):
+            for start in range(1, len(low)):
+                suffixes.append((low[start:], i))
+        suffixes.sort()
+        self._suffix_keys = [s[0] for s in suffixes]
+        self._suffix_ids = [s[1] for s in suffixes]
+
+    @classmethod
+    def from_tables(cls, lower, names, suffix_ids, suffix_starts):
+        """由 tables() 导出的表构造（可以是 mmap 上的只读序列），不做任何排序"""
+        index = cls.__new__(cls)
+        index._lower = lower
+        index._names = names
+        index._suffix_keys = _SuffixKeys(lower, suffix_ids, suffix_starts)
+        index._suffix_ids = suffix_ids
+        return index
+
+    def tables(self):
+        """导出 (小写技能名, 原始技能名, 后缀所属技能下标, 后缀起始偏移)"""
+        starts = [len(self._lower[i]) - len(key) for key, i in zip(self._suffix_keys, self._suffix_ids)]
+        return list(self._lower), list(self._names), list(self._suffix_ids), starts
+
+    def __len__(self):
+        return len(self._names)
+
+    # ---------- 基础检索（返回下标） ----------
+    def _prefix_ids(self, prefix):
+        i = bisect_left(self._lower, prefix)
+        n = len(self._lower)
+        while i < n and self._lower[i].startswith(prefix):
+            yield i
+            i += 1
+
+    def _infix_ids(self, query):
+        """所有包含 query 的技能（先前缀命中，再中缀命中）"""
+        seen = set()
+        for i in self._prefix_ids(query):
+            seen.add(i)
+            yield i
+        j = bisect_left(self._suffix_keys, query)
+        n = len(self._suffix_keys)
+        while j < n and self._suffix_keys[j].startswith(query):
+            i = self._suffix_ids[j]
+            if i not in seen:
+                seen.add(i)
+                yield i
+            j += 1
+
+    def _fuzzy_ids(self, query, limit):
+        matches = difflib.get_close_matches(query, self._lower, n=limit, cutoff=0.6)
+        ids = []
+        for low in matches:
+            i = bisect_left(self._lower, low)
+            # 同一小写形式可能对应多个原始写法
+            while i < len(self._lower) and self._lower[i] == low:
+                if i not in ids:
+                    ids.append(i)
+                i += 1
+        return ids
+
+    # ---------- 对外接口 ----------
+    def suggest(self, query, limit=10, mode="prefix", popularity=None):
+        """
+        技能联想
+        :param query: 用户输入（大小写不敏感）
+        :param limit: 最多返回条数
+        :param mode: prefix（前缀）/ infix（包含）/ fuzzy（前缀 + 模糊补足）
+        :param popularity: 技能热度 {技能名: 被岗位需要的次数}，传入时按热度排序
+        """
+        query = (query or "").strip().lower()
+        if not query or limit <= 0:
+            return []
+
+        if mode == "infix":
+            candidates = self._infix_ids(query)
+        else:
+            candidates = self._prefix_ids(query)
+
+        if popularity:
+            # 热度排序需要看到全部候选
+            ids = sorted(candidates, key=lambda i: -popularity.get(self._names[i], 0))[:limit]
+        else:
+            ids = []
+            for i in candidates:
+                ids.append(i)
+                if len(ids) >= limit:
+                    break
+
+        if mode == "fuzzy" and len(ids) < limit:
+            for i in self._fuzzy_ids(query, limit):
+                if i not in ids:
+                    ids.append(i)
+                    if len(ids) >= limit:
+                        break
+
+        return [self._names[i] for i in ids]
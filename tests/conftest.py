@@ -0,0 +1,5 @@
+"""测试从项目根目录运行（python -m pytest），应用模块与命令行一样从 job_kg_app 目录导入"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "job_kg_app"))
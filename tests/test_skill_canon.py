@@ -0,0 +1,17 @@
+"""技能名归一化"""
+from skill_canon import SkillCanon
+
+
+def test_js_suffix_and_versions_fold():
+    canon = SkillCanon(["Vue", "Vue.js", "VUEJS", "Vue 3", ".NET", ".NET 6"])
+    assert canon.id("vue2.0") == canon.id("Vue.js") == canon.id("Vue 3")
+    assert canon.names[canon.id("VUEJS")] == "Vue"
+    assert canon.id(".NET 6") == canon.id(".net")
+
+
+def test_angular_and_angularjs_stay_separate():
+    canon = SkillCanon(["Angular", "AngularJS", "Angular v15"])
+    assert canon.id("Angular") != canon.id("AngularJS")
+    assert canon.id("Angular v15") == canon.id("Angular")
+    assert canon.id("Angular.js") == canon.id("angular js") == canon.id("AngularJS")
+    assert canon.names[canon.id("angular.js")] == "AngularJS"
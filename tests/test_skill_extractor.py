@@ -0,0 +1,29 @@
+"""简历技能抽取的词边界"""
+import pytest
+
+from skill_extractor import SkillExtractor
+
+SKILLS = ["JS", "Node", "Node.js", ".NET", "ASP", "C", "Go", "Python"]
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SkillExtractor(SKILLS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("熟悉Node.js开发", {"Node.js": 1}),        # "Node"、"JS" 不从带点名称中拆出
+    ("ASP.NET Core", {}),                       # ".NET" 前接字母，属于 "ASP.NET"
+    ("会 C#/.NET 和 Go", {".NET": 1, "Go": 1}),
+    ("熟悉.NET开发", {".NET": 1}),
+    ("Google Cloud", {}),
+    ("掌握Python.", {"Python": 1}),             # 句末的点仍是边界
+])
+def test_word_boundaries(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+
+def test_tables_round_trip_keeps_boundaries(extractor):
+    restored = SkillExtractor.from_tables(**extractor.tables())
+    for text in ("ASP.NET 与 .NET", "Node.js / Node"):
+        assert restored.extract(text) == extractor.extract(text)